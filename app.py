@@ -1,12 +1,17 @@
+import os
+import time
+import contextlib
 import streamlit as st
 from datetime import datetime, date, timedelta
-from streamlit_option_menu import option_menu
-import pandas as pd
 
 # Import utility modules
-from utils.db_manager import DatabaseManager
-from utils.pdf_manager import PDFManager
-from utils.api_client import APIClient
+# pandas, ReportLab and SQLAlchemy are imported on first use (see init_services),
+# so the login page comes up without loading them
+from utils import tracing
+from utils.lazy import LazyService
+from utils.report_jobs import ReportJobQueue, QUEUED as JOB_QUEUED, RUNNING as JOB_RUNNING, DONE as JOB_DONE, FAILED as JOB_FAILED
+from utils.api_client import APIClient, QUEUED as WRITE_QUEUED, OUTCOME_UNKNOWN as WRITE_OUTCOME_UNKNOWN
+from utils.write_queue import WriteQueue
 
 # Page configuration
 st.set_page_config(
@@ -16,36 +21,191 @@ st.set_page_config(
     initial_sidebar_state="expanded"  # Always show sidebar by default
 )
 
-# Load custom CSS
-def load_css():
+# Load custom CSS (read from disk once per process, injected on every rerun)
+@st.cache_data(show_spinner=False)
+def read_css(path: str = 'frontend/style.css'):
     try:
-        with open('frontend/style.css') as f:
-            st.markdown(f'<style>{f.read()}</style>', unsafe_allow_html=True)
+        with open(path) as f:
+            return f.read()
     except FileNotFoundError:
+        return None
+
+def load_css():
+    css = read_css()
+    if css is None:
         st.warning("style.css not found. Using default styling.")
+        return
+    st.markdown(f'<style>{css}</style>', unsafe_allow_html=True)
 
 load_css()
 
 # Initialize services
 @st.cache_resource
 def init_services():
-    """Initialize database and API clients"""
+    """
+    Initialize database and API clients
+    The database, PDF and export services are built (and their modules
+    imported) the first time they are used, not at startup.
+    The API client returned here is process-wide and never logged in -
+    each browser session talks through its own handle (session_api_client)
+    """
     db_url = st.secrets.get("DATABASE_URL", "")
     api_url = st.secrets.get("API_BASE_URL", "http://localhost:8000")
+    cache_dir = st.secrets.get("REPORT_CACHE_DIR", ".report_cache")
+    
+    def build_db_manager():
+        from utils.db_manager import DatabaseManager
+        return DatabaseManager(db_url)
+    
+    def build_pdf_manager():
+        from utils.pdf_manager import PDFManager
+        return PDFManager(cache_dir=cache_dir)
     
-    db_manager = DatabaseManager(db_url)
-    api_client = APIClient(api_url)
-    pdf_manager = PDFManager()
+    def build_table_exporter():
+        from utils.table_exporter import TableExporter
+        return TableExporter(pdf_manager.get())
     
-    return db_manager, api_client, pdf_manager
+    db_manager = LazyService(build_db_manager, "db_manager")
+    write_queue = WriteQueue(st.secrets.get("WRITE_QUEUE_PATH", "write_queue.db"))
+    api_client = APIClient(api_url, write_queue=write_queue)
+    pdf_manager = LazyService(build_pdf_manager, "pdf_manager")
+    table_exporter = LazyService(build_table_exporter, "table_exporter")
+    report_jobs = ReportJobQueue(max_workers=2)
+    
+    return db_manager, api_client, pdf_manager, table_exporter, report_jobs
 
-db_manager, api_client, pdf_manager = init_services()
+db_manager, shared_api_client, pdf_manager, table_exporter, report_jobs = init_services()
 
 # Session state initialization
 if 'authenticated' not in st.session_state:
     st.session_state.authenticated = False
 if 'current_page' not in st.session_state:
     st.session_state.current_page = 'Home'
+if 'report_jobs' not in st.session_state:
+    st.session_state.report_jobs = []  # Job ids, newest first
+if 'report_jobs_pending' not in st.session_state:
+    st.session_state.report_jobs_pending = []
+if 'users_page' not in st.session_state:
+    st.session_state.users_page = 1
+
+def session_api_client() -> APIClient:
+    """
+    This browser session's API client
+    Shares the process-wide connection pool but holds its own token, so a
+    login or logout here does not touch any other admin's session
+    """
+    if 'api_client' not in st.session_state:
+        st.session_state.api_client = shared_api_client.for_session(st.session_state.get('token'))
+    return st.session_state.api_client
+
+api_client = session_api_client()
+
+# ==================== CACHED DATA ACCESS ====================
+# Backend reads shared by every rerun and session. Each resource has its own TTL,
+# and mutations clear exactly the caches they make stale (see invalidate_after_*),
+# so clicking around the UI does not hit the backend at all. The auto-refreshing
+# fragments use the same intervals, so every open session shares one fetch per TTL.
+
+DEVICE_STATUS_TTL = 15      # Seconds - heartbeat-driven, goes stale quickly
+DASHBOARD_STATS_TTL = 30    # Today's counts change as employees check in
+USERS_TTL = 600             # Only changes through update_user / enrollment
+SYNC_HISTORY_TTL = 300      # Only changes when a sync is triggered or finishes
+STATS_SOURCE_RETRY = 300    # Seconds the database answers for the dashboard after the backend fails
+
+@st.cache_data(ttl=DEVICE_STATUS_TTL, show_spinner=False)
+def cached_device_status(device_id: str = "ESP32_MAIN"):
+    return api_client.get_device_status(device_id)
+
+@st.cache_resource
+def stats_source_health() -> dict:
+    """Process-wide: when each dashboard stats source last failed"""
+    return {'api': {'failed_at': 0.0}, 'db': {'failed_at': 0.0}}
+
+def stats_source_order(health: dict) -> list:
+    """Backend first; the database only while the backend has failed recently"""
+    api_failed = time.time() - health['api']['failed_at'] < STATS_SOURCE_RETRY
+    return ['db', 'api'] if api_failed else ['api', 'db']
+
+@st.cache_data(ttl=DASHBOARD_STATS_TTL, show_spinner=False)
+def _cached_dashboard_stats():
+    fetch = {
+        'api': api_client.get_dashboard_stats,
+        'db': lambda: db_manager.get_dashboard_stats()  # One aggregate query; builds the DB service on first use
+    }
+    health = stats_source_health()
+    
+    for source in stats_source_order(health):
+        try:
+            stats = fetch[source]()
+        except Exception as e:  # e.g. no DATABASE_URL configured
+            print(f"Dashboard stats from {source} failed: {e}")
+            stats = None
+        
+        if stats is None:
+            health[source]['failed_at'] = time.time()
+            continue
+        return {**stats, 'source': source}
+    
+    return None
+
+def cached_dashboard_stats():
+    """Counts from the backend, or the database while it is down; None if neither can answer; failures are not kept"""
+    stats = _cached_dashboard_stats()
+    if stats is None:
+        _cached_dashboard_stats.clear()
+    return stats
+
+@st.cache_data(ttl=USERS_TTL, show_spinner=False)
+def _cached_users():
+    return api_client.get_all_users()
+
+@st.cache_data(ttl=USERS_TTL, show_spinner=False)
+def _cached_users_page(offset: int, limit: int, search: str):
+    return api_client.get_users_page(offset=offset, limit=limit, search=search or None)
+
+@st.cache_data(ttl=SYNC_HISTORY_TTL, show_spinner=False)
+def _cached_sync_history(device_id: str, limit: int):
+    return api_client.get_sync_history(device_id, limit=limit)
+
+def cached_users():
+    """(success, users_data) like api_client.get_all_users; failures are not kept"""
+    success, users_data = _cached_users()
+    if not success:
+        _cached_users.clear()
+    return success, users_data
+
+def cached_users_page(offset: int, limit: int, search: str = ""):
+    """(success, page) like api_client.get_users_page; failures are not kept"""
+    success, page = _cached_users_page(offset, limit, search)
+    if not success:
+        _cached_users_page.clear()
+    return success, page
+
+def cached_sync_history(device_id: str, limit: int = 10):
+    """(success, history) like api_client.get_sync_history; failures are not kept"""
+    success, history = _cached_sync_history(device_id, limit)
+    if not success:
+        _cached_sync_history.clear()
+    return success, history
+
+def invalidate_after_user_update():
+    _cached_users.clear()
+    _cached_users_page.clear()
+
+def invalidate_after_sync_trigger():
+    _cached_sync_history.clear()
+    cached_device_status.clear()
+
+def invalidate_after_sync_complete():
+    # New attendance rows landed - today's counts and the history row changed
+    _cached_dashboard_stats.clear()
+    _cached_sync_history.clear()
+
+def invalidate_after_queue_flush():
+    # Queued writes can be user updates, enrollments or attendance rows
+    _cached_users.clear()
+    _cached_users_page.clear()
+    _cached_dashboard_stats.clear()
 
 # ==================== AUTHENTICATION ====================
 
@@ -114,15 +274,63 @@ def render_sidebar():
     
     st.sidebar.markdown("---")
     
-    # ESP32 Device Status - Fetched from API only
-    st.sidebar.markdown("### 🔌 Device Status")
+    # ESP32 Device Status - refreshes on its own, without rerunning the page
+    with st.sidebar:
+        device_status_panel()
+    
+    # Offline changes - replayed in small batches once the backend is back
+    pending = api_client.pending_writes()
+    if pending:
+        st.sidebar.markdown("### 📮 Offline Changes")
+        
+        if api_client.health_check():
+            result = api_client.flush_write_queue()
+            pending = result['remaining']
+            if result['sent']:
+                invalidate_after_queue_flush()
+                st.sidebar.success(f"✅ Sent {result['sent']} queued change(s)")
+            if result['rejected']:
+                st.sidebar.error(f"❌ Backend rejected {result['rejected']} queued change(s)")
+            if result['unknown']:
+                st.sidebar.warning(
+                    f"⚠️ {result['unknown']} queued change(s) got no answer in time and were not resent - "
+                    "check whether they were saved"
+                )
+        
+        if pending:
+            st.sidebar.warning(f"⏳ {pending} change(s) waiting for the backend")
+            if st.sidebar.button("🔁 Retry Now", width="stretch"):
+                st.rerun()
+    
+    st.sidebar.markdown("---")
+    
+    # User info
+    st.sidebar.markdown(f"**👤 Admin:** {st.session_state.get('username', 'User')}")
+    st.sidebar.markdown(f"**📅 Date:** {datetime.now().strftime('%Y-%m-%d')}")
     
-    with st.spinner("Checking device..."):
-        device_status = api_client.get_device_status()
+    # Per-session debug panel: timing waterfall of each rerun and report job
+    st.sidebar.toggle("⏱️ Performance overlay", key="perf_overlay")
+    
+    st.sidebar.markdown("---")
+    
+    # Logout button
+    if st.sidebar.button("🚪 Logout", width="stretch"):
+        api_client.logout()
+        st.session_state.authenticated = False
+        st.session_state.token = None
+        st.rerun()
+
+@st.fragment(run_every=DEVICE_STATUS_TTL)
+def device_status_panel():
+    """ESP32 online/offline indicator (rendered inside st.sidebar)"""
+    
+    st.markdown("### 🔌 Device Status")
+    
+    device_status = cached_device_status()
     
     if device_status and device_status.get('connected'):
         # Online
-        st.sidebar.markdown("""
+        st.markdown("""
         <div class="device-status online">
             <span class="status-dot online-dot"></span>
             <span class="status-text">Online</span>
@@ -131,10 +339,10 @@ def render_sidebar():
         
         # Last seen timestamp
         last_seen = device_status.get('last_seen', datetime.now().isoformat())
-        st.sidebar.caption(f"Last seen: {last_seen}")
+        st.caption(f"Last seen: {last_seen}")
     else:
         # Offline
-        st.sidebar.markdown("""
+        st.markdown("""
         <div class="device-status offline">
             <span class="status-dot offline-dot"></span>
             <span class="status-text">Offline</span>
@@ -142,28 +350,15 @@ def render_sidebar():
         """, unsafe_allow_html=True)
         
         last_seen = device_status.get('last_seen', 'Never') if device_status else 'Never'
-        st.sidebar.caption(f"Last seen: {last_seen}")
-    
-    st.sidebar.markdown("---")
-    
-    # User info
-    st.sidebar.markdown(f"**👤 Admin:** {st.session_state.get('username', 'User')}")
-    st.sidebar.markdown(f"**📅 Date:** {datetime.now().strftime('%Y-%m-%d')}")
-    
-    st.sidebar.markdown("---")
-    
-    # Logout button
-    if st.sidebar.button("🚪 Logout", width="stretch"):
-        api_client.logout()
-        st.session_state.authenticated = False
-        st.session_state.token = None
-        st.rerun()
+        st.caption(f"Last seen: {last_seen}")
 
 # ==================== NAVIGATION ====================
 
 def render_navigation():
     """Professional navigation bar using streamlit-option-menu"""
     
+    from streamlit_option_menu import option_menu
+    
     selected = option_menu(
         menu_title=None,
         options=["Home", "About", "Contact"],
@@ -197,8 +392,35 @@ def home_page():
     
     st.markdown("<h1 class='page-title'>🏠 Admin Dashboard</h1>", unsafe_allow_html=True)
     
-    # Dashboard metrics
-    stats = api_client.get_dashboard_stats()
+    # Dashboard metrics - refresh on their own, without rerunning the tabs below
+    with tracing.span("dashboard metrics", tracing.RENDER):
+        dashboard_metrics()
+    
+    st.markdown("<br>", unsafe_allow_html=True)
+    
+    # Tabs - only the selected one runs (and fetches its data); switching tabs reruns
+    tab1, tab2, tab3 = st.tabs(
+        ["👥 Manage Users", "📊 Attendance Reports", "🟢 Live Today"],
+        key="home_tab", on_change="rerun"
+    )
+    
+    if tab1.open:
+        with tab1, tracing.span("manage users tab", tracing.RENDER):
+            manage_users_tab()
+    
+    if tab2.open:
+        with tab2, tracing.span("attendance reports tab", tracing.RENDER):
+            attendance_reports_tab()
+    
+    if tab3.open:
+        with tab3, tracing.span("live today tab", tracing.RENDER):
+            live_today_tab()
+
+@st.fragment(run_every=DASHBOARD_STATS_TTL)
+def dashboard_metrics():
+    """Total users / today's records / checked in / checked out cards"""
+    
+    stats = cached_dashboard_stats()
     
     if stats:
         col1, col2, col3, col4 = st.columns(4)
@@ -238,37 +460,153 @@ def home_page():
                 <div class="metric-label">Checked Out</div>
             </div>
             """, unsafe_allow_html=True)
-    
-    st.markdown("<br>", unsafe_allow_html=True)
-    
-    # Tabs
-    tab1, tab2 = st.tabs(["👥 Manage Users", "📊 Attendance Reports"])
-    
-    with tab1:
-        manage_users_tab()
-    
-    with tab2:
-        attendance_reports_tab()
+        
+        if stats.get('source') == 'db':
+            st.caption("Backend unavailable - counts computed from the database.")
+    else:
+        st.warning(f"⚠️ Dashboard statistics are unavailable right now - retrying every {DASHBOARD_STATS_TTL} seconds.")
 
 # ==================== MANAGE USERS TAB ====================
 
+USERS_PAGE_SIZES = [25, 50, 100]
+
+def set_users_page(page: int):
+    st.session_state.users_page = page
+
 def manage_users_tab():
     """Data management - Display and update users"""
     
     st.markdown("### 👥 User Management")
     
-    # Fetch all users from API
-    success, users_data = api_client.get_all_users()
+    if not users_page_section():
+        return
+    
+    st.markdown("---")
+    
+    # ==================== NEW SYNC ATTENDANCE SECTION ====================
+    st.markdown("#### 🔄 Sync Attendance")
+    
+    st.info("📋 Trigger ESP32 to upload attendance logs from the last N days. This ensures no check-out logs are missed during internet outages.")
+    
+    col1, col2 = st.columns([2, 1])
+    
+    with col1:
+        sync_days = st.number_input(
+            "Number of Days to Sync",
+            min_value=1,
+            max_value=30,
+            value=7,
+            step=1,
+            help="Select how many days of attendance logs to sync from ESP32 (1-30 days)"
+        )
+    
+    with col2:
+        st.markdown("<br>", unsafe_allow_html=True)  # Spacing
+        trigger_sync_btn = st.button("🚀 Trigger Sync", width="stretch", type="primary")
+    
+    if trigger_sync_btn:
+        with st.spinner(f"Triggering sync for last {sync_days} days..."):
+            device_id = "ESP32_MAIN"  # You can make this configurable if needed
+            success, response = api_client.trigger_attendance_sync(device_id, sync_days)
+            
+            if success:
+                invalidate_after_sync_trigger()
+                st.success(f"✅ Sync triggered successfully!")
+                st.info(f"📡 ESP32 will upload attendance logs from the last **{sync_days} days**")
+                st.session_state.active_sync = {
+                    'device_id': device_id,
+                    'sync_id': response.get('sync_id'),
+                    'days': sync_days,
+                    'version': 0,
+                    'progress': None
+                }
+            else:
+                st.error(f"❌ Failed to trigger sync: {response.get('message', 'Unknown error')}")
+    
+    # Live progress of the triggered sync (refreshes on its own, without a full rerun)
+    sync_progress_panel()
+    
+    # Show sync history
+    with st.expander("📜 View Sync History", expanded=False):
+        success, history = cached_sync_history("ESP32_MAIN", limit=10)
+        
+        if success and history and 'history' in history:
+            sync_history = history['history']
+            
+            if sync_history:
+                history_data = []
+                for record in sync_history:
+                    status_emoji = "✅" if record['status'] == 'completed' else "❌" if record['status'] == 'failed' else "⏳"
+                    
+                    history_data.append({
+                        'Status': f"{status_emoji} {record['status'].capitalize()}",
+                        'Days Synced': record['days_synced'],
+                        'Logs Uploaded': record['logs_synced'],
+                        'Triggered At': record['triggered_at'],
+                        'Completed At': record.get('completed_at', 'Pending'),
+                        'Error': record.get('error_message', '-')
+                    })
+                
+                import pandas as pd
+                history_df = pd.DataFrame(history_data)
+                st.dataframe(history_df, hide_index=True, width="stretch")
+            else:
+                st.info("No sync history found.")
+        else:
+            st.warning("Could not fetch sync history.")
+
+def users_page_section() -> bool:
+    """
+    Searchable, paginated user table and the update form
+    The backend filters and pages - only the visible page is fetched and rendered
+    
+    Returns:
+        False if the system has no users at all
+    """
     
-    if not success or not users_data or 'users' not in users_data:
+    col1, col2 = st.columns([3, 1])
+    
+    with col1:
+        search = st.text_input(
+            "Search Users",
+            placeholder="Name or user ID",
+            key="users_search",
+            on_change=set_users_page,
+            args=(1,)
+        ).strip()
+    
+    with col2:
+        page_size = st.selectbox(
+            "Per Page",
+            options=USERS_PAGE_SIZES,
+            index=1,
+            key="users_page_size",
+            on_change=set_users_page,
+            args=(1,)
+        )
+    
+    # Fetch one page from API (cached until an update)
+    page = st.session_state.users_page
+    success, page_data = cached_users_page((page - 1) * page_size, page_size, search)
+    
+    if not success or not page_data or 'users' not in page_data:
         st.info("ℹ️ No users found in the system.")
-        return
+        return False
     
-    users_list = users_data['users']
+    users_list = page_data['users']
+    total = page_data.get('total', len(users_list))
+    
+    if not users_list and total and page > 1:
+        # Page emptied under us (users removed / narrower search) - go back to the first
+        set_users_page(1)
+        st.rerun()
     
     if not users_list:
+        if search:
+            st.info(f"ℹ️ No users match '{search}'.")
+            return True
         st.info("ℹ️ No users found in the system.")
-        return
+        return False
     
     df_data = []
     for user in users_list:
@@ -282,12 +620,30 @@ def manage_users_tab():
             'Time': user['time']
         })
     
-    users_df = pd.DataFrame(df_data)
+    import pandas as pd
+    with tracing.span("DataFrame(users page)", tracing.FRAME, detail=f"{len(df_data)} row(s)"):
+        users_df = pd.DataFrame(df_data)
     
     # Display users in data table
     st.markdown("#### All Users")
     st.dataframe(users_df, hide_index=True, width="stretch")
     
+    # Pager
+    pages = max(1, -(-total // page_size))
+    col1, col2, col3 = st.columns([1, 2, 1])
+    
+    with col1:
+        st.button("◀ Previous", key="users_prev", disabled=page <= 1, width="stretch",
+                  on_click=set_users_page, args=(page - 1,))
+    
+    with col2:
+        first_row = (page - 1) * page_size + 1
+        st.caption(f"Page {page} of {pages} · users {first_row}-{first_row + len(users_list) - 1} of {total}")
+    
+    with col3:
+        st.button("Next ▶", key="users_next", disabled=page >= pages, width="stretch",
+                  on_click=set_users_page, args=(page + 1,))
+    
     st.markdown("---")
     
     # Update user section
@@ -298,7 +654,7 @@ def manage_users_tab():
                    for user in users_list}
     
     if user_options:
-        selected_user = st.selectbox("Select User to Update", options=list(user_options.keys()))
+        selected_user = st.selectbox("Select User to Update (current page)", options=list(user_options.keys()))
         user_id = user_options[selected_user]
         
         # Get selected user data
@@ -330,7 +686,7 @@ def manage_users_tab():
                         slot_ids_list = [int(x.strip()) for x in new_slot_ids.split(',') if x.strip()]
                     except ValueError:
                         st.error("❌ Invalid slot IDs format. Use comma-separated numbers.")
-                        return
+                        return True
                     
                     # Call API to update user
                     with st.spinner("Updating user..."):
@@ -341,77 +697,513 @@ def manage_users_tab():
                         salary=new_salary if new_salary > 0 else None
                     )
                     
-                    if success:
+                    if success is WRITE_QUEUED:
+                        st.info(f"📮 {message}")
+                    elif success is WRITE_OUTCOME_UNKNOWN:
+                        st.warning(f"⚠️ {message}")
+                    elif success:
+                        invalidate_after_user_update()
                         st.success(f"✅ {message}")
                         st.rerun()
                     else:
                         st.error(f"❌ {message}")
     
-    st.markdown("---")
+    return True
+
+@st.fragment(run_every=2)
+def sync_progress_panel():
+    """Live progress bar for the most recently triggered sync"""
     
-    # ==================== NEW SYNC ATTENDANCE SECTION ====================
-    st.markdown("#### 🔄 Sync Attendance")
+    active_sync = st.session_state.get('active_sync')
+    if not active_sync:
+        return
     
-    st.info("📋 Trigger ESP32 to upload attendance logs from the last N days. This ensures no check-out logs are missed during internet outages.")
+    progress = active_sync['progress']
+    if not (progress and progress.get('completed')):
+        # Short long-poll: returns as soon as the backend reports new progress
+        success, latest = api_client.get_sync_progress(
+            active_sync['device_id'],
+            since=active_sync['version'],
+            wait=1
+        )
+        if success and latest:
+            # Ignore progress from an older sync still reported by the device
+            if active_sync['sync_id'] is None or latest.get('sync_id') in (None, active_sync['sync_id']):
+                progress = latest
+                active_sync['progress'] = latest
+                active_sync['version'] = latest.get('version', active_sync['version'])
+                if latest.get('completed'):
+                    invalidate_after_sync_complete()
+    
+    if not progress:
+        st.progress(0, text="⏳ Waiting for ESP32 to start uploading...")
+        return
     
-    col1, col2 = st.columns([2, 1])
+    uploaded = progress.get('logs_uploaded') or 0
+    total = progress.get('logs_total')
+    fraction = min(uploaded / total, 1.0) if total else (1.0 if progress.get('completed') else 0.0)
+    label = f"{uploaded}/{total} logs" if total else f"{uploaded} logs"
+    st.progress(fraction, text=f"📡 Uploading attendance logs - {label}")
     
+    col1, col2, col3 = st.columns(3)
     with col1:
-        sync_days = st.number_input(
-            "Number of Days to Sync",
-            min_value=1,
-            max_value=30,
-            value=7,
-            step=1,
-            help="Select how many days of attendance logs to sync from ESP32 (1-30 days)"
-        )
-    
+        st.metric("Logs Uploaded", uploaded)
     with col2:
-        st.markdown("<br>", unsafe_allow_html=True)  # Spacing
-        trigger_sync_btn = st.button("🚀 Trigger Sync", width="stretch", type="primary")
+        throughput = progress.get('throughput')
+        st.metric("Throughput", f"{throughput:.1f} logs/s" if throughput is not None else "-")
+    with col3:
+        st.metric("Status", str(progress.get('status', 'pending')).replace('_', ' ').capitalize())
     
-    if trigger_sync_btn:
-        with st.spinner(f"Triggering sync for last {sync_days} days..."):
-            device_id = "ESP32_MAIN"  # You can make this configurable if needed
-            success, response = api_client.trigger_attendance_sync(device_id, sync_days)
-            
-            if success:
-                st.success(f"✅ Sync triggered successfully!")
-                st.info(f"📡 ESP32 will upload attendance logs from the last **{sync_days} days**")
-                st.json(response)  # Show response details
-            else:
-                st.error(f"❌ Failed to trigger sync: {response.get('message', 'Unknown error')}")
+    if progress.get('completed'):
+        if progress.get('status') == 'failed':
+            st.error(f"❌ Sync failed: {progress.get('error_message') or 'Unknown error'}")
+        else:
+            st.success(f"✅ Sync complete - {uploaded} logs uploaded")
+        if st.button("Dismiss", key="dismiss_sync_progress"):
+            st.session_state.active_sync = None
+            st.rerun()
+
+# ==================== LIVE TODAY TAB ====================
+# Polls the attendance changes feed with this session's cursor, so each tick
+# downloads only the punches made since the previous one. The backend is the
+# source; the database feed takes over while the backend cannot answer.
+
+LIVE_FEED_INTERVAL = 5      # Seconds between polls
+LIVE_FEED_MAX_PAGES = 5     # Pages fetched per poll when catching up
+LIVE_FEED_PAGE_SIZE = 500   # Records per page
+
+def attendance_changes_page(feed: dict):
+    """
+    Next page of today's changes for this feed, from the backend or else the database
+    
+    A cursor only means something to the source that issued it, so when the
+    source changes the feed starts over from the beginning of the day.
+    
+    Returns:
+        Dict with records, cursor, has_more and full (records replace the
+        feed's), or None if neither source could answer
+    """
+    for source in ('api', 'db'):
+        since = feed['cursor'] if feed['source'] == source else None
+        
+        if source == 'api':
+            success, changes = api_client.get_attendance_changes(feed['date'], since=since, limit=LIVE_FEED_PAGE_SIZE)
+            if not success:
+                continue
+        else:
+            try:
+                result = db_manager.get_attendance_changes(feed['date'], since=since, limit=LIVE_FEED_PAGE_SIZE)
+            except Exception as e:  # e.g. no DATABASE_URL configured
+                print(f"Attendance changes from database failed: {e}")
+                result = None
+            if result is None:
+                continue
+            rows, cursor = result
+            changes = {
+                'records': rows.astype(object).where(rows.notna(), None).to_dict('records'),  # NaN -> None
+                'cursor': cursor,
+                'has_more': len(rows) >= LIVE_FEED_PAGE_SIZE,
+                'full': False
+            }
+        
+        if since is None:
+            changes['full'] = True  # Starting over: drop what came from before
+        feed['source'] = source
+        return changes
     
-    # Show sync history
-    with st.expander("📜 View Sync History", expanded=False):
-        success, history = api_client.get_sync_history("ESP32_MAIN", limit=10)
+    return None
+
+def live_today_tab():
+    """Today's check-ins and check-outs as they happen"""
+    
+    st.markdown("### 🟢 Live Attendance - Today")
+    st.caption(f"Updates every {LIVE_FEED_INTERVAL} seconds - only new or changed records are downloaded.")
+    
+    live_attendance_panel()
+
+@st.fragment(run_every=LIVE_FEED_INTERVAL)
+def live_attendance_panel():
+    """Apply the changes since the session's cursor, then show the day so far"""
+    import pandas as pd
+    
+    today = datetime.now().strftime("%d/%m")
+    feed = st.session_state.get('live_feed')
+    if not feed or feed['date'] != today:
+        # First poll, or the day rolled over: start from an empty day
+        feed = {'date': today, 'source': None, 'cursor': None, 'records': {}, 'updated_at': None}
+        st.session_state.live_feed = feed
+    
+    new_records = 0
+    for _ in range(LIVE_FEED_MAX_PAGES):
+        changes = attendance_changes_page(feed)
+        if changes is None:
+            st.warning("⚠️ Cannot reach the backend or the database - showing the last records received.")
+            break
         
-        if success and history and 'history' in history:
-            sync_history = history['history']
+        if changes['full']:
+            feed['records'] = {}
+        for record in changes['records']:
+            feed['records'][record['id']] = record  # A check-out replaces the check-in row
+        feed['cursor'] = changes['cursor']
+        new_records += len(changes['records'])
+        
+        if not changes['has_more']:
+            break
+    
+    if new_records:
+        feed['updated_at'] = datetime.now()
+    
+    records = list(feed['records'].values())
+    checked_out = sum(1 for r in records if r.get('checked_out_time'))
+    
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric("Present Today", len(records))
+    with col2:
+        st.metric("Still In", len(records) - checked_out)
+    with col3:
+        st.metric("Checked Out", checked_out)
+    
+    if not records:
+        st.info("📭 No punches recorded today yet.")
+        return
+    
+    # Most recent activity first
+    rows = pd.DataFrame({
+        'Name': [r.get('name') for r in records],
+        'User ID': [r.get('user_id') for r in records],
+        'Check In': [r.get('checked_in_time') or 'N/A' for r in records],
+        'Check Out': [r.get('checked_out_time') or '-' for r in records]
+    })
+    last_punch = [r.get('checked_out_time') or r.get('checked_in_time') or '' for r in records]
+    rows = rows.iloc[sorted(range(len(rows)), key=lambda i: last_punch[i], reverse=True)]
+    st.dataframe(rows, hide_index=True, width="stretch")
+    
+    if feed['updated_at']:
+        st.caption(f"Last change received at {feed['updated_at'].strftime('%H:%M:%S')}")
+    if feed['source'] == 'db':
+        st.caption("Backend unavailable - reading changes straight from the database.")
+
+# ==================== REPORT JOBS ====================
+# Work functions run on the report job queue's threads - no st.* calls in here
+
+def result_preview(result: "pd.DataFrame") -> "pd.DataFrame":
+    """On-screen rows from a daily_result / user_range_result frame"""
+    import pandas as pd
+    
+    check_in = result['checked_in_time'] if 'checked_in_time' in result else pd.Series('N/A', index=result.index)
+    check_out = result['checked_out_time'] if 'checked_out_time' in result else pd.Series('N/A', index=result.index)
+    
+    return pd.DataFrame({
+        'Name': result['name'],
+        'Date': result['date'],
+        'Check In': check_in.where(check_in.notna() & (check_in != ''), 'N/A'),
+        'Check Out': check_out.where(check_out.notna() & (check_out != ''), 'N/A'),
+        'Hours': result['hours'].round(2),
+        'Late': result['is_late'],
+        'Total': result['daily_total'].round(2),
+        'Status': result['status']
+    })
+
+def summary_preview(summary: "pd.DataFrame") -> "pd.DataFrame":
+    """On-screen rows from a summarize_by_user frame"""
+    import pandas as pd
+    
+    return pd.DataFrame({
+        'Employee': summary['employee'],
+        'Salary (Daily)': summary['salary'],
+        'Present Days': summary['present'],
+        'Absent Days': summary['absent'],
+        'Total Salary': summary['total_salary'].astype(float).round(2)
+    })
+
+def daily_report_job(progress, output_path: str, date_str: str, user_id, user_label: str) -> dict:
+    """Fetch one day's attendance and render the daily PDF"""
+    progress(0, 2, "Fetching attendance records...")
+    if user_id:
+        attendance_data = db_manager.get_user_attendance(user_id, date_str, date_str)
+    else:
+        attendance_data = db_manager.get_attendance_by_date(date_str)
+    
+    if attendance_data is None or attendance_data.empty:
+        return {"warning": f"⚠️ No attendance records found for {date_str}"}
+    
+    progress(1, 2, "Rendering PDF...")
+    
+    # Hours, late flags, earnings and status once - shared by the PDF, export and preview
+    with tracing.span("daily_result", tracing.COMPUTE, detail=f"{len(attendance_data)} row(s)"):
+        result = pdf_manager.daily_result(attendance_data)
+    
+    with tracing.span("generate_daily_report", tracing.PDF):
+        pdf_path = pdf_manager.generate_daily_report(
+            attendance_data,
+            date_str,
+            user_name=user_label if user_id else None,
+            output=output_path,
+            result=result
+        )
+    if not pdf_path:
+        raise RuntimeError("Failed to generate PDF")
+    
+    base_name = f"attendance_report_{date_str.replace('/', '_')}"
+    return {
+        "path": pdf_path,
+        "file_name": f"{base_name}.pdf",
+        "mime": "application/pdf",
+        "base_name": base_name,
+        "dataset": table_exporter.daily_dataset(attendance_data, result=result),
+        "preview": result_preview(result)
+    }
+
+def range_report_job(progress, output_path: str, start_str: str, end_str: str, user_id, user_label: str) -> dict:
+    """Fetch a date range and render the single-user or all-users PDF"""
+    progress(0, 2, "Fetching attendance records...")
+    if user_id:
+        # Single user - show all records
+        attendance_data = db_manager.get_user_attendance(user_id, start_str, end_str)
+    else:
+        # All users combined - show summary
+        attendance_data = db_manager.get_attendance_range(start_str, end_str)
+    
+    if attendance_data is None or attendance_data.empty:
+        return {"warning": f"⚠️ No attendance records found for {start_str} to {end_str}"}
+    
+    progress(1, 2, "Rendering PDF...")
+    
+    # Result frame computed once - shared by the PDF, export and preview
+    if user_id:
+        with tracing.span("user_range_result", tracing.COMPUTE, detail=f"{len(attendance_data)} row(s)"):
+            result = pdf_manager.user_range_result(attendance_data, start_str, end_str, user_label)
+        with tracing.span("generate_user_range_report", tracing.PDF):
+            pdf_path = pdf_manager.generate_user_range_report(
+                attendance_data,
+                start_str,
+                end_str,
+                user_label,
+                output=output_path,
+                result=result
+            )
+        dataset = table_exporter.user_range_dataset(attendance_data, start_str, end_str, user_label, result=result)
+        preview_df = result_preview(result)
+    else:
+        with tracing.span("summarize_by_user", tracing.COMPUTE, detail=f"{len(attendance_data)} row(s)"):
+            result = pdf_manager.summarize_by_user(attendance_data, start_str, end_str)
+        with tracing.span("generate_combined_users_summary", tracing.PDF):
+            pdf_path = pdf_manager.generate_combined_users_summary(
+                attendance_data,
+                start_str,
+                end_str,
+                output=output_path,
+                result=result
+            )
+        dataset = table_exporter.combined_summary_dataset(attendance_data, start_str, end_str, result=result)
+        preview_df = summary_preview(result)
+    
+    if not pdf_path:
+        raise RuntimeError("Failed to generate PDF")
+    
+    base_name = f"attendance_{user_label.split('(')[0].strip() if user_id else 'all_users'}_{start_str.replace('/', '_')}_to_{end_str.replace('/', '_')}"
+    return {
+        "path": pdf_path,
+        "file_name": f"{base_name}.pdf",
+        "mime": "application/pdf",
+        "base_name": base_name,
+        "dataset": dataset,
+        "stats": {
+            "Total Records": len(attendance_data),
+            "Unique Users": attendance_data['user_id'].nunique() if 'user_id' in attendance_data else 0,
+            "Days Covered": attendance_data['date'].nunique() if 'date' in attendance_data else 0
+        },
+        "preview": preview_df.head(20),
+        "total_rows": len(preview_df)
+    }
+
+def grid_report_job(progress, output_path: str, start_str: str, end_str: str) -> dict:
+    """Fetch a date range and render the users x days attendance grid"""
+    progress(0, 2, "Fetching attendance records...")
+    attendance_data = db_manager.get_attendance_range(start_str, end_str)
+    if attendance_data is None or attendance_data.empty:
+        return {"warning": f"⚠️ No attendance records found for {start_str} to {end_str}"}
+    
+    progress(1, 2, "Rendering grid...")
+    with tracing.span("generate_monthly_grid_report", tracing.PDF):
+        pdf_path = pdf_manager.generate_monthly_grid_report(
+            attendance_data,
+            start_str,
+            end_str,
+            output=output_path
+        )
+    if not pdf_path:
+        raise RuntimeError("Failed to generate PDF")
+    
+    base_name = f"attendance_grid_{start_str.replace('/', '_')}_to_{end_str.replace('/', '_')}"
+    with tracing.span("grid_dataset", tracing.COMPUTE):
+        dataset = table_exporter.grid_dataset(attendance_data, start_str, end_str)
+    return {
+        "path": pdf_path,
+        "file_name": f"{base_name}.pdf",
+        "mime": "application/pdf",
+        "base_name": base_name,
+        "dataset": dataset,
+        "stats": {
+            "Employees": len(dataset),
+            "Present (on time)": int(dataset['present'].sum()),
+            "Late": int(dataset['late'].sum()),
+            "Absent": int(dataset['absent'].sum())
+        }
+    }
+
+def payroll_pack_job(progress, output_path: str, start_str: str, end_str: str) -> dict:
+    """Render every employee's range report in parallel into one ZIP"""
+    progress(0, 1, "Fetching attendance records...")
+    attendance_data = db_manager.get_attendance_range(start_str, end_str)
+    if attendance_data is None or attendance_data.empty:
+        return {"warning": f"⚠️ No attendance records found for {start_str} to {end_str}"}
+    
+    from utils.payroll_pack import build_payroll_pack
+    
+    # Employees render in worker processes, so this shows up as one span
+    with tracing.span("build_payroll_pack", tracing.PDF) as pack_span:
+        zip_path = build_payroll_pack(
+            attendance_data,
+            start_str,
+            end_str,
+            output=output_path,
+            progress_callback=lambda done, total, user_name: progress(done, total, f"Rendered {done}/{total} - {user_name}")
+        )
+        if zip_path:
+            pack_span["bytes"] = os.path.getsize(zip_path)
+    if not zip_path:
+        raise RuntimeError("Failed to build payroll pack")
+    
+    return {
+        "path": zip_path,
+        "file_name": f"payroll_{start_str.replace('/', '_')}_to_{end_str.replace('/', '_')}.zip",
+        "mime": "application/zip"
+    }
+
+def submit_report_job(label: str, work, *args, output_suffix: str = ".pdf"):
+    """Queue a report build and remember it for this session"""
+    job_id = report_jobs.submit(label, work, *args, output_suffix=output_suffix)
+    st.session_state.report_jobs.insert(0, job_id)
+
+def read_report_file(path: str) -> bytes:
+    with open(path, 'rb') as f:
+        return f.read()
+
+@st.fragment(run_every=2)
+def pending_report_jobs():
+    """Progress for this session's queued/running jobs; reruns the page when one finishes"""
+    jobs = report_jobs.jobs(st.session_state.report_jobs)
+    pending_ids = [job['id'] for job in jobs if job['status'] in (JOB_QUEUED, JOB_RUNNING)]
+    
+    # A job finished since the last check - rerun the page to show its result
+    if set(st.session_state.report_jobs_pending) - set(pending_ids):
+        st.session_state.report_jobs_pending = pending_ids
+        st.rerun()
+    st.session_state.report_jobs_pending = pending_ids
+    
+    for job in jobs:
+        if job['id'] not in pending_ids:
+            continue
+        progress = job['progress']
+        if progress and progress['total']:
+            fraction = min(progress['done'] / progress['total'], 1.0)
+            text = progress['text']
+        else:
+            fraction = 0.0
+            text = "Queued..." if job['status'] == JOB_QUEUED else "Working..."
+        st.progress(fraction, text=f"⏳ {job['label']} - {text}")
+
+def finished_report_job(job: dict):
+    """Result of a finished job: downloads, exports, summary and preview"""
+    result = job['result'] or {}
+    
+    with st.container(border=True):
+        if job['status'] == JOB_FAILED:
+            st.error(f"❌ {job['label']}: {job['error']}")
+        elif result.get('warning'):
+            st.warning(result['warning'])
+        else:
+            st.success(f"✅ {job['label']} - ready")
             
-            if sync_history:
-                history_data = []
-                for record in sync_history:
-                    status_emoji = "✅" if record['status'] == 'completed' else "❌" if record['status'] == 'failed' else "⏳"
-                    
-                    history_data.append({
-                        'Status': f"{status_emoji} {record['status'].capitalize()}",
-                        'Days Synced': record['days_synced'],
-                        'Logs Uploaded': record['logs_synced'],
-                        'Triggered At': record['triggered_at'],
-                        'Completed At': record.get('completed_at', 'Pending'),
-                        'Error': record.get('error_message', '-')
-                    })
+            # Download button (file is read only when clicked)
+            st.download_button(
+                label="⬇️ Download Report",
+                data=lambda path=result['path']: read_report_file(path),
+                file_name=result['file_name'],
+                mime=result['mime'],
+                key=f"report_download_{job['id']}",
+                on_click="ignore",
+                width="stretch"
+            )
+            if result.get('dataset') is not None:
+                export_download_buttons(result['dataset'], result['base_name'], key=f"report_export_{job['id']}")
+            
+            # Statistics
+            if result.get('stats'):
+                st.markdown("#### 📈 Summary")
+                for col, (label, value) in zip(st.columns(len(result['stats'])), result['stats'].items()):
+                    with col:
+                        st.metric(label, value)
+            
+            # Where the job's time went (performance overlay)
+            if st.session_state.get('perf_overlay') and job.get('trace'):
+                with st.expander("⏱️ Job timing", expanded=False):
+                    trace_waterfall(job['trace'], key=f"job_trace_{job['id']}")
+            
+            # Preview data
+            if result.get('preview') is not None:
+                st.markdown("#### 👁️ Preview")
+                st.dataframe(result['preview'], width="stretch", hide_index=True)
                 
-                history_df = pd.DataFrame(history_data)
-                st.dataframe(history_df, hide_index=True, width="stretch")
-            else:
-                st.info("No sync history found.")
-        else:
-            st.warning("Could not fetch sync history.")
+                total_rows = result.get('total_rows', 0)
+                if total_rows > len(result['preview']):
+                    st.info(f"Showing first {len(result['preview'])} of {total_rows} records. Download PDF for complete report.")
+        
+        if st.button("Dismiss", key=f"report_dismiss_{job['id']}"):
+            report_jobs.discard(job['id'])
+            st.session_state.report_jobs.remove(job['id'])
+            st.rerun()
+
+def report_jobs_panel():
+    """This session's report jobs - survive reruns until dismissed or expired"""
+    jobs = report_jobs.jobs(st.session_state.report_jobs)
+    st.session_state.report_jobs = [job['id'] for job in jobs]  # Drop expired jobs
+    if not jobs:
+        return
+    
+    st.markdown("---")
+    st.markdown("#### 🗂️ Reports")
+    
+    # Jobs this run shows as pending; the fragment reruns the page once any of them finishes
+    st.session_state.report_jobs_pending = [job['id'] for job in jobs if job['status'] in (JOB_QUEUED, JOB_RUNNING)]
+    pending_report_jobs()
+    
+    for job in jobs:
+        if job['status'] in (JOB_DONE, JOB_FAILED):
+            finished_report_job(job)
 
 # ==================== ATTENDANCE REPORTS TAB ====================
 
+def export_download_buttons(dataset: "pd.DataFrame", base_name: str, key: str):
+    """One download button per tabular format; each file is only built when its button is clicked"""
+    from utils.table_exporter import EXPORT_FORMATS
+    
+    formats = table_exporter.available_formats()
+    for col, fmt in zip(st.columns(len(formats)), formats):
+        extension, mime = EXPORT_FORMATS[fmt]
+        with col:
+            st.download_button(
+                label=f"⬇️ {fmt.upper()}",
+                data=lambda fmt=fmt: table_exporter.export(dataset, fmt),
+                file_name=f"{base_name}{extension}",
+                mime=mime,
+                key=f"{key}_{fmt}",
+                on_click="ignore",
+                width="stretch"
+            )
+
 def attendance_reports_tab():
     """Reporting engine with PDF generation"""
     
@@ -430,6 +1222,9 @@ def attendance_reports_tab():
         single_day_report()
     else:
         date_range_report()
+    
+    # Reports build in the background; results stay here across reruns
+    report_jobs_panel()
 
 def single_day_report():
     """Single day report with user filter - UPDATED LAYOUT"""
@@ -441,8 +1236,8 @@ def single_day_report():
         selected_date = st.date_input("Select Date", value=date.today(), max_value=date.today())
     
     with col2:
-        # Get user list for dropdown from API
-        success, users_data = api_client.get_all_users()
+        # Get user list for dropdown (cached)
+        success, users_data = cached_users()
         user_options = {"All Users Combined": None}
         
         if success and users_data and 'users' in users_data:
@@ -459,62 +1254,8 @@ def single_day_report():
         # Convert to DD/MM format for backend
         date_str = selected_date.strftime("%d/%m")
         
-        with st.spinner("Generating report..."):
-            # Fetch attendance data from database
-            if user_id:
-                attendance_data = db_manager.get_user_attendance(user_id, date_str, date_str)
-            else:
-                attendance_data = db_manager.get_attendance_by_date(date_str)
-            
-            if attendance_data is None or attendance_data.empty:
-                st.warning(f"⚠️ No attendance records found for {date_str}")
-                return
-            
-            # Generate PDF
-            pdf_bytes = pdf_manager.generate_daily_report(
-                attendance_data,
-                date_str,
-                user_name=selected_user if user_id else None
-            )
-            
-            if pdf_bytes:
-                st.success("✅ Report generated successfully!")
-                
-                # Download button
-                st.download_button(
-                    label="⬇️ Download Report",
-                    data=pdf_bytes,
-                    file_name=f"attendance_report_{date_str.replace('/', '_')}.pdf",
-                    mime="application/pdf",
-                    width="stretch"
-                )
-                
-                # Preview data
-                st.markdown("#### 👁️ Preview")
-                
-                # Show preview with proper columns
-                preview_data = []
-                for _, row in attendance_data.iterrows():
-                    check_in = row.get('checked_in_time', 'N/A')
-                    check_out = row.get('checked_out_time', 'N/A')
-                    
-                    # Calculate hours
-                    hours = pdf_manager._calculate_hours(check_in, check_out)
-                    status = "Present" if row.get('is_present', False) else "Absent"
-                    
-                    preview_data.append({
-                        'Name': row['name'],
-                        'Date': row['date'],
-                        'Check In': check_in if check_in else 'N/A',
-                        'Check Out': check_out if check_out else 'N/A',
-                        'Hours': hours,
-                        'Status': status
-                    })
-                
-                preview_df = pd.DataFrame(preview_data)
-                st.dataframe(preview_df, width="stretch", hide_index=True)
-            else:
-                st.error("❌ Failed to generate PDF")
+        label = f"Daily report {date_str}" + (f" - {selected_user}" if user_id else "")
+        submit_report_job(label, daily_report_job, date_str, user_id, selected_user)
 
 def date_range_report():
     """Date range report with user filter - UPDATED"""
@@ -529,8 +1270,8 @@ def date_range_report():
         end_date = st.date_input("End Date", value=date.today(), max_value=date.today())
     
     with col3:
-        # Get user list for dropdown from API
-        success, users_data = api_client.get_all_users()
+        # Get user list for dropdown (cached)
+        success, users_data = cached_users()
         user_options = {"All Users Combined": None}
         
         if success and users_data and 'users' in users_data:
@@ -543,7 +1284,13 @@ def date_range_report():
     # Generate button below filters
     generate_btn = st.button("📄 Generate PDF", width="stretch", type="primary", key="range_btn")
     
-    if generate_btn:
+    # All Users only: attendance grid and payroll pack (one PDF per employee, zipped)
+    grid_btn = pack_btn = False
+    if user_id is None:
+        grid_btn = st.button("🗓️ Attendance Grid (P / L / A per day)", width="stretch", key="grid_report_btn")
+        pack_btn = st.button("📦 Payroll Pack (ZIP, one PDF per employee)", width="stretch", key="payroll_pack_btn")
+    
+    if generate_btn or grid_btn or pack_btn:
         if start_date > end_date:
             st.error("❌ Start date must be before end date")
             return
@@ -552,73 +1299,13 @@ def date_range_report():
         start_str = start_date.strftime("%d/%m")
         end_str = end_date.strftime("%d/%m")
         
-        with st.spinner("Generating report..."):
-            # Fetch attendance data from database
-            if user_id:
-                # Single user - show all records
-                attendance_data = db_manager.get_user_attendance(user_id, start_str, end_str)
-                
-                if attendance_data is None or attendance_data.empty:
-                    st.warning(f"⚠️ No attendance records found for {start_str} to {end_str}")
-                    return
-                
-                # Generate single user PDF
-                pdf_bytes = pdf_manager.generate_user_range_report(
-                    attendance_data,
-                    start_str,
-                    end_str,
-                    selected_user
-                )
-                
-            else:
-                # All users combined - show summary
-                attendance_data = db_manager.get_attendance_range(start_str, end_str)
-                
-                if attendance_data is None or attendance_data.empty:
-                    st.warning(f"⚠️ No attendance records found for {start_str} to {end_str}")
-                    return
-                
-                # Generate combined users summary PDF
-                pdf_bytes = pdf_manager.generate_combined_users_summary(
-                    attendance_data,
-                    start_str,
-                    end_str
-                )
-            
-            if pdf_bytes:
-                st.success("✅ Report generated successfully!")
-                
-                # Download button
-                filename = f"attendance_{selected_user.split('(')[0].strip() if user_id else 'all_users'}_{start_str.replace('/', '_')}_to_{end_str.replace('/', '_')}.pdf"
-                st.download_button(
-                    label="⬇️ Download Report",
-                    data=pdf_bytes,
-                    file_name=filename,
-                    mime="application/pdf",
-                    width="stretch"
-                )
-                
-                # Statistics
-                st.markdown("#### 📈 Summary")
-                col_a, col_b, col_c = st.columns(3)
-                with col_a:
-                    st.metric("Total Records", len(attendance_data))
-                with col_b:
-                    unique_users = attendance_data['user_id'].nunique() if 'user_id' in attendance_data else 0
-                    st.metric("Unique Users", unique_users)
-                with col_c:
-                    unique_days = attendance_data['date'].nunique() if 'date' in attendance_data else 0
-                    st.metric("Days Covered", unique_days)
-                
-                # Preview data
-                st.markdown("#### 👁️ Preview")
-                st.dataframe(attendance_data.head(20), width="stretch", hide_index=True)
-                
-                if len(attendance_data) > 20:
-                    st.info(f"Showing first 20 of {len(attendance_data)} records. Download PDF for complete report.")
-                
-            else:
-                st.error("❌ Failed to generate PDF")
+        if pack_btn:
+            submit_report_job(f"Payroll pack {start_str} to {end_str}", payroll_pack_job, start_str, end_str, output_suffix=".zip")
+        elif grid_btn:
+            submit_report_job(f"Attendance grid {start_str} to {end_str}", grid_report_job, start_str, end_str)
+        else:
+            label = f"Range report {start_str} to {end_str} - {selected_user if user_id else 'All Users'}"
+            submit_report_job(label, range_report_job, start_str, end_str, user_id, selected_user)
 
 # ==================== ABOUT PAGE ====================
 
@@ -756,6 +1443,82 @@ def contact_page():
                 st.success("✅ Report submitted successfully!")
                 st.info("Our team will review it shortly.")
 
+# ==================== PERFORMANCE OVERLAY ====================
+
+CATEGORY_LABELS = {
+    tracing.API: "🌐 API",
+    tracing.DB: "🗄️ Database",
+    tracing.FRAME: "🧮 DataFrames",
+    tracing.COMPUTE: "⚙️ Compute",
+    tracing.PDF: "📄 PDF",
+    tracing.RENDER: "🖥️ Render"
+}
+
+def format_bytes(size) -> str:
+    if not size:
+        return "-"
+    for unit in ("B", "KB", "MB"):
+        if size < 1024:
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GB"
+
+def trace_waterfall(trace: dict, key: str):
+    """Per-category totals, a start/end bar per span and the span table"""
+    spans = trace['spans']
+    if not spans:
+        st.caption(f"{trace['total_ms']:.0f} ms, no traced calls (everything came from cache)")
+        return
+    
+    # Totals per category
+    totals = tracing.summarize(spans)
+    for col, (category, total) in zip(st.columns(len(totals)), totals.items()):
+        with col:
+            st.metric(CATEGORY_LABELS.get(category, category), f"{total['ms']:.0f} ms",
+                      help=f"{total['count']} call(s), {format_bytes(total['bytes'])}")
+    
+    # Waterfall: one bar per span from its start to its end
+    rows = [{
+        'step': f"{i:02d}. {span['name']}"[:80],
+        'category': CATEGORY_LABELS.get(span['category'], span['category']),
+        'start': round(span['start_ms'], 1),
+        'end': round(span['start_ms'] + max(span['duration_ms'], 0.5), 1),
+        'ms': round(span['duration_ms'], 1),
+        'size': format_bytes(span['bytes']),
+        'detail': span['detail'] or ""
+    } for i, span in enumerate(spans, 1)]
+    
+    st.vega_lite_chart({
+        'data': {'values': rows},
+        'mark': {'type': 'bar', 'cornerRadius': 2},
+        'encoding': {
+            'y': {'field': 'step', 'type': 'nominal', 'sort': None, 'title': None},
+            'x': {'field': 'start', 'type': 'quantitative', 'title': 'ms since start'},
+            'x2': {'field': 'end'},
+            'color': {'field': 'category', 'type': 'nominal', 'title': None},
+            'tooltip': [
+                {'field': 'step'}, {'field': 'ms', 'title': 'ms'},
+                {'field': 'size', 'title': 'bytes'}, {'field': 'detail'}
+            ]
+        },
+        'height': max(120, 22 * len(rows))
+    }, width="stretch", key=f"{key}_chart")
+    
+    st.dataframe(
+        [{'Step': r['step'], 'Category': r['category'], 'Start (ms)': r['start'],
+          'Duration (ms)': r['ms'], 'Bytes': r['size'], 'Detail': r['detail']} for r in rows],
+        hide_index=True,
+        width="stretch",
+        key=f"{key}_table"
+    )
+
+def performance_overlay(rerun_trace: "tracing.Trace"):
+    """Timing waterfall of the rerun that just finished"""
+    st.markdown("---")
+    with st.expander(f"⏱️ Performance - this rerun took {rerun_trace.total_ms():.0f} ms", expanded=True):
+        trace_waterfall(rerun_trace.to_dict(), key="rerun_trace")
+        st.caption("Report jobs run in the background - their timings are on each finished report.")
+
 # ==================== MAIN APPLICATION ====================
 
 def main():
@@ -773,19 +1536,28 @@ def main():
         st.rerun()
         return
     
-    # Render sidebar
-    render_sidebar()
-    
-    # Render navigation
-    render_navigation()
-    
-    # Route to appropriate page
-    if st.session_state.current_page == 'Home':
-        home_page()
-    elif st.session_state.current_page == 'About':
-        about_page()
-    elif st.session_state.current_page == 'Contact':
-        contact_page()
+    # Trace this rerun when the admin has the performance overlay on
+    overlay = st.session_state.get('perf_overlay', False)
+    with (tracing.trace("rerun") if overlay else contextlib.nullcontext()) as rerun_trace:
+        # Render sidebar
+        with tracing.span("sidebar", tracing.RENDER):
+            render_sidebar()
+        
+        # Render navigation
+        with tracing.span("navigation", tracing.RENDER):
+            render_navigation()
+        
+        # Route to appropriate page
+        with tracing.span(f"{st.session_state.current_page} page", tracing.RENDER):
+            if st.session_state.current_page == 'Home':
+                home_page()
+            elif st.session_state.current_page == 'About':
+                about_page()
+            elif st.session_state.current_page == 'Contact':
+                contact_page()
+    
+    if rerun_trace is not None:
+        performance_overlay(rerun_trace)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
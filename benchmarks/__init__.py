@@ -0,0 +1,4 @@
+"""
+Benchmarks and local tooling for the Fingerprint Attendance System
+Nothing in here is imported by the Streamlit app
+"""
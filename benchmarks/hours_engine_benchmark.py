@@ -0,0 +1,59 @@
+"""
+Hours / late / salary engine benchmark
+
+Compares PDFManager's per-row helpers against the vectorized
+attendance_engine on the same frame and checks the results are identical.
+
+Usage:
+    python -m benchmarks.hours_engine_benchmark --rows 1000000
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from benchmarks.synthetic import make_attendance_frame
+from utils.pdf_manager import PDFManager
+
+
+def run(rows: int) -> None:
+    pdf_manager = PDFManager()
+    df = make_attendance_frame(rows, users=1000, dirty=True)
+    print(f"Rows: {rows:,}\n")
+
+    start = time.perf_counter()
+    hours = np.array([
+        pdf_manager._calculate_hours(ci, co)
+        for ci, co in zip(df['checked_in_time'], df['checked_out_time'])
+    ])
+    late = np.array([pdf_manager._is_late_arrival(ci) for ci in df['checked_in_time']])
+    totals = np.array([
+        pdf_manager._calculate_daily_salary(s, ci, co)
+        for s, ci, co in zip(df['salary'], df['checked_in_time'], df['checked_out_time'])
+    ], dtype=np.float64)
+    per_row = time.perf_counter() - start
+
+    start = time.perf_counter()
+    metrics = pdf_manager.compute_metrics(df)
+    vectorized = time.perf_counter() - start
+
+    identical = (
+        np.array_equal(hours, metrics['hours'].to_numpy())
+        and np.array_equal(late, metrics['is_late'].to_numpy())
+        and np.array_equal(totals, metrics['daily_total'].to_numpy(), equal_nan=True)
+    )
+
+    print(f"{'engine':<14}{'seconds':>10}{'rows/s':>16}")
+    print(f"{'per-row':<14}{per_row:>10.3f}{rows / per_row:>16,.0f}")
+    print(f"{'vectorized':<14}{vectorized:>10.3f}{rows / vectorized:>16,.0f}")
+    print(f"\nSpeed-up: {per_row / vectorized:.1f}x | results identical: {identical}")
+    if not identical:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Per-row vs vectorized hours/salary engine")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    args = parser.parse_args()
+    run(args.rows)
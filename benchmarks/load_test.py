@@ -0,0 +1,190 @@
+"""
+Load test harness for APIClient
+
+Simulates N concurrent admin sessions, each repeating the request mix
+one dashboard interaction produces, and reports throughput and tail
+latency per operation. Targets the local stand-in backend by default,
+or any backend via --url. Against --url the mix is read-only unless
+--allow-writes is given, since the sample mutation overwrites salaries.
+
+Usage:
+    python -m benchmarks.load_test --sessions 20 --duration 15 --latency-ms 30 --failure-rate 0.01
+    python -m benchmarks.load_test --url http://localhost:8000 --username admin --password secret
+"""
+
+import argparse
+import random
+import threading
+import time
+from datetime import datetime
+from typing import Callable, Dict, List, Tuple
+
+from benchmarks.standin_backend import StandInBackend
+from utils.api_client import APIClient
+from utils.metrics import MetricsRegistry
+
+
+def _percentile(sorted_values: List[float], q: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, int(round(q * (len(sorted_values) - 1)))))
+    return sorted_values[index]
+
+
+def _session_ops(client: APIClient, rng: random.Random, allow_writes: bool) -> List[Tuple[str, Callable[[], bool]]]:
+    """The calls one dashboard rerun makes, plus an occasional mutation if allowed"""
+    today = datetime.now().strftime("%d/%m")
+    ops = [
+        ("get_device_status", lambda: client.get_device_status().get("connected", False)),
+        ("get_dashboard_stats", lambda: client.get_dashboard_stats() is not None),
+        ("get_all_users", lambda: client.get_all_users()[0]),
+        ("get_sync_history", lambda: client.get_sync_history("ESP32_MAIN", limit=10)[0]),
+        ("get_attendance_by_date", lambda: client.get_attendance_by_date(today)[0]),
+    ]
+    if allow_writes and rng.random() < 0.1:
+        user_id = rng.randint(1, 50)
+        ops.append(("update_user", lambda: client.update_user(user_id=user_id, salary=2500.0)[0]))
+    return ops
+
+
+def _run_session(
+    base_url: str,
+    username: str,
+    password: str,
+    deadline: float,
+    seed: int,
+    results: Dict[str, List[Tuple[float, bool]]],
+    lock: threading.Lock,
+    allow_writes: bool
+) -> None:
+    client = APIClient(base_url, metrics=MetricsRegistry())
+    rng = random.Random(seed)
+    local: Dict[str, List[Tuple[float, bool]]] = {}
+
+    start = time.perf_counter()
+    ok, _ = client.login(username, password)
+    local.setdefault("login", []).append(((time.perf_counter() - start) * 1000, ok))
+
+    while time.perf_counter() < deadline:
+        for name, op in _session_ops(client, rng, allow_writes):
+            start = time.perf_counter()
+            try:
+                ok = bool(op())
+            except Exception:
+                ok = False
+            local.setdefault(name, []).append(((time.perf_counter() - start) * 1000, ok))
+
+    with lock:
+        for name, samples in local.items():
+            results.setdefault(name, []).extend(samples)
+
+
+def run_load(
+    base_url: str,
+    sessions: int,
+    duration: float,
+    username: str = "admin",
+    password: str = "admin",
+    allow_writes: bool = False
+) -> Dict[str, Dict[str, float]]:
+    """
+    Drive `sessions` concurrent admin sessions for `duration` seconds
+
+    Args:
+        allow_writes: Include the update_user mutation (overwrites salaries -
+            only for the stand-in or a disposable backend)
+
+    Returns:
+        Dict of operation name -> {count, errors, rps, p50_ms, p95_ms, p99_ms, max_ms}
+    """
+    results: Dict[str, List[Tuple[float, bool]]] = {}
+    lock = threading.Lock()
+    started = time.perf_counter()
+    deadline = started + duration
+
+    threads = [
+        threading.Thread(
+            target=_run_session,
+            args=(base_url, username, password, deadline, seed, results, lock, allow_writes),
+            daemon=True
+        )
+        for seed in range(sessions)
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - started
+
+    report = {}
+    all_samples = []
+    for name, samples in sorted(results.items()):
+        latencies = sorted(ms for ms, _ in samples)
+        all_samples.extend(samples)
+        report[name] = {
+            "count": len(samples),
+            "errors": sum(1 for _, ok in samples if not ok),
+            "rps": len(samples) / elapsed,
+            "p50_ms": _percentile(latencies, 0.50),
+            "p95_ms": _percentile(latencies, 0.95),
+            "p99_ms": _percentile(latencies, 0.99),
+            "max_ms": latencies[-1] if latencies else 0.0,
+        }
+    latencies = sorted(ms for ms, _ in all_samples)
+    report["TOTAL"] = {
+        "count": len(all_samples),
+        "errors": sum(1 for _, ok in all_samples if not ok),
+        "rps": len(all_samples) / elapsed,
+        "p50_ms": _percentile(latencies, 0.50),
+        "p95_ms": _percentile(latencies, 0.95),
+        "p99_ms": _percentile(latencies, 0.99),
+        "max_ms": latencies[-1] if latencies else 0.0,
+    }
+    return report
+
+
+def print_report(report: Dict[str, Dict[str, float]]) -> None:
+    print(f"{'operation':<24}{'count':>8}{'errors':>8}{'req/s':>9}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'max ms':>9}")
+    for name, row in report.items():
+        print(f"{name:<24}{row['count']:>8}{row['errors']:>8}{row['rps']:>9.1f}{row['p50_ms']:>9.1f}"
+              f"{row['p95_ms']:>9.1f}{row['p99_ms']:>9.1f}{row['max_ms']:>9.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Concurrent admin-session load test for APIClient")
+    parser.add_argument("--url", help="Target backend; omit to start the local stand-in")
+    parser.add_argument("--username", default="admin")
+    parser.add_argument("--password", default="admin")
+    parser.add_argument("--sessions", type=int, default=10)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--users", type=int, default=200, help="Stand-in user count")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Stand-in base latency")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="Stand-in latency jitter")
+    parser.add_argument("--failure-rate", type=float, default=0.0, help="Stand-in injected 500 rate")
+    parser.add_argument("--drop-rate", type=float, default=0.0, help="Stand-in dropped connection rate")
+    parser.add_argument("--allow-writes", action="store_true",
+                        help="Send update_user against --url too (overwrites salaries; always on for the stand-in)")
+    args = parser.parse_args()
+
+    backend = None
+    url = args.url
+    if not url:
+        backend = StandInBackend(
+            user_count=args.users,
+            username=args.username,
+            password=args.password,
+            latency_ms=args.latency_ms,
+            jitter_ms=args.jitter_ms,
+            failure_rate=args.failure_rate,
+            drop_rate=args.drop_rate
+        )
+        url = backend.start()
+
+    allow_writes = backend is not None or args.allow_writes
+    print(f"Target: {url} | sessions: {args.sessions} | duration: {args.duration:.0f}s | "
+          f"writes: {'on' if allow_writes else 'off'}\n")
+    try:
+        print_report(run_load(url, args.sessions, args.duration, args.username, args.password, allow_writes))
+    finally:
+        if backend:
+            backend.stop()
@@ -0,0 +1,182 @@
+"""
+PDF report benchmark suite
+
+Drives generate_daily_report, generate_user_range_report and
+generate_combined_users_summary with synthetic frames from 10 to 100k rows,
+recording wall time, peak Python memory and PDF size per report and size,
+and compares the run against a saved baseline. Each case is built once to
+warm up and once under tracemalloc, then timed --repeat times and the
+median kept.
+
+The user range report has one row per calendar day, so its PDF stops
+growing at a year (365 rows) even though the input frame keeps growing.
+
+Usage:
+    python -m benchmarks.pdf_benchmark
+    python -m benchmarks.pdf_benchmark --sizes 10 1000 --reports daily combined
+    python -m benchmarks.pdf_benchmark --repeat 5 --save-baseline
+    python -m benchmarks.pdf_benchmark --fail-on-regression --threshold 0.25
+"""
+
+import argparse
+import gc
+import json
+import os
+import platform
+import statistics
+import time
+import tracemalloc
+from datetime import date, datetime, timedelta
+from typing import Callable, Dict, List, Optional
+
+import pandas as pd
+
+from benchmarks.synthetic import make_attendance_frame
+from utils.pdf_manager import PDFManager
+
+DEFAULT_SIZES = [10, 100, 1_000, 10_000, 100_000]
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), "baselines", "pdf_benchmark.json")
+START = date(2025, 6, 1)
+METRICS = ("seconds", "peak_mb", "pdf_kb")
+
+
+def _period(rows_per_user: int) -> tuple:
+    """DD/MM start and end covering rows_per_user days (at most 365, so the end never wraps onto the start)"""
+    days = max(1, min(rows_per_user, 365))
+    return START.strftime("%d/%m"), (START + timedelta(days=days - 1)).strftime("%d/%m")
+
+
+def _daily(pdf_manager: PDFManager, rows: int) -> Callable[[], bytes]:
+    # One day: every row is a different employee
+    df = make_attendance_frame(rows, users=rows, start=START, dirty=True)
+    return lambda: pdf_manager.generate_daily_report(df, START.strftime("%d/%m"))
+
+
+def _user_range(pdf_manager: PDFManager, rows: int) -> Callable[[], bytes]:
+    df = make_attendance_frame(rows, users=1, start=START, dirty=True)
+    start_date, end_date = _period(rows)
+    return lambda: pdf_manager.generate_user_range_report(df, start_date, end_date, df['name'].iloc[0])
+
+
+def _combined(pdf_manager: PDFManager, rows: int) -> Callable[[], bytes]:
+    # A month per employee
+    users = max(1, rows // 30)
+    df = make_attendance_frame(rows, users=users, start=START, dirty=True)
+    start_date, end_date = _period(-(-rows // users))
+    return lambda: pdf_manager.generate_combined_users_summary(df, start_date, end_date)
+
+
+REPORTS: Dict[str, Callable[[PDFManager, int], Callable[[], bytes]]] = {
+    "daily": _daily,
+    "user_range": _user_range,
+    "combined": _combined,
+}
+
+
+def measure(build: Callable[[], bytes], memory: bool = True, repeat: int = 3) -> Dict[str, float]:
+    """Build once to warm up, (optionally) once under tracemalloc for peak memory, then time `repeat` builds"""
+    pdf_bytes = build()
+    if not pdf_bytes:
+        raise RuntimeError("report generation failed")
+
+    peak_mb = None
+    if memory:
+        # Separate pass: tracemalloc slows allocation-heavy code too much to time under it
+        gc.collect()
+        tracemalloc.start()
+        build()
+        peak_mb = tracemalloc.get_traced_memory()[1] / (1024 * 1024)
+        tracemalloc.stop()
+
+    samples = []
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        build()
+        samples.append(time.perf_counter() - start)
+    return {"seconds": statistics.median(samples), "peak_mb": peak_mb, "pdf_kb": len(pdf_bytes) / 1024}
+
+
+def run(sizes: List[int], reports: List[str], memory: bool = True, repeat: int = 3) -> dict:
+    pdf_manager = PDFManager()
+    results = {}
+    for report in reports:
+        for rows in sizes:
+            build = REPORTS[report](pdf_manager, rows)
+            results[f"{report}/{rows}"] = measure(build, memory, repeat)
+            r = results[f"{report}/{rows}"]
+            peak = f"{r['peak_mb']:.1f} MB" if r['peak_mb'] is not None else "-"
+            print(f"  {report:<11}{rows:>8,} rows  {r['seconds']:>8.3f}s  {peak:>10}  {r['pdf_kb']:>9.1f} KB", flush=True)
+    return {
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "pandas": pd.__version__,
+        "repeat": repeat,
+        "results": results,
+    }
+
+
+def _cell(value: Optional[float], width: int, spec: str = ".3f") -> str:
+    return (format(value, spec) if value is not None else "-").rjust(width)
+
+
+def compare(current: dict, baseline: Optional[dict], threshold: float) -> List[str]:
+    """Print current vs baseline per case; returns the cases whose time or memory regressed past threshold"""
+    base_results = (baseline or {}).get("results", {})
+    regressions = []
+
+    header = f"{'case':<20}"
+    for metric in METRICS:
+        header += f"{metric:>10}{'base':>10}{'Δ':>7}"
+    print("\n" + header)
+
+    for case, r in current["results"].items():
+        b = base_results.get(case, {})
+        row = f"{case:<20}"
+        for metric in METRICS:
+            value, base = r.get(metric), b.get(metric)
+            delta = (value - base) / base if value is not None and base else None
+            row += _cell(value, 10) + _cell(base, 10) + _cell(delta, 7, "+.0%")
+            if delta is not None and metric != "pdf_kb" and delta > threshold:
+                regressions.append(f"{case} {metric} {delta:+.0%}")
+        print(row)
+
+    if baseline:
+        print(f"\nBaseline: {baseline.get('created')} (Python {baseline.get('python')}, {baseline.get('platform')})")
+    else:
+        print("\nNo baseline found - run with --save-baseline to record one")
+    return regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="PDF report generation benchmark")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--reports", nargs="+", choices=list(REPORTS), default=list(REPORTS))
+    parser.add_argument("--repeat", type=int, default=3, help="Timed builds per case after the warm-up (median is kept)")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="Baseline JSON to compare against / save to")
+    parser.add_argument("--save-baseline", action="store_true", help="Write this run as the new baseline")
+    parser.add_argument("--no-memory", action="store_true", help="Skip the tracemalloc pass")
+    parser.add_argument("--threshold", type=float, default=0.20, help="Relative slowdown counted as a regression")
+    parser.add_argument("--fail-on-regression", action="store_true", help="Exit 1 if any case regressed")
+    args = parser.parse_args()
+
+    print(f"Sizes: {args.sizes} | reports: {args.reports} | median of {args.repeat} warm builds per case\n")
+    current = run(args.sizes, args.reports, memory=not args.no_memory, repeat=args.repeat)
+
+    baseline = None
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+    regressions = compare(current, baseline, args.threshold)
+
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(os.path.abspath(args.baseline)), exist_ok=True)
+        with open(args.baseline, "w") as f:
+            json.dump(current, f, indent=2)
+        print(f"Saved baseline to {args.baseline}")
+
+    if regressions:
+        print("\nRegressions:\n  " + "\n  ".join(regressions))
+        if args.fail_on_regression:
+            raise SystemExit(1)
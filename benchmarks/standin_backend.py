@@ -0,0 +1,545 @@
+"""
+Local stand-in for the FastAPI backend
+Implements every route APIClient uses on synthetic in-memory data, with
+content negotiation (gzip / msgpack) and latency / failure injection
+
+Usage:
+    python -m benchmarks.standin_backend --port 8000 --latency-ms 40 --failure-rate 0.02
+"""
+
+import gzip
+import json
+import random
+import re
+import socket
+import threading
+import time
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+
+JSON_MIME = "application/json"
+MSGPACK_MIME = "application/x-msgpack"
+
+FIRST_NAMES = ["Ali", "Sara", "Usman", "Ayesha", "Bilal", "Fatima", "Hamza", "Zainab", "Omar", "Hira"]
+LAST_NAMES = ["Khan", "Ahmed", "Malik", "Shah", "Raza", "Iqbal", "Hussain", "Butt", "Qureshi", "Siddiqui"]
+
+
+# ==================== SYNTHETIC DATA ====================
+
+def make_users(count: int, seed: int = 42) -> List[Dict[str, Any]]:
+    """Generate user rows shaped like GET /esp32/users entries"""
+    rng = random.Random(seed)
+    users = []
+    for i in range(1, count + 1):
+        slots = [i * 2 - 1, i * 2] if rng.random() < 0.3 else [i]
+        users.append({
+            "id": i,
+            "name": f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+            "user_id": i,
+            "slot_id": slots,
+            "total_templates": len(slots),
+            "date": f"{rng.randint(1, 28):02d}/{rng.randint(1, 12):02d}",
+            "time": f"{rng.randint(8, 17):02d}:{rng.randint(0, 59):02d}:{rng.randint(0, 59):02d}",
+            "salary": float(rng.choice([1500, 2000, 2500, 3000, 4000])),
+        })
+    return users
+
+
+def make_attendance(users: List[Dict[str, Any]], date_str: str, seed: int = 7) -> List[Dict[str, Any]]:
+    """Generate one day of attendance records for the given users"""
+    rng = random.Random(f"{seed}-{date_str}")
+    records = []
+    for user in users:
+        if rng.random() < 0.1:
+            continue
+        check_in = f"{rng.randint(8, 10):02d}:{rng.randint(0, 59):02d}"
+        check_out = f"{rng.randint(16, 19):02d}:{rng.randint(0, 59):02d}" if rng.random() < 0.85 else None
+        records.append({
+            "id": len(records) + 1,
+            "name": user["name"],
+            "user_id": user["user_id"],
+            "slot_id": user["slot_id"],
+            "date": date_str,
+            "checked_in_time": check_in,
+            "checked_out_time": check_out,
+            "is_present": True,
+        })
+    return records
+
+
+# ==================== CONTENT NEGOTIATION ====================
+
+def _accepts(header: str, mime: str) -> bool:
+    """True if the Accept header lists mime with a non-zero quality"""
+    for part in header.split(","):
+        fields = [f.strip() for f in part.split(";")]
+        if fields[0].lower() != mime:
+            continue
+        for field in fields[1:]:
+            if field.startswith("q=") and float(field[2:] or 0) == 0:
+                return False
+        return True
+    return False
+
+
+def encode_body(payload: Any, accept: str = "", accept_encoding: str = "") -> Tuple[bytes, Dict[str, str]]:
+    """
+    Serialize payload the way the client asked for it
+
+    Returns:
+        Tuple of (body bytes, response headers)
+    """
+    if msgpack is not None and _accepts(accept, MSGPACK_MIME):
+        body = msgpack.packb(payload, use_bin_type=True)
+        headers = {"Content-Type": MSGPACK_MIME}
+    else:
+        body = json.dumps(payload).encode("utf-8")
+        headers = {"Content-Type": JSON_MIME}
+
+    encodings = [e.split(";")[0].strip().lower() for e in accept_encoding.split(",")]
+    if "gzip" in encodings:
+        body = gzip.compress(body, compresslevel=6)
+        headers["Content-Encoding"] = "gzip"
+
+    headers["Content-Length"] = str(len(body))
+    return body, headers
+
+
+# ==================== BACKEND STATE ====================
+
+class StandInBackend:
+    """
+    In-memory backend state plus a threaded HTTP server
+
+    Fault injection (all adjustable at runtime via configure()):
+        latency_ms: Fixed delay added to every request
+        jitter_ms: Extra uniform random delay in [0, jitter_ms]
+        failure_rate: Fraction of requests answered with failure_status
+        failure_status: HTTP status used for injected failures
+        drop_rate: Fraction of requests whose connection is closed without a response
+        route_latency_ms: Extra delay per route prefix, e.g. {"/esp32/user/esp32/users": 200}
+        sync_logs_per_second: Upload rate of a simulated ESP32 sync
+    """
+
+    def __init__(
+        self,
+        user_count: int = 200,
+        seed: int = 42,
+        username: str = "admin",
+        password: str = "admin",
+        **faults
+    ):
+        self.users = make_users(user_count, seed)
+        self.seed = seed
+        self.credentials = (username, password)
+        self.devices: Dict[str, Dict[str, Any]] = {
+            "ESP32_MAIN": {"device_id": "ESP32_MAIN", "status": "online", "last_seen": datetime.now().isoformat()}
+        }
+        self.sync_history: Dict[str, List[Dict[str, Any]]] = {}
+        self._attendance: Dict[str, List[Dict[str, Any]]] = {}
+        self._change_seq = 0  # Stamped on attendance records as they are created / changed
+        self._idempotent_responses: Dict[str, Tuple[int, Any]] = {}
+        self._lock = threading.Lock()
+        self._rng = random.Random(seed)
+
+        self.latency_ms = 0.0
+        self.jitter_ms = 0.0
+        self.failure_rate = 0.0
+        self.failure_status = 500
+        self.drop_rate = 0.0
+        self.route_latency_ms: Dict[str, float] = {}
+        self.sync_logs_per_second = 400.0
+        self.configure(**faults)
+
+        self._sync_progress: Dict[str, Dict[str, Any]] = {}
+        self._progress_changed = threading.Condition()
+
+        self.server: Optional[ThreadingHTTPServer] = None
+        self.thread: Optional[threading.Thread] = None
+
+        self.routes = [
+            ("GET", r"/health", self.health),
+            ("POST", r"/esp32/user/admin/login", self.login),
+            ("GET", r"/esp32/user/esp32/users", self.list_users),
+            ("GET", r"/esp32/user/esp32/user/(?P<user_id>\d+)", self.get_user),
+            ("PUT", r"/esp32/user/admin/user/update", self.update_user),
+            ("POST", r"/esp32/user/esp32/user", self.create_user),
+            ("DELETE", r"/esp32/user/esp32/user/delete", self.delete_user),
+            ("GET", r"/esp32/esp32/status/(?P<device_id>[^/]+)", self.device_status),
+            ("GET", r"/esp32/esp32/status", self.all_devices_status),
+            ("GET", r"/esp32/atendance/esp32/attendance/date/(?P<date_str>\d{2}/\d{2})", self.attendance_by_date),
+            ("GET", r"/esp32/attendance/esp32/attendance/(?P<user_id>\d+)/(?P<date_str>\d{2}/\d{2})", self.user_attendance),
+            ("GET", r"/esp32/attendance/esp32/attendance/changes", self.attendance_changes),
+            ("POST", r"/esp32/attendance/esp32/attendance", self.log_attendance),
+            ("POST", r"/esp32/attendance/esp32/trigger-attendance-sync", self.trigger_sync),
+            ("GET", r"/esp32/attendance/esp32/sync-history/(?P<device_id>[^/]+)", self.get_sync_history),
+            ("GET", r"/esp32/attendance/esp32/sync-progress/(?P<device_id>[^/]+)", self.get_sync_progress),
+            ("GET", r"/esp32/user/admin/stats/dashboard", self.dashboard_stats),
+        ]
+        self._compiled = [(m, re.compile(pattern + "$"), handler) for m, pattern, handler in self.routes]
+
+    def configure(self, **faults) -> None:
+        """Update latency / failure injection settings"""
+        for name, value in faults.items():
+            if not hasattr(self, name) or name.startswith("_") or callable(getattr(self, name)):
+                raise ValueError(f"Unknown fault setting: {name}")
+            setattr(self, name, value)
+
+    def attendance_for(self, date_str: str) -> List[Dict[str, Any]]:
+        with self._lock:
+            if date_str not in self._attendance:
+                records = make_attendance(self.users, date_str, self.seed)
+                for record in records:
+                    record["version"] = self._next_change()
+                self._attendance[date_str] = records
+            return self._attendance[date_str]
+
+    def _next_change(self) -> int:
+        self._change_seq += 1
+        return self._change_seq
+
+    def _find_user(self, user_id: int) -> Optional[Dict[str, Any]]:
+        return next((u for u in self.users if u["user_id"] == user_id), None)
+
+    # ==================== ROUTES ====================
+
+    def health(self, query, body):
+        return 200, {"status": "healthy"}
+
+    def login(self, query, body):
+        if (body.get("username"), body.get("password")) == self.credentials:
+            return 200, {"success": True, "token": f"standin-{self._rng.getrandbits(64):016x}"}
+        return 200, {"success": False, "message": "Invalid credentials"}
+
+    def list_users(self, query, body):
+        if "offset" not in query and "limit" not in query:
+            return 200, {"users": self.users, "total": len(self.users)}
+
+        # Paged: ?offset=&limit=&search= (name substring or exact user_id)
+        users = self.users
+        search = query.get("search", [""])[0].strip().lower()
+        if search:
+            users = [u for u in users if search in u["name"].lower() or search == str(u["user_id"])]
+        offset = int(query.get("offset", ["0"])[0])
+        limit = int(query.get("limit", ["50"])[0])
+        return 200, {"users": users[offset:offset + limit], "total": len(users), "offset": offset, "limit": limit}
+
+    def get_user(self, query, body, user_id):
+        user = self._find_user(int(user_id))
+        return (200, user) if user else (404, {"detail": "User not found"})
+
+    def update_user(self, query, body):
+        with self._lock:
+            user = self._find_user(int(body.get("user_id", -1)))
+            if not user:
+                return 404, {"detail": "User not found"}
+            for field in ("name", "date", "time", "salary"):
+                if field in body:
+                    user[field] = body[field]
+            if "slot_id" in body:
+                user["slot_id"] = body["slot_id"]
+                user["total_templates"] = len(body["slot_id"])
+        return 200, {"success": True, "message": "User updated successfully"}
+
+    def create_user(self, query, body):
+        with self._lock:
+            if self._find_user(int(body.get("id", -1))):
+                return 400, {"detail": "User already exists"}
+            slots = body.get("slot_id", [])
+            self.users.append({
+                "id": len(self.users) + 1,
+                "name": body.get("name", ""),
+                "user_id": int(body["id"]),
+                "slot_id": slots,
+                "total_templates": len(slots),
+                "date": body.get("date", ""),
+                "time": body.get("time", ""),
+                "salary": None,
+            })
+        return 200, {"success": True, "message": "User created successfully"}
+
+    def delete_user(self, query, body):
+        with self._lock:
+            user = self._find_user(int(body.get("user_id", -1)))
+            if not user:
+                return 404, {"detail": "User not found"}
+            self.users.remove(user)
+        return 200, {"success": True, "message": "User deleted successfully"}
+
+    def device_status(self, query, body, device_id):
+        device = self.devices.get(device_id)
+        if not device:
+            return 404, {"detail": "Device not found"}
+        return 200, {**device, "is_online": device["status"] == "online"}
+
+    def all_devices_status(self, query, body):
+        return 200, {"devices": [{**d, "is_online": d["status"] == "online"} for d in self.devices.values()]}
+
+    def attendance_by_date(self, query, body, date_str):
+        return 200, {"date": date_str, "records": self.attendance_for(date_str)}
+
+    def user_attendance(self, query, body, user_id, date_str):
+        records = [r for r in self.attendance_for(date_str) if r["user_id"] == int(user_id)]
+        return 200, {"user_id": int(user_id), "date": date_str, "records": records}
+
+    def attendance_changes(self, query, body):
+        date_str = query.get("date", [datetime.now().strftime("%d/%m")])[0]
+        since = int(query.get("since", ["0"])[0] or 0)
+        limit = int(query.get("limit", ["500"])[0])
+        records = self.attendance_for(date_str)
+        with self._lock:
+            changed = sorted((r for r in records if r["version"] > since), key=lambda r: r["version"])
+            page = [dict(r) for r in changed[:limit]]
+        cursor = str(page[-1]["version"]) if page else str(since)
+        return 200, {"date": date_str, "records": page, "cursor": cursor, "has_more": len(changed) > limit}
+
+    def log_attendance(self, query, body):
+        records = self.attendance_for(body.get("date", ""))
+        with self._lock:
+            record = next((r for r in records if r["user_id"] == body.get("id")), None)
+            if record is None:
+                records.append({
+                    "id": len(records) + 1,
+                    "name": body.get("name", ""),
+                    "user_id": body.get("id"),
+                    "slot_id": body.get("slot_id", []),
+                    "date": body.get("date"),
+                    "checked_in_time": body.get("time", "")[:5],
+                    "checked_out_time": None,
+                    "is_present": True,
+                    "version": self._next_change(),
+                })
+                return 200, {"success": True, "message": "Check-in recorded"}
+            record["checked_out_time"] = body.get("time", "")[:5]
+            record["version"] = self._next_change()
+        return 200, {"success": True, "message": "Check-out recorded"}
+
+    def trigger_sync(self, query, body):
+        device_id = body.get("device_id", "ESP32_MAIN")
+        days = int(body.get("days", 1))
+        with self._lock:
+            history = self.sync_history.setdefault(device_id, [])
+            entry = {
+                "sync_id": len(history) + 1,
+                "status": "in_progress",
+                "days_synced": days,
+                "logs_synced": 0,
+                "triggered_at": datetime.now().isoformat(),
+                "completed_at": None,
+                "error_message": None,
+            }
+            history.insert(0, entry)
+        threading.Thread(
+            target=self._simulate_sync,
+            args=(device_id, entry, days * len(self.users)),
+            daemon=True
+        ).start()
+        return 200, {"success": True, "message": f"Sync triggered for {days} days",
+                     "device_id": device_id, "sync_id": entry["sync_id"], "days": days}
+
+    def _publish_progress(self, device_id: str, entry: Dict[str, Any], total: int, started: float) -> None:
+        elapsed = max(time.perf_counter() - started, 1e-6)
+        with self._progress_changed:
+            previous = self._sync_progress.get(device_id, {}).get("version", 0)
+            self._sync_progress[device_id] = {
+                "sync_id": entry["sync_id"],
+                "status": entry["status"],
+                "logs_uploaded": entry["logs_synced"],
+                "logs_total": total,
+                "throughput": entry["logs_synced"] / elapsed,
+                "completed": entry["status"] in ("completed", "failed"),
+                "error_message": entry["error_message"],
+                "version": previous + 1,
+            }
+            self._progress_changed.notify_all()
+
+    def _simulate_sync(self, device_id: str, entry: Dict[str, Any], total: int) -> None:
+        """Pretend the ESP32 uploads `total` logs at sync_logs_per_second"""
+        started = time.perf_counter()
+        tick = 0.25
+        self._publish_progress(device_id, entry, total, started)
+        while entry["logs_synced"] < total:
+            time.sleep(tick)
+            step = max(1, int(self.sync_logs_per_second * tick))
+            entry["logs_synced"] = min(total, entry["logs_synced"] + step)
+            if entry["logs_synced"] >= total:
+                entry["status"] = "completed"
+                entry["completed_at"] = datetime.now().isoformat()
+            self._publish_progress(device_id, entry, total, started)
+        if entry["status"] != "completed":
+            entry["status"] = "completed"
+            entry["completed_at"] = datetime.now().isoformat()
+            self._publish_progress(device_id, entry, total, started)
+
+    def get_sync_history(self, query, body, device_id):
+        limit = int(query.get("limit", ["10"])[0])
+        return 200, {"device_id": device_id, "history": self.sync_history.get(device_id, [])[:limit]}
+
+    def get_sync_progress(self, query, body, device_id):
+        since = int(query.get("since", ["0"])[0])
+        wait = min(float(query.get("wait", ["0"])[0]), 30.0)
+        with self._progress_changed:
+            self._progress_changed.wait_for(
+                lambda: self._sync_progress.get(device_id, {}).get("version", 0) > since,
+                timeout=wait
+            )
+            progress = self._sync_progress.get(device_id)
+        if progress is None:
+            return 200, {"sync_id": None, "status": "idle", "logs_uploaded": 0, "logs_total": 0,
+                         "throughput": 0.0, "completed": True, "error_message": None, "version": 0}
+        return 200, dict(progress)
+
+    def dashboard_stats(self, query, body):
+        records = self.attendance_for(datetime.now().strftime("%d/%m"))
+        return 200, {
+            "total_users": len(self.users),
+            "today_records": len(records),
+            "checked_in": sum(1 for r in records if r["checked_in_time"] and not r["checked_out_time"]),
+            "checked_out": sum(1 for r in records if r["checked_out_time"]),
+        }
+
+    # ==================== DISPATCH ====================
+
+    def _injected_delay(self, path: str) -> float:
+        delay = self.latency_ms + (self._rng.uniform(0, self.jitter_ms) if self.jitter_ms else 0.0)
+        for prefix, extra in self.route_latency_ms.items():
+            if path.startswith(prefix):
+                delay += extra
+        return delay / 1000.0
+
+    def dispatch(self, method: str, path: str, query: Dict[str, List[str]], body: Dict[str, Any]) -> Tuple[int, Any]:
+        """Route a request to its handler; returns (status, payload)"""
+        for route_method, pattern, handler in self._compiled:
+            if route_method != method:
+                continue
+            match = pattern.match(path)
+            if match:
+                return handler(query, body, **match.groupdict())
+        return 404, {"detail": "Not Found"}
+
+    # ==================== SERVER LIFECYCLE ====================
+
+    @property
+    def url(self) -> str:
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        """Start serving in a daemon thread; returns the base URL"""
+        self.server = ThreadingHTTPServer((host, port), StandInHandler)
+        self.server.daemon_threads = True
+        self.server.backend = self
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        return self.url
+
+    def stop(self) -> None:
+        if self.server:
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
+
+
+# ==================== HTTP SERVER ====================
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """Request handler; state lives on server.backend"""
+
+    protocol_version = "HTTP/1.1"
+    # Keep-alive responses are written in several small sends; with Nagle on,
+    # the client's delayed ACK adds ~40 ms to every request after the first
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        """Silence per-request logging"""
+        pass
+
+    def _send(self, status: int, payload: Any) -> None:
+        body, headers = encode_body(
+            payload,
+            self.headers.get("Accept", ""),
+            self.headers.get("Accept-Encoding", "")
+        )
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _handle(self) -> None:
+        backend: StandInBackend = self.server.backend
+        parsed = urlparse(self.path)
+        path = parsed.path.rstrip("/") or "/"
+
+        length = int(self.headers.get("Content-Length") or 0)
+        raw = self.rfile.read(length) if length else b""
+        try:
+            body = json.loads(raw) if raw else {}
+        except ValueError:
+            self._send(422, {"detail": "Invalid JSON body"})
+            return
+
+        delay = backend._injected_delay(path)
+        if delay:
+            time.sleep(delay)
+
+        roll = backend._rng.random()
+        if roll < backend.drop_rate:
+            self.close_connection = True
+            self.connection.shutdown(socket.SHUT_RDWR)
+            return
+        if roll < backend.drop_rate + backend.failure_rate:
+            self._send(backend.failure_status, {"detail": "Injected failure"})
+            return
+
+        # Replayed writes carry their original key; answer them without re-applying
+        key = self.headers.get("Idempotency-Key")
+        if key and key in backend._idempotent_responses:
+            self._send(*backend._idempotent_responses[key])
+            return
+
+        try:
+            status, payload = backend.dispatch(self.command, path, parse_qs(parsed.query), body)
+        except Exception as e:
+            status, payload = 500, {"detail": str(e)}
+        if key and status < 500:
+            backend._idempotent_responses[key] = (status, payload)
+        self._send(status, payload)
+
+    do_GET = do_POST = do_PUT = do_DELETE = _handle
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Run the stand-in attendance backend")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--failure-rate", type=float, default=0.0)
+    parser.add_argument("--drop-rate", type=float, default=0.0)
+    args = parser.parse_args()
+
+    backend = StandInBackend(
+        user_count=args.users,
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        failure_rate=args.failure_rate,
+        drop_rate=args.drop_rate
+    )
+    print(f"Stand-in backend listening on {backend.start(args.host, args.port)} "
+          f"(login: {backend.credentials[0]} / {backend.credentials[1]})")
+    try:
+        backend.thread.join()
+    except KeyboardInterrupt:
+        backend.stop()
@@ -0,0 +1,190 @@
+"""
+Cold-start benchmark for the Streamlit entry point
+
+Every case runs in a fresh interpreter so nothing is already imported:
+- import/<module>: time to import one dependency on its own
+- login/first_run: app.py's first script run up to an interactive login
+  page (AppTest, against the local stand-in backend)
+- login/rerun: the next rerun in the same session
+- login/process: the whole cold process, including importing streamlit
+
+The login cases also record which heavy modules the login page loaded,
+so a change that pulls pandas/ReportLab/SQLAlchemy back into the startup
+path shows up even if the machine is fast. Each case is repeated and the
+median kept; runs are compared against a saved baseline.
+
+Usage:
+    python -m benchmarks.startup_benchmark
+    python -m benchmarks.startup_benchmark --repeat 5 --save-baseline
+    python -m benchmarks.startup_benchmark --fail-on-regression --threshold 0.25
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from typing import Dict, List, Optional
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), "baselines", "startup_benchmark.json")
+
+IMPORT_MODULES = [
+    "streamlit",
+    "streamlit_option_menu",
+    "requests",
+    "pandas",
+    "reportlab.platypus",
+    "sqlalchemy.orm",
+    "utils.api_client",
+    "utils.pdf_manager",
+    "utils.db_manager",
+    "utils.table_exporter",
+]
+HEAVY_MODULES = ["pandas", "reportlab", "sqlalchemy", "pyarrow", "openpyxl", "streamlit_option_menu"]
+
+
+def _run_child(args: List[str]) -> dict:
+    """Run this module in a fresh interpreter and return the JSON it prints last"""
+    out = subprocess.run(
+        [sys.executable, "-m", "benchmarks.startup_benchmark"] + args,
+        cwd=ROOT, capture_output=True, text=True, timeout=300
+    )
+    lines = [line for line in out.stdout.splitlines() if line.startswith("{")]
+    if out.returncode != 0 or not lines:
+        raise RuntimeError(f"startup child {args} failed:\n{out.stdout}\n{out.stderr}")
+    return json.loads(lines[-1])
+
+
+def _child_import(module: str) -> None:
+    start = time.perf_counter()
+    __import__(module)
+    print(json.dumps({"seconds": time.perf_counter() - start}))
+
+
+def _child_login(process_start: float) -> None:
+    from benchmarks.standin_backend import StandInBackend
+    from streamlit.testing.v1 import AppTest
+
+    backend = StandInBackend(user_count=50)
+    url = backend.start()
+    with tempfile.TemporaryDirectory() as tmp:
+        at = AppTest.from_file(os.path.join(ROOT, "app.py"), default_timeout=120)
+        at.secrets["API_BASE_URL"] = url
+        at.secrets["DATABASE_URL"] = "postgresql://unused"
+        at.secrets["WRITE_QUEUE_PATH"] = os.path.join(tmp, "write_queue.db")
+        at.secrets["REPORT_CACHE_DIR"] = os.path.join(tmp, "report_cache")
+
+        start = time.perf_counter()
+        at.run()
+        first_run = time.perf_counter() - start
+        interactive = time.perf_counter() - process_start
+
+        if at.exception or not any(w.key == "login_username" for w in at.text_input):
+            raise RuntimeError(f"login page did not render: {[e.value for e in at.exception]}")
+        loaded = [m for m in HEAVY_MODULES if m in sys.modules]
+
+        start = time.perf_counter()
+        at.run()
+        rerun = time.perf_counter() - start
+    backend.stop()
+
+    print(json.dumps({"first_run": first_run, "rerun": rerun, "process": interactive, "loaded": loaded}))
+
+
+def run(repeat: int = 3) -> dict:
+    results: Dict[str, dict] = {}
+
+    for module in IMPORT_MODULES:
+        samples = [_run_child(["--child-import", module])["seconds"] for _ in range(repeat)]
+        results[f"import/{module}"] = {"seconds": statistics.median(samples)}
+        print(f"  import {module:<24}{results[f'import/{module}']['seconds']:>8.3f}s", flush=True)
+
+    logins = [_run_child(["--child-login"]) for _ in range(repeat)]
+    for phase in ("first_run", "rerun", "process"):
+        results[f"login/{phase}"] = {"seconds": statistics.median(login[phase] for login in logins)}
+        print(f"  login {phase:<25}{results[f'login/{phase}']['seconds']:>8.3f}s", flush=True)
+    loaded = logins[-1]["loaded"]
+    print(f"  heavy modules loaded by the login page: {', '.join(loaded) or 'none'}")
+
+    return {
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "repeat": repeat,
+        "login_loaded_modules": loaded,
+        "results": results,
+    }
+
+
+def compare(current: dict, baseline: Optional[dict], threshold: float) -> List[str]:
+    """Print current vs baseline per case; returns the cases that slowed down past threshold"""
+    base_results = (baseline or {}).get("results", {})
+    regressions = []
+
+    print(f"\n{'case':<34}{'seconds':>10}{'base':>10}{'Δ':>7}")
+    for case, r in current["results"].items():
+        value, base = r["seconds"], base_results.get(case, {}).get("seconds")
+        delta = (value - base) / base if base else None
+        base_str = f"{base:.3f}" if base is not None else "-"
+        delta_str = f"{delta:+.0%}" if delta is not None else "-"
+        print(f"{case:<34}{value:>10.3f}{base_str:>10}{delta_str:>7}")
+        # Only the app's own startup path counts; third-party import times are context
+        if case.startswith("login/") and delta is not None and delta > threshold:
+            regressions.append(f"{case} {delta:+.0%}")
+
+    if baseline:
+        new_modules = set(current["login_loaded_modules"]) - set(baseline.get("login_loaded_modules", []))
+        if new_modules:
+            regressions.append(f"login page now loads {', '.join(sorted(new_modules))}")
+        print(f"\nBaseline: {baseline.get('created')} (Python {baseline.get('python')}, {baseline.get('platform')})")
+    else:
+        print("\nNo baseline found - run with --save-baseline to record one")
+    return regressions
+
+
+if __name__ == "__main__":
+    process_start = time.perf_counter()
+    sys.path.insert(0, ROOT)
+
+    parser = argparse.ArgumentParser(description="Streamlit cold-start benchmark")
+    parser.add_argument("--repeat", type=int, default=3, help="Fresh processes per case (median is kept)")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="Baseline JSON to compare against / save to")
+    parser.add_argument("--save-baseline", action="store_true", help="Write this run as the new baseline")
+    parser.add_argument("--threshold", type=float, default=0.20, help="Relative slowdown counted as a regression")
+    parser.add_argument("--fail-on-regression", action="store_true", help="Exit 1 if any case regressed")
+    parser.add_argument("--child-import", help=argparse.SUPPRESS)
+    parser.add_argument("--child-login", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child_import:
+        _child_import(args.child_import)
+        raise SystemExit(0)
+    if args.child_login:
+        _child_login(process_start)
+        raise SystemExit(0)
+
+    print(f"Cold start, median of {args.repeat} fresh processes per case\n")
+    current = run(args.repeat)
+
+    baseline = None
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+    regressions = compare(current, baseline, args.threshold)
+
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(os.path.abspath(args.baseline)), exist_ok=True)
+        with open(args.baseline, "w") as f:
+            json.dump(current, f, indent=2)
+        print(f"Saved baseline to {args.baseline}")
+
+    if regressions:
+        print("\nRegressions:\n  " + "\n  ".join(regressions))
+        if args.fail_on_regression:
+            raise SystemExit(1)
@@ -0,0 +1,71 @@
+"""
+Synthetic attendance frames shaped like DatabaseManager output
+"""
+
+from datetime import date, timedelta
+from decimal import Decimal
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.standin_backend import FIRST_NAMES, LAST_NAMES
+
+
+def make_attendance_frame(
+    rows: int,
+    users: int = 100,
+    start: date = date(2025, 6, 1),
+    seed: int = 0,
+    dirty: bool = False
+) -> pd.DataFrame:
+    """
+    Attendance records spread over `users` employees, one row per user per day
+
+    Args:
+        rows: Number of records
+        users: Distinct employees (capped at rows)
+        start: First calendar day
+        seed: RNG seed
+        dirty: Mix in None / 'N/A' / malformed times and missing or Decimal salaries
+    """
+    rng = np.random.default_rng(seed)
+    users = max(1, min(users, rows))
+
+    user_ids = np.arange(rows) % users + 1
+    day_offsets = np.arange(rows) // users
+    days = [(start + timedelta(days=int(d) % 366)).strftime("%d/%m") for d in range(day_offsets.max() + 1)]
+
+    in_minutes = rng.integers(8 * 60, 10 * 60 + 30, rows)
+    out_minutes = in_minutes + rng.integers(6 * 60, 10 * 60, rows)
+    check_in = np.array([f"{m // 60:02d}:{m % 60:02d}" for m in range(1440)], dtype=object)[in_minutes % 1440]
+    check_out = np.array([f"{m // 60:02d}:{m % 60:02d}" for m in range(1440)], dtype=object)[out_minutes % 1440]
+    check_out[rng.random(rows) < 0.1] = None
+
+    names = np.array([
+        f"{FIRST_NAMES[i % len(FIRST_NAMES)]} {LAST_NAMES[(i // len(FIRST_NAMES)) % len(LAST_NAMES)]} {i}"
+        for i in range(users)
+    ], dtype=object)
+    salaries = rng.choice([1500.0, 2000.0, 2500.0, 3000.0, 4000.0], users)
+    salary = salaries[user_ids - 1].astype(object)
+
+    if dirty:
+        noise = rng.random(rows)
+        check_in[noise < 0.02] = None
+        check_in[(noise >= 0.02) & (noise < 0.04)] = 'N/A'
+        check_out[(noise >= 0.04) & (noise < 0.05)] = '25:00'
+        check_out[(noise >= 0.05) & (noise < 0.06)] = '17:30:00'
+        salary[noise > 0.97] = None
+        decimal_rows = (noise > 0.90) & (noise <= 0.97)
+        salary[decimal_rows] = [Decimal(str(v)) for v in salary[decimal_rows]]
+
+    return pd.DataFrame({
+        'id': np.arange(1, rows + 1),
+        'name': names[user_ids - 1],
+        'user_id': user_ids,
+        'slot_id': [[int(u)] for u in user_ids],
+        'date': np.array(days, dtype=object)[day_offsets],
+        'checked_in_time': check_in,
+        'checked_out_time': check_out,
+        'is_present': np.asarray(check_in != None) & np.asarray(check_in != 'N/A'),
+        'salary': salary,
+    })
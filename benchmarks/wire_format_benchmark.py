@@ -0,0 +1,106 @@
+"""
+Wire format benchmark - payload size and decode time per encoding
+
+Runs APIClient against the local stand-in backend with every
+combination of JSON/msgpack and identity/gzip, for the user list and
+attendance-by-date payloads.
+
+Round trips are over loopback, where bandwidth is free: they show the
+encode/compress/decode CPU cost of each variant, not the transfer time
+gzip saves on a real network - read the wire bytes column for that.
+
+Usage:
+    python -m benchmarks.wire_format_benchmark --users 2000 --repeat 20
+"""
+
+import argparse
+import gzip
+import json
+import statistics
+import time
+
+import requests
+
+from benchmarks.standin_backend import StandInBackend, msgpack
+from utils.api_client import APIClient
+
+
+def _wire_size(client: APIClient, path: str) -> int:
+    """Bytes on the wire for one response (before transparent decompression)"""
+    response = requests.get(f"{client.base_url}{path}", headers=client._get_headers(), stream=True)
+    raw = response.raw.read(decode_content=False)
+    response.close()
+    return len(raw)
+
+
+def _time_call(fn, repeat: int) -> float:
+    """Median wall time in milliseconds, on an already open connection"""
+    fn()
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        ok, _ = fn()
+        samples.append((time.perf_counter() - start) * 1000)
+        if not ok:
+            raise RuntimeError("stand-in request failed")
+    return statistics.median(samples)
+
+
+def _time_decode(payload, wire_format: str, compress: bool, repeat: int) -> float:
+    """Median decode time in milliseconds, isolated from the network"""
+    if wire_format == "msgpack":
+        body = msgpack.packb(payload, use_bin_type=True)
+        loads = lambda b: msgpack.unpackb(b, raw=False)
+    else:
+        body = json.dumps(payload).encode("utf-8")
+        loads = json.loads
+    if compress:
+        body = gzip.compress(body, compresslevel=6)
+
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        loads(gzip.decompress(body) if compress else body)
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def run(users: int, repeat: int) -> None:
+    backend = StandInBackend(user_count=users)
+    base_url = backend.start()
+    date_str = "15/06"
+
+    formats = ["json", "msgpack"] if msgpack is not None else ["json"]
+    if msgpack is None:
+        print("msgpack not installed - only JSON variants will run\n")
+
+    routes = [
+        ("users", "/esp32/user/esp32/users", lambda c: c.get_all_users(), backend.users),
+        ("attendance", f"/esp32/atendance/esp32/attendance/date/{date_str}",
+         lambda c: c.get_attendance_by_date(date_str), backend.attendance_for(date_str)),
+    ]
+
+    print(f"{'payload':<12}{'format':<10}{'gzip':<6}{'wire bytes':>12}{'ratio':>8}"
+          f"{'decode ms':>11}{'round trip ms':>15}")
+    try:
+        for label, path, call, payload in routes:
+            baseline = None
+            for wire_format in formats:
+                for compress in (False, True):
+                    client = APIClient(base_url, wire_format=wire_format, compress=compress)
+                    size = _wire_size(client, path)
+                    baseline = baseline or size
+                    decode_ms = _time_decode(payload, wire_format, compress, repeat)
+                    trip_ms = _time_call(lambda: call(client), repeat)
+                    print(f"{label:<12}{wire_format:<10}{'yes' if compress else 'no':<6}"
+                          f"{size:>12,}{size / baseline:>8.2f}{decode_ms:>11.2f}{trip_ms:>15.2f}")
+    finally:
+        backend.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--users", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+    run(args.users, args.repeat)
@@ -0,0 +1,35 @@
+"""
+Payroll pack worker start-up
+Under `streamlit run`, __main__ is app.py; pool workers must not re-run it
+"""
+
+import io
+import sys
+import types
+import zipfile
+
+from benchmarks.synthetic import make_attendance_frame
+from utils.payroll_pack import build_payroll_pack
+
+
+def test_pack_workers_do_not_run_main(tmp_path, monkeypatch):
+    marker = tmp_path / "app_ran"
+    app_py = tmp_path / "app.py"
+    app_py.write_text(
+        f"open({str(marker)!r}, 'a').write('ran')\n"
+        "raise SystemExit('app.py must not run in a payroll worker')\n"
+    )
+    streamlit_main = types.ModuleType("__main__")
+    streamlit_main.__file__ = str(app_py)
+    streamlit_main.__spec__ = None
+    monkeypatch.setitem(sys.modules, "__main__", streamlit_main)
+
+    attendance = make_attendance_frame(300, users=6, seed=1)
+    pack = build_payroll_pack(attendance, '01/06', '30/06', max_workers=2)
+
+    assert pack is not None
+    assert not marker.exists()
+    with zipfile.ZipFile(io.BytesIO(pack)) as archive:
+        names = archive.namelist()
+    assert len(names) == attendance['user_id'].nunique()
+    assert "FAILED.txt" not in names
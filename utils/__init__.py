@@ -2,20 +2,44 @@
 """
 Utils package for Fingerprint Attendance System
 Provides database, API, and PDF management modules
+
+Names are imported from their submodules on first access, so importing
+one light module (e.g. utils.api_client) does not pull in pandas,
+ReportLab and SQLAlchemy.
 """
 
-from .db_manager import DatabaseManager, UserInformationDB, AttendanceRecordDB, DeviceStatusDB,AdminInformationDB
-from .api_client import APIClient
-from .pdf_manager import PDFManager
-
-__all__ = [
-    'DatabaseManager',
-    'UserInformationDB',
-    'AttendanceRecordDB',
-    'DeviceStatusDB',
-    'AdminInformationDB',
-    'APIClient',
-    'PDFManager'
-]
-
-__version__ = '2.0.0'
\ No newline at end of file
+import importlib
+
+_EXPORTS = {
+    'DatabaseManager': 'db_manager',
+    'UserInformationDB': 'db_manager',
+    'AttendanceRecordDB': 'db_manager',
+    'DeviceStatusDB': 'db_manager',
+    'AdminInformationDB': 'db_manager',
+    'APIClient': 'api_client',
+    'PDFManager': 'pdf_manager',
+    'MetricsRegistry': 'metrics',
+    'WriteQueue': 'write_queue',
+    'build_payroll_pack': 'payroll_pack',
+    'RenderCache': 'render_cache',
+    'TableExporter': 'table_exporter',
+    'ReportJobQueue': 'report_jobs',
+    'LazyService': 'lazy'
+}
+
+__all__ = list(_EXPORTS)
+
+__version__ = '2.0.0'
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    globals()[name] = value  # Later lookups skip __getattr__
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
@@ -3,31 +3,273 @@ API Client for FastAPI Backend
 Aligned with actual backend endpoints from main.py
 """
 
+import copy
+import http.cookiejar
+import time
+import uuid
 import requests
-from typing import Optional, Dict, Any, Tuple, List
+from requests.adapters import HTTPAdapter
+from typing import Optional, Dict, Any, Tuple, List, Union
+
+from . import tracing
+from .metrics import MetricsRegistry, registry as default_registry
+from .write_queue import WriteQueue
+
+try:
+    import msgpack
+except ImportError:  # Optional - falls back to JSON responses
+    msgpack = None
+
+
+JSON_MIME = "application/json"
+MSGPACK_MIME = "application/x-msgpack"
+
+# Responses that mean "backend unavailable" rather than "request rejected"
+UNAVAILABLE_STATUSES = (502, 503)
+# Gateway timeout: the proxy gave up waiting, the backend may still have applied it
+GATEWAY_TIMEOUT = 504
+
+
+class WriteOutcome:
+    """
+    Result of a write that was neither confirmed nor rejected
+    Falsy, so callers that only test success treat it as "not saved yet";
+    compare with `is` to tell the cases apart
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __bool__(self) -> bool:
+        return False
+
+    def __repr__(self) -> str:
+        return self.name
+
+
+# Saved in the offline queue - sent once the backend is reachable again
+QUEUED = WriteOutcome("QUEUED")
+# Sent, but no answer in time - the backend may or may not have applied it
+OUTCOME_UNKNOWN = WriteOutcome("OUTCOME_UNKNOWN")
+
+# (success, message) from a mutation - success is True, False, QUEUED or OUTCOME_UNKNOWN
+WriteResult = Tuple[Union[bool, WriteOutcome], str]
+
+
+class _NoCookies(http.cookiejar.CookiePolicy):
+    """The pooled session is shared by every admin, so it must never keep cookies"""
+    return_ok = set_ok = domain_return_ok = path_return_ok = lambda self, *args, **kwargs: False
+    netscape = True
+    rfc2965 = hide_cookie2 = False
 
 
 class APIClient:
-    """Client for communicating with FastAPI backend"""
+    """
+    Client for communicating with FastAPI backend
     
-    def __init__(self, base_url: str):
+    Connections are kept alive in a pool that is safe to share between
+    threads. One client per process owns the pool; for_session() hands out
+    cheap per-user handles that reuse it but carry their own token, so one
+    admin logging in or out never affects another.
+    """
+    
+    def __init__(
+        self,
+        base_url: str,
+        wire_format: str = "auto",
+        compress: bool = True,
+        metrics: Optional[MetricsRegistry] = None,
+        write_queue: Optional[WriteQueue] = None,
+        pool_size: int = 10
+    ):
         """
         Initialize API client
         
         Args:
             base_url: Base URL of the FastAPI backend (from secrets)
+            wire_format: "auto" (msgpack when installed, else JSON), "msgpack" or "json"
+            compress: Ask the backend for gzip-compressed responses
+            metrics: Registry for per-endpoint stats (defaults to the process-wide one)
+            write_queue: Durable queue for mutations made while the backend is unreachable
+            pool_size: Keep-alive connections kept open to the backend
         """
         self.base_url = base_url.rstrip('/')
         self.token = None
         self.timeout = 30
+        self.max_retries = 1  # Extra attempts for GETs on connection errors
+        self.metrics = metrics if metrics is not None else default_registry
+        self.write_queue = write_queue
+        self.flush_batch_size = 25
+        self.compress = compress
+        if wire_format == "auto":
+            wire_format = "msgpack" if msgpack is not None else "json"
+        self.wire_format = wire_format
+        if self.wire_format == "msgpack" and msgpack is None:
+            raise ValueError("wire_format='msgpack' requires the msgpack package")
+        
+        # Shared transport: retries stay in _request, where they are recorded
+        self.http = requests.Session()
+        self.http.cookies.set_policy(_NoCookies())
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=0)
+        self.http.mount("http://", adapter)
+        self.http.mount("https://", adapter)
+    
+    def for_session(self, token: Optional[str] = None) -> "APIClient":
+        """
+        Per-session handle on this client
+        
+        Shares the connection pool, metrics and write queue; only the token
+        is its own. Cheap enough to create one per browser session.
+        
+        Args:
+            token: Token from an earlier login, if any
+        
+        Returns:
+            A new APIClient handle
+        """
+        handle = copy.copy(self)
+        handle.token = token
+        return handle
     
-    def _get_headers(self) -> Dict[str, str]:
-        """Get request headers"""
-        headers = {"Content-Type": "application/json"}
+    def _get_headers(self, idempotency_key: Optional[str] = None) -> Dict[str, str]:
+        """Get request headers, including content negotiation"""
+        headers = {"Content-Type": JSON_MIME}
+        if idempotency_key:
+            headers["Idempotency-Key"] = idempotency_key
+        if self.wire_format == "msgpack":
+            # JSON stays acceptable so older backends keep working unchanged
+            headers["Accept"] = f"{MSGPACK_MIME}, {JSON_MIME};q=0.9"
+        else:
+            headers["Accept"] = JSON_MIME
+        headers["Accept-Encoding"] = "gzip, deflate" if self.compress else "identity"
         if self.token:
             headers["Authorization"] = f"Bearer {self.token}"
         return headers
     
+    def _decode(self, response: requests.Response) -> Any:
+        """
+        Decode a response body according to its Content-Type.
+        gzip/deflate transfer encoding is already undone by requests.
+        """
+        content_type = response.headers.get("Content-Type", "").split(";")[0].strip().lower()
+        if content_type == MSGPACK_MIME and msgpack is not None:
+            return msgpack.unpackb(response.content, raw=False)
+        return response.json()
+    
+    def _request(
+        self,
+        method: str,
+        route: str,
+        path_params: Optional[Dict[str, Any]] = None,
+        retries: int = 0,
+        **kwargs
+    ) -> requests.Response:
+        """
+        Send a request and record latency, status, timeouts and retries
+        
+        Args:
+            method: HTTP method
+            route: Route template, also used as the metrics key
+            path_params: Values substituted into the route template
+            retries: Extra attempts on connection errors (idempotent requests only)
+            **kwargs: Passed through to requests.Session.request
+        
+        Returns:
+            The response; request exceptions are re-raised after being recorded
+        """
+        endpoint = f"{method} {route}"
+        url = self.base_url + (route.format(**path_params) if path_params else route)
+        kwargs.setdefault("headers", self._get_headers())
+        kwargs.setdefault("timeout", self.timeout)
+        
+        for attempt in range(retries + 1):
+            start = time.perf_counter()
+            try:
+                response = self.http.request(method, url, **kwargs)
+            except requests.exceptions.RequestException as e:
+                end = time.perf_counter()
+                elapsed_ms = (end - start) * 1000
+                tracing.record(endpoint, tracing.API, start, end, detail=type(e).__name__)
+                if isinstance(e, requests.exceptions.Timeout):
+                    self.metrics.record_timeout(endpoint, elapsed_ms)
+                elif isinstance(e, requests.exceptions.ConnectionError):
+                    self.metrics.record_error(endpoint, "connection")
+                else:
+                    self.metrics.record_error(endpoint, type(e).__name__)
+                
+                # Read timeouts are not retried - the server may still be working
+                retryable = isinstance(e, requests.exceptions.ConnectionError)
+                if retryable and attempt < retries:
+                    self.metrics.record_retry(endpoint)
+                    continue
+                raise
+            
+            end = time.perf_counter()
+            self.metrics.observe(endpoint, (end - start) * 1000, response.status_code)
+            # Wire size: Content-Length is the compressed size when gzip was used
+            size = response.headers.get("Content-Length")
+            tracing.record(
+                endpoint, tracing.API, start, end,
+                size=int(size) if size and size.isdigit() else len(response.content),
+                detail=str(response.status_code)
+            )
+            return response
+    
+    def _submit_write(self, method: str, route: str, data: Dict[str, Any]) -> Tuple[Any, str]:
+        """
+        Send a mutation, or park it in the write queue if the backend is unreachable
+        
+        Only writes that never got through (connection errors, 502/503) are
+        queued. A request that timed out waiting for the answer (including a
+        504 from the proxy) may already have been applied, and replaying it is
+        only safe on a backend that deduplicates on Idempotency-Key - which
+        nothing guarantees - so it is reported as OUTCOME_UNKNOWN instead.
+        
+        If older writes are still queued, one batch of them is replayed first
+        and this write is sent directly once the queue has drained; otherwise
+        it is queued behind them, so the backend always sees mutations in the
+        order they were made.
+        
+        Returns:
+            (response, "") or (QUEUED / OUTCOME_UNKNOWN, message).
+            Without a write queue, connection errors propagate as before.
+        """
+        key = str(uuid.uuid4())
+        
+        if self.write_queue is not None and self.write_queue.pending_count():
+            flushed = self.flush_write_queue()
+            if flushed["remaining"]:
+                self.write_queue.enqueue(method, route, data, key)
+                if flushed["error"]:
+                    return QUEUED, self._queued_message("Backend unavailable")
+                return QUEUED, f"Queued behind {flushed['remaining']} pending change(s) - it will be sent right after them"
+        
+        try:
+            response = self._request(method, route, json=data, headers=self._get_headers(key))
+        except requests.exceptions.ConnectionError:
+            # Includes ConnectTimeout: the request was never sent
+            if self.write_queue is None:
+                raise
+            self.write_queue.enqueue(method, route, data, key)
+            return QUEUED, self._queued_message("Backend unreachable")
+        except requests.exceptions.Timeout:
+            return OUTCOME_UNKNOWN, self._unknown_message()
+        
+        if response.status_code == GATEWAY_TIMEOUT:
+            return OUTCOME_UNKNOWN, self._unknown_message()
+        
+        if response.status_code in UNAVAILABLE_STATUSES and self.write_queue is not None:
+            self.write_queue.enqueue(method, route, data, key)
+            return QUEUED, self._queued_message(f"Backend unavailable (HTTP {response.status_code})")
+        
+        return response, ""
+    
+    def _queued_message(self, cause: str) -> str:
+        return f"{cause} - change saved offline and will be sent when it is back ({self.pending_writes()} pending)"
+    
+    def _unknown_message(self) -> str:
+        return "Backend did not answer in time - the change may already be saved. Check before submitting it again"
+    
     # ==================== AUTHENTICATION ====================
     
     def login(self, username: str, password: str) -> Tuple[bool, Optional[str]]:
@@ -42,14 +284,14 @@ class APIClient:
             Tuple of (success, token or error_message)
         """
         try:
-            response = requests.post(
-                f"{self.base_url}/esp32/user/admin/login",
+            response = self._request(
+                "POST", "/esp32/user/admin/login",
                 json={"username": username, "password": password},
                 timeout=self.timeout
             )
             
             if response.status_code == 200:
-                data = response.json()
+                data = self._decode(response)
                 if data.get('success'):
                     self.token = data.get('token', 'authenticated')
                     return True, self.token
@@ -74,8 +316,9 @@ class APIClient:
     def health_check(self) -> bool:
         """Check if backend is reachable"""
         try:
-            response = requests.get(
-                f"{self.base_url}/health",
+            response = self._request(
+                "GET", "/health",
+                retries=self.max_retries,
                 timeout=5
             )
             return response.status_code == 200
@@ -90,32 +333,91 @@ class APIClient:
         Endpoint: GET /esp32/users
         """
         try:
-            response = requests.get(
-                f"{self.base_url}/esp32/user/esp32/users",
+            response = self._request(
+                "GET", "/esp32/user/esp32/users",
+                retries=self.max_retries,
                 timeout=self.timeout
             )
             
             if response.status_code == 200:
-                return True, response.json()
+                return True, self._decode(response)
             else:
                 return False, f"Error: {response.status_code}"
                 
         except Exception as e:
             return False, str(e)
     
+    def get_users_page(self, offset: int = 0, limit: int = 50, search: Optional[str] = None) -> Tuple[bool, Any]:
+        """
+        Get one page of users, optionally filtered by name or user ID
+        Endpoint: GET /esp32/users?offset=&limit=&search=
+
+        Only the requested page crosses the wire. Backends that ignore the
+        paging parameters return every user; that list is filtered and sliced
+        here so callers always get the same shape.
+
+        Args:
+            offset: Users to skip
+            limit: Page size
+            search: Case-insensitive name substring, or an exact user ID
+
+        Returns:
+            Tuple of (success, {"users": [...], "total": matching users, "offset", "limit"})
+        """
+        params = {"offset": offset, "limit": limit}
+        if search:
+            params["search"] = search
+
+        try:
+            response = self._request(
+                "GET", "/esp32/user/esp32/users",
+                retries=self.max_retries,
+                params=params,
+                timeout=self.timeout
+            )
+
+            if response.status_code != 200:
+                return False, f"Error: {response.status_code}"
+            data = self._decode(response)
+
+            if isinstance(data, dict) and 'offset' in data:
+                return True, data
+
+            # Older backend: full list came back, wrapped or bare
+            users = data.get('users', []) if isinstance(data, dict) else data
+            if not isinstance(users, list):
+                return False, "Unexpected response from backend"
+            if search:
+                needle = search.strip().lower()
+                users = [
+                    u for u in users
+                    if needle in str(u.get('name', '')).lower() or needle == str(u.get('user_id'))
+                ]
+            return True, {
+                "users": users[offset:offset + limit],
+                "total": len(users),
+                "offset": offset,
+                "limit": limit
+            }
+
+        except Exception as e:
+            return False, str(e)
+
     def get_user_by_id(self, user_id: int) -> Tuple[bool, Any]:
         """
         Get specific user by user_id
         Endpoint: GET /esp32/user/{user_id}
         """
         try:
-            response = requests.get(
-                f"{self.base_url}/esp32/user/esp32/user/{user_id}",
+            response = self._request(
+                "GET", "/esp32/user/esp32/user/{user_id}",
+                path_params={"user_id": user_id},
+                retries=self.max_retries,
                 timeout=self.timeout
             )
             
             if response.status_code == 200:
-                return True, response.json()
+                return True, self._decode(response)
             else:
                 return False, None
                 
@@ -130,10 +432,14 @@ class APIClient:
         date: Optional[str] = None,
         time: Optional[str] = None,
         salary: Optional[float] = None
-    ) -> Tuple[bool, str]:
+    ) -> WriteResult:
         """
         Update user via API
         Endpoint: PUT /admin/user/update
+
+        Returns:
+            (success, message) - success is QUEUED or OUTCOME_UNKNOWN (both
+            falsy) when the write was neither confirmed nor rejected
         """
         try:
             data = {"user_id": user_id}
@@ -149,19 +455,17 @@ class APIClient:
             if salary is not None:
                 data["salary"] = salary
 
-            response = requests.put(
-                f"{self.base_url}/esp32/user/admin/user/update",
-                json=data,
-                timeout=self.timeout
-            )
+            response, message = self._submit_write("PUT", "/esp32/user/admin/user/update", data)
+            if isinstance(response, WriteOutcome):
+                return response, message
 
             if response.status_code == 200:
-                result = response.json()
+                result = self._decode(response)
                 if result.get("success"):
                     return True, result.get("message", "User updated successfully")
                 return False, result.get("message", "Update failed")
 
-            error = response.json().get("detail", "Update failed")
+            error = self._decode(response).get("detail", "Update failed")
             return False, error
 
         except Exception as e:
@@ -174,10 +478,14 @@ class APIClient:
         slot_ids: List[int],
         date: str,
         time: str
-    ) -> Tuple[bool, str]:
+    ) -> WriteResult:
         """
         Create new user
         Endpoint: POST /esp32/user
+
+        Returns:
+            (success, message) - success is QUEUED or OUTCOME_UNKNOWN (both
+            falsy) when the write was neither confirmed nor rejected
         """
         try:
             data = {
@@ -188,14 +496,12 @@ class APIClient:
                 "time": time
             }
 
-            response = requests.post(
-                f"{self.base_url}/esp32/user/esp32/user",
-                json=data,
-                timeout=self.timeout
-            )
+            response, message = self._submit_write("POST", "/esp32/user/esp32/user", data)
+            if isinstance(response, WriteOutcome):
+                return response, message
 
             if response.status_code == 200:
-                result = response.json()
+                result = self._decode(response)
                 if result.get("success"):
                     return True, result.get("message", "User created successfully")
                 return False, result.get("message", "Creation failed")
@@ -205,22 +511,25 @@ class APIClient:
         except Exception as e:
             return False, str(e)
 
-    def delete_user(self, user_id: int, slot_ids: List[int]) -> Tuple[bool, str]:
+    def delete_user(self, user_id: int, slot_ids: List[int]) -> WriteResult:
         """
         Delete user
         Endpoint: DELETE /esp32/user/delete
+
+        Returns:
+            (success, message) - success is QUEUED or OUTCOME_UNKNOWN (both
+            falsy) when the write was neither confirmed nor rejected
         """
         try:
             data = {"user_id": user_id, "slot_id": slot_ids}
 
-            response = requests.delete(
-                f"{self.base_url}/esp32/user/esp32/user/delete",
-                json=data,
-                timeout=self.timeout
-            )
+            # Through the write queue, so it never overtakes a queued create/update
+            response, message = self._submit_write("DELETE", "/esp32/user/esp32/user/delete", data)
+            if isinstance(response, WriteOutcome):
+                return response, message
 
             if response.status_code == 200:
-                result = response.json()
+                result = self._decode(response)
                 if result.get("success"):
                     return True, result.get("message", "User deleted successfully")
                 return False, result.get("message", "Deletion failed")
@@ -237,13 +546,15 @@ class APIClient:
         Get ESP32 device status from API
         """
         try:
-            response = requests.get(
-                f"{self.base_url}/esp32/esp32/status/{device_id}",
+            response = self._request(
+                "GET", "/esp32/esp32/status/{device_id}",
+                path_params={"device_id": device_id},
+                retries=self.max_retries,
                 timeout=10
             )
 
             if response.status_code == 200:
-                data = response.json()
+                data = self._decode(response)
                 return {
                     "connected": data.get("is_online", False),
                     "status": data.get("status", "Offline"),
@@ -272,11 +583,12 @@ class APIClient:
         Get status of all devices
         """
         try:
-            response = requests.get(
-                f"{self.base_url}/esp32/esp32/status",
+            response = self._request(
+                "GET", "/esp32/esp32/status",
+                retries=self.max_retries,
                 timeout=self.timeout
             )
-            return response.json() if response.status_code == 200 else None
+            return self._decode(response) if response.status_code == 200 else None
         except:
             return None
 
@@ -287,11 +599,13 @@ class APIClient:
         Get attendance for specific date
         """
         try:
-            response = requests.get(
-                f"{self.base_url}/esp32/atendance/esp32/attendance/date/{date_str}",
+            response = self._request(
+                "GET", "/esp32/atendance/esp32/attendance/date/{date_str}",
+                path_params={"date_str": date_str},
+                retries=self.max_retries,
                 timeout=self.timeout
             )
-            return (True, response.json()) if response.status_code == 200 else (False, None)
+            return (True, self._decode(response)) if response.status_code == 200 else (False, None)
         except:
             return False, None
 
@@ -300,14 +614,70 @@ class APIClient:
         Get attendance for specific user and date
         """
         try:
-            response = requests.get(
-                f"{self.base_url}/esp32/attendance/esp32/attendance/{user_id}/{date}",
+            response = self._request(
+                "GET", "/esp32/attendance/esp32/attendance/{user_id}/{date}",
+                path_params={"user_id": user_id, "date": date},
+                retries=self.max_retries,
                 timeout=self.timeout
             )
-            return (True, response.json()) if response.status_code == 200 else (False, None)
+            return (True, self._decode(response)) if response.status_code == 200 else (False, None)
         except:
             return False, None
 
+    def get_attendance_changes(
+        self,
+        date_str: str,
+        since: Optional[str] = None,
+        limit: int = 500
+    ) -> Tuple[bool, Any]:
+        """
+        Attendance records of one day created or changed after a cursor
+        Endpoint: GET /esp32/attendance/esp32/attendance/changes?date=&since=&limit=
+
+        Pass the cursor from the previous call to get only what changed
+        since then, so polling a live view costs one small response per
+        new punch instead of the whole day. Backends without the route are
+        served the whole day (full=True) and no cursor.
+
+        Args:
+            date_str: Day in DD/MM format
+            since: Cursor from the previous call (None for everything so far)
+            limit: Most records per call - has_more is set when there are more
+
+        Returns:
+            Tuple of (success, changes) where changes has records, cursor,
+            has_more and full (True when records are the whole day)
+        """
+        params = {"date": date_str, "limit": limit}
+        if since:
+            params["since"] = since
+        try:
+            response = self._request(
+                "GET", "/esp32/attendance/esp32/attendance/changes",
+                retries=self.max_retries,
+                params=params,
+                timeout=self.timeout
+            )
+
+            if response.status_code == 200:
+                data = self._decode(response)
+                return True, {
+                    "records": data.get('records', []),
+                    "cursor": data.get('cursor', since),
+                    "has_more": bool(data.get('has_more')),
+                    "full": False
+                }
+            if response.status_code != 404:
+                return False, None
+        except Exception as e:
+            return False, None
+
+        # Older backend: no cursor, so every call is the whole day
+        success, day = self.get_attendance_by_date(date_str)
+        if not success or day is None:
+            return False, None
+        return True, {"records": day.get('records', []), "cursor": None, "has_more": False, "full": True}
+
     def log_attendance(
         self,
         name: str,
@@ -315,9 +685,13 @@ class APIClient:
         slot_ids: List[int],
         date: str,
         time: str
-    ) -> Tuple[bool, str]:
+    ) -> WriteResult:
         """
         Log attendance record
+
+        Returns:
+            (success, message) - success is QUEUED or OUTCOME_UNKNOWN (both
+            falsy) when the write was neither confirmed nor rejected
         """
         try:
             data = {
@@ -328,14 +702,12 @@ class APIClient:
                 "time": time
             }
 
-            response = requests.post(
-                f"{self.base_url}/esp32/attendance/esp32/attendance",
-                json=data,
-                timeout=self.timeout
-            )
+            response, message = self._submit_write("POST", "/esp32/attendance/esp32/attendance", data)
+            if isinstance(response, WriteOutcome):
+                return response, message
 
             if response.status_code == 200:
-                result = response.json()
+                result = self._decode(response)
                 if result.get("success"):
                     return True, result.get("message", "Attendance logged")
                 return False, result.get("message", "Logging failed")
@@ -364,14 +736,14 @@ class APIClient:
                 "days": days
             }
             
-            response = requests.post(
-                f"{self.base_url}/esp32/attendance/esp32/trigger-attendance-sync",
+            response = self._request(
+                "POST", "/esp32/attendance/esp32/trigger-attendance-sync",
                 json=payload,
                 timeout=10
             )
             
             if response.status_code == 200:
-                return True, response.json()
+                return True, self._decode(response)
             else:
                 return False, {"message": f"HTTP {response.status_code}"}
                 
@@ -390,41 +762,185 @@ class APIClient:
             Tuple of (success, history_data)
         """
         try:
-            response = requests.get(
-                f"{self.base_url}/esp32/attendance/esp32/sync-history/{device_id}",
+            response = self._request(
+                "GET", "/esp32/attendance/esp32/sync-history/{device_id}",
+                path_params={"device_id": device_id},
+                retries=self.max_retries,
                 params={"limit": limit},
                 timeout=10
             )
             
             if response.status_code == 200:
-                return True, response.json()
+                return True, self._decode(response)
             else:
                 return False, None
-                
+
         except Exception as e:
             return False, None
 
+    def get_sync_progress(self, device_id: str, since: int = 0, wait: float = 0) -> Tuple[bool, Any]:
+        """
+        Long-poll the progress of the latest sync for a device
+        Endpoint: GET /esp32/attendance/esp32/sync-progress/{device_id}?since=&wait=
+
+        The backend holds the request for up to `wait` seconds until the
+        progress version moves past `since`, so polling costs one request
+        per change instead of one per tick. Backends without the route are
+        served from the newest sync-history entry instead.
+
+        Args:
+            device_id: ESP32 device ID
+            since: Last progress version seen (0 for the current state)
+            wait: Seconds the backend may hold the request
+
+        Returns:
+            Tuple of (success, progress) where progress has sync_id, status,
+            logs_uploaded, logs_total, throughput, completed and version
+        """
+        try:
+            response = self._request(
+                "GET", "/esp32/attendance/esp32/sync-progress/{device_id}",
+                path_params={"device_id": device_id},
+                retries=self.max_retries,
+                params={"since": since, "wait": wait},
+                timeout=wait + 10
+            )
+
+            if response.status_code == 200:
+                return True, self._decode(response)
+            if response.status_code != 404:
+                return False, None
+        except Exception as e:
+            return False, None
+
+        # Older backend: derive progress from the latest history entry
+        success, history = self.get_sync_history(device_id, limit=1)
+        if not success or not history or not history.get('history'):
+            return False, None
+
+        latest = history['history'][0]
+        status = latest.get('status', 'pending')
+        logs = latest.get('logs_synced') or 0
+        return True, {
+            "sync_id": latest.get('sync_id'),
+            "status": status,
+            "logs_uploaded": logs,
+            "logs_total": logs if status == 'completed' else None,
+            "throughput": None,
+            "completed": status in ('completed', 'failed'),
+            "error_message": latest.get('error_message'),
+            "version": since + 1
+        }
+
     # ==================== STATISTICS ====================
 
     def get_dashboard_stats(self) -> Optional[Dict]:
         """
         Get dashboard statistics
+        
+        Returns:
+            total_users, today_records, checked_in and checked_out, or None
+            if the backend could not provide them (not zeros, which would
+            look like a real empty day)
         """
         try:
-            response = requests.get(
-                f"{self.base_url}/esp32/user/admin/stats/dashboard",
+            response = self._request(
+                "GET", "/esp32/user/admin/stats/dashboard",
+                retries=self.max_retries,
                 timeout=self.timeout
             )
-            return response.json() if response.status_code == 200 else {
-                "total_users": 0,
-                "today_records": 0,
-                "checked_in": 0,
-                "checked_out": 0
-            }
+            return self._decode(response) if response.status_code == 200 else None
         except:
-            return {
-                "total_users": 0,
-                "today_records": 0,
-                "checked_in": 0,
-                "checked_out": 0
-            }
\ No newline at end of file
+            return None
+    
+    # ==================== OFFLINE WRITE QUEUE ====================
+
+    def pending_writes(self) -> int:
+        """Number of mutations waiting in the offline write queue"""
+        return self.write_queue.pending_count() if self.write_queue is not None else 0
+
+    def flush_write_queue(self, batch_size: Optional[int] = None, max_batches: int = 1) -> Dict[str, Any]:
+        """
+        Replay queued mutations oldest-first, a bounded batch at a time
+        
+        Stops at the first connection failure so ordering is preserved and a
+        flaky reconnect does not turn into a request storm. Entries the backend
+        rejects (4xx or success=false) are moved aside as dead letters, and so
+        are entries whose replay timed out or got a 504 - they may have been
+        applied, so they are not sent again. Only one flush runs at a time; a
+        call made while another session is flushing returns straight away.
+        
+        Args:
+            batch_size: Entries per batch (defaults to self.flush_batch_size)
+            max_batches: Upper bound on batches sent in this call
+        
+        Returns:
+            Dict with sent, rejected, unknown and remaining counts, and error:
+            why the flush stopped early (None if it was not cut short by the backend)
+        """
+        result = {"sent": 0, "rejected": 0, "unknown": 0, "remaining": 0, "error": None}
+        if self.write_queue is None:
+            return result
+        
+        if not self.write_queue.replay_lock.acquire(blocking=False):
+            result["remaining"] = self.write_queue.pending_count()
+            return result
+        try:
+            result["error"] = self._replay_batches(result, batch_size or self.flush_batch_size, max_batches)
+        finally:
+            self.write_queue.replay_lock.release()
+        
+        result["remaining"] = self.write_queue.pending_count()
+        return result
+    
+    def _replay_batches(self, result: Dict[str, Any], batch_size: int, max_batches: int) -> Optional[str]:
+        """Replay loop for flush_write_queue; returns the error that stopped it, if any"""
+        for _ in range(max_batches):
+            entries = self.write_queue.peek(batch_size)
+            if not entries:
+                break
+            
+            for entry in entries:
+                try:
+                    response = self._request(
+                        entry["method"], entry["route"],
+                        json=entry["payload"],
+                        headers=self._get_headers(entry["idempotency_key"])
+                    )
+                except requests.exceptions.Timeout as e:
+                    if isinstance(e, requests.exceptions.ConnectionError):
+                        # ConnectTimeout - never sent, safe to try again later
+                        self.write_queue.mark_attempt(entry["id"], str(e))
+                    else:
+                        self.write_queue.mark_dead(entry["id"], "No answer in time - may have been applied, not replayed")
+                        result["unknown"] += 1
+                    return str(e)
+                except requests.exceptions.RequestException as e:
+                    self.write_queue.mark_attempt(entry["id"], str(e))
+                    return str(e)
+                
+                if response.status_code == GATEWAY_TIMEOUT:
+                    self.write_queue.mark_dead(entry["id"], "HTTP 504 - may have been applied, not replayed")
+                    result["unknown"] += 1
+                    return f"HTTP {response.status_code}"
+                
+                if response.status_code in UNAVAILABLE_STATUSES:
+                    self.write_queue.mark_attempt(entry["id"], f"HTTP {response.status_code}")
+                    return f"HTTP {response.status_code}"
+                
+                try:
+                    body = self._decode(response)
+                except ValueError:
+                    body = {}
+                if not isinstance(body, dict):
+                    body = {}
+                
+                if response.status_code == 200 and body.get("success", True):
+                    self.write_queue.mark_done(entry["id"])
+                    result["sent"] += 1
+                else:
+                    error = body.get("detail") or body.get("message") or f"HTTP {response.status_code}"
+                    self.write_queue.mark_dead(entry["id"], str(error))
+                    result["rejected"] += 1
+        
+        return None
@@ -4,13 +4,16 @@ Database Manager for PostgreSQL
 Uses SQLAlchemy ORM - Models aligned with FastAPI backend
 """
 
-from sqlalchemy import create_engine, Column, Integer, String, DateTime, Boolean,Numeric
+from sqlalchemy import create_engine, Column, Integer, String, DateTime, Boolean,Numeric, or_, and_, select, func
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, Session
 from sqlalchemy.dialects.postgresql import ARRAY as PG_ARRAY
 from datetime import datetime
+import functools
 import pandas as pd
-from typing import Optional
+from typing import Optional, Tuple
+
+from . import tracing
 
 Base = declarative_base()
 
@@ -68,6 +71,25 @@ class AdminInformationDB(Base):
 
 # ==================== DATABASE MANAGER ====================
 
+# Change time of attendance rows that have neither updated_at nor created_at
+CHANGES_EPOCH = datetime(1970, 1, 1)
+
+def _traced_query(method):
+    """Record a DatabaseManager read as one span: call arguments and rows returned"""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        if tracing.current_trace() is None:
+            return method(self, *args, **kwargs)
+        call = ", ".join([repr(a) for a in args] + [f"{k}={v!r}" for k, v in kwargs.items()])
+        with tracing.span(f"{method.__name__}({call})", tracing.DB) as query_span:
+            result = method(self, *args, **kwargs)
+            if isinstance(result, pd.DataFrame):
+                query_span["detail"] = f"{len(result)} row(s)"
+            elif result is None:
+                query_span["detail"] = "none / failed"
+            return result
+    return wrapper
+
 class DatabaseManager:
     """Manages all database operations using SQLAlchemy ORM"""
     
@@ -101,6 +123,7 @@ class DatabaseManager:
     
     # ==================== USER OPERATIONS ====================
     
+    @_traced_query
     def get_all_users(self) -> Optional[pd.DataFrame]:
         """
         Fetch all users from UserInformationDB
@@ -132,12 +155,14 @@ class DatabaseManager:
                     'created_at': user.created_at
                 })
             
-            return pd.DataFrame(users_data)
+            with tracing.span("DataFrame(users)", tracing.FRAME, detail=f"{len(users_data)} row(s)"):
+                return pd.DataFrame(users_data)
             
         except Exception as e:
             print(f"Error fetching users: {e}")
             return None
     
+    @_traced_query
     def get_user_by_id(self, user_id: int) -> Optional[dict]:
         """Get user by user_id"""
         try:
@@ -180,8 +205,59 @@ class DatabaseManager:
             df['salary'] = df['user_id'].map(salaries)
             return df
 
+    # ==================== STATISTICS ====================
+    
+    @_traced_query
+    def get_dashboard_stats(self, date_str: str = None) -> Optional[dict]:
+        """
+        Dashboard counts in one aggregate query
+        
+        Fallback for the backend's stats route (GET /admin/stats/dashboard),
+        with the same fields and definitions - the ones benchmarks/standin_backend.py
+        implements for that route:
+            total_users: rows in user_information
+            today_records: attendance rows for the day
+            checked_in: rows with a check-in and no check-out yet (still in)
+            checked_out: rows with a check-out
+        The real backend is not in this repo; if its definitions change,
+        change these too, or the dashboard jumps when it falls back.
+        
+        Args:
+            date_str: Day in DD/MM format (defaults to today)
+        
+        Returns:
+            Dict of counts, or None on error
+        """
+        try:
+            date_str = date_str or datetime.now().strftime("%d/%m")
+            session = self.get_session()
+            
+            # Aggregates without GROUP BY always return one row, even for an empty day
+            total_users = select(func.count(UserInformationDB.id)).scalar_subquery()
+            row = session.execute(
+                select(
+                    total_users.label('total_users'),
+                    func.count(AttendanceRecordDB.id).label('today_records'),
+                    func.count(AttendanceRecordDB.id).filter(
+                        AttendanceRecordDB.checked_in_time.isnot(None),
+                        AttendanceRecordDB.checked_out_time.is_(None)
+                    ).label('checked_in'),
+                    func.count(AttendanceRecordDB.id).filter(
+                        AttendanceRecordDB.checked_out_time.isnot(None)
+                    ).label('checked_out')
+                ).where(AttendanceRecordDB.date == date_str)
+            ).one()
+            session.close()
+            
+            return dict(row._mapping)
+            
+        except Exception as e:
+            print(f"Error fetching dashboard stats: {e}")
+            return None
+    
     # ==================== ATTENDANCE OPERATIONS ====================
     
+    @_traced_query
     def get_attendance_by_date(self, date_str: str) -> Optional[pd.DataFrame]:
         """
         Get all attendance records for a specific date (DD/MM format)
@@ -212,7 +288,8 @@ class DatabaseManager:
                     'created_at': record.created_at
                 })
             
-            df = pd.DataFrame(data)
+            with tracing.span("DataFrame(attendance)", tracing.FRAME, detail=f"{len(data)} row(s)"):
+                df = pd.DataFrame(data)
             
             # ✅ Attach salary to records
             if not df.empty:
@@ -225,6 +302,81 @@ class DatabaseManager:
             print(f"Error fetching attendance by date: {e}")
             return None
     
+    @_traced_query
+    def get_attendance_changes(
+        self,
+        date_str: str,
+        since: Optional[str] = None,
+        limit: int = 500
+    ) -> Optional[Tuple[pd.DataFrame, Optional[str]]]:
+        """
+        Attendance records of one day created or changed after a cursor
+        
+        The cursor is the (change time, id) of the last record returned, so
+        repeated calls only read and convert rows that are new since the
+        previous one - a live view polls at the cost of new punches only.
+        updated_at is nullable and only filled in by ORM defaults, so the
+        change time falls back to created_at, then to CHANGES_EPOCH; rows
+        with neither timestamp are only picked up by a call without a cursor.
+        
+        Args:
+            date_str: Day in DD/MM format
+            since: Cursor from the previous call (None for everything so far)
+            limit: Most records per call; a full page means there may be more
+        
+        Returns:
+            (DataFrame of changed records in change order, cursor for the next call)
+            or None on error. The cursor is `since` when nothing changed.
+        """
+        try:
+            session = self.get_session()
+            
+            changed_at = func.coalesce(
+                AttendanceRecordDB.updated_at, AttendanceRecordDB.created_at, CHANGES_EPOCH
+            ).label('changed_at')
+            
+            query = session.query(AttendanceRecordDB, changed_at).filter(AttendanceRecordDB.date == date_str)
+            if since:
+                stamp, last_id = since.rsplit('|', 1)
+                stamp = datetime.fromisoformat(stamp)
+                query = query.filter(or_(
+                    changed_at > stamp,
+                    and_(changed_at == stamp, AttendanceRecordDB.id > int(last_id))
+                ))
+            
+            rows = query.order_by(changed_at, AttendanceRecordDB.id).limit(limit).all()
+            session.close()
+            
+            records = [record for record, _ in rows]
+            
+            if not records:
+                return pd.DataFrame(), since
+            
+            data = []
+            for record in records:
+                data.append({
+                    'id': record.id,
+                    'name': record.name,
+                    'user_id': record.user_id,
+                    'slot_id': record.slot_id or [],
+                    'date': record.date,
+                    'checked_in_time': record.checked_in_time,
+                    'checked_out_time': record.checked_out_time,
+                    'is_present': record.is_present,
+                    'updated_at': record.updated_at
+                })
+            
+            with tracing.span("DataFrame(attendance changes)", tracing.FRAME, detail=f"{len(data)} row(s)"):
+                df = pd.DataFrame(data)
+            
+            last, last_changed_at = rows[-1]
+            return df, f"{last_changed_at.isoformat()}|{last.id}"
+            
+        except Exception as e:
+            print(f"Error fetching attendance changes: {e}")
+            return None
+    
+    @_traced_query
     def get_attendance_range(self, start_date: str, end_date: str) -> Optional[pd.DataFrame]:
         """
         Get attendance records for a date range
@@ -257,7 +409,8 @@ class DatabaseManager:
                     'created_at': record.created_at
                 })
             
-            df = pd.DataFrame(data)
+            with tracing.span("DataFrame(attendance)", tracing.FRAME, detail=f"{len(data)} row(s)"):
+                df = pd.DataFrame(data)
             
             # Filter by date range (convert DD/MM to comparable format)
             if not df.empty:
@@ -279,6 +432,7 @@ class DatabaseManager:
             print(f"Error fetching attendance range: {e}")
             return None
     
+    @_traced_query
     def get_user_attendance(self, user_id: int, start_date: str = None, end_date: str = None) -> Optional[pd.DataFrame]:
         """Get attendance records for a specific user"""
         try:
@@ -308,7 +462,8 @@ class DatabaseManager:
                     'is_present': record.is_present
                 })
             
-            df = pd.DataFrame(data)
+            with tracing.span("DataFrame(attendance)", tracing.FRAME, detail=f"{len(data)} row(s)"):
+                df = pd.DataFrame(data)
             
             # Filter by date range if provided
             if start_date and end_date and not df.empty:
@@ -0,0 +1,53 @@
+"""
+Lazily built services
+Defers constructing a service (and importing its heavy modules) until
+the first attribute access, so a cold start only pays for what it uses
+Zero Streamlit dependencies
+"""
+
+import threading
+from typing import Any, Callable
+
+
+class LazyService:
+    """
+    Stand-in for a service object that is built on first use
+
+    Attribute access is forwarded to the real object, which factory()
+    creates the first time any attribute is read. Safe to touch from
+    several threads (e.g. report job workers) at once.
+    """
+
+    def __init__(self, factory: Callable[[], Any], name: str = "service"):
+        """
+        Args:
+            factory: Builds the real service (imports go inside it)
+            name: Used in repr only
+        """
+        self._factory = factory
+        self._name = name
+        self._service = None
+        self._lock = threading.Lock()
+
+    @property
+    def built(self) -> bool:
+        """Whether the real service exists yet"""
+        return self._service is not None
+
+    def get(self) -> Any:
+        """The real service, building it if needed"""
+        if self._service is None:
+            with self._lock:
+                if self._service is None:
+                    self._service = self._factory()
+        return self._service
+
+    def __getattr__(self, attr: str) -> Any:
+        # Only called for attributes not found on the proxy itself
+        if attr.startswith('_'):
+            raise AttributeError(attr)
+        return getattr(self.get(), attr)
+
+    def __repr__(self) -> str:
+        state = "built" if self.built else "not built"
+        return f"<LazyService {self._name} ({state})>"
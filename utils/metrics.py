@@ -0,0 +1,169 @@
+"""
+In-process metrics registry
+Per-endpoint latency histograms, status codes, timeouts, errors and retries
+Zero Streamlit dependencies
+"""
+
+import json
+import threading
+from typing import Dict, Any, Optional, Sequence
+
+# Histogram bucket upper bounds in milliseconds (an implicit +Inf bucket follows)
+DEFAULT_BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000)
+
+
+class EndpointStats:
+    """Counters for a single endpoint"""
+
+    def __init__(self, buckets: Sequence[float]):
+        self.buckets = tuple(buckets)
+        self.bucket_counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.status_counts: Dict[int, int] = {}
+        self.timeouts = 0
+        self.errors: Dict[str, int] = {}
+        self.retries = 0
+
+    def observe(self, latency_ms: float) -> None:
+        self.count += 1
+        self.total_ms += latency_ms
+        self.max_ms = max(self.max_ms, latency_ms)
+        for i, bound in enumerate(self.buckets):
+            if latency_ms <= bound:
+                self.bucket_counts[i] += 1
+                return
+        self.bucket_counts[-1] += 1
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Estimate a latency quantile as the upper bound of its bucket"""
+        if self.count == 0:
+            return None
+        target = q * self.count
+        cumulative = 0
+        for i, bucket_count in enumerate(self.bucket_counts):
+            cumulative += bucket_count
+            if cumulative >= target:
+                return self.buckets[i] if i < len(self.buckets) else self.max_ms
+        return self.max_ms
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "avg_ms": self.total_ms / self.count if self.count else 0.0,
+            "max_ms": self.max_ms,
+            "p50_ms": self.quantile(0.50),
+            "p95_ms": self.quantile(0.95),
+            "p99_ms": self.quantile(0.99),
+            "histogram": {
+                **{f"le_{bound}": n for bound, n in zip(self.buckets, self.bucket_counts)},
+                "le_inf": self.bucket_counts[-1]
+            },
+            "status_counts": dict(self.status_counts),
+            "timeouts": self.timeouts,
+            "errors": dict(self.errors),
+            "retries": self.retries
+        }
+
+
+class MetricsRegistry:
+    """Thread-safe registry keyed by endpoint name (e.g. "GET /esp32/user/esp32/users")"""
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS_MS):
+        self.buckets = tuple(buckets)
+        self._endpoints: Dict[str, EndpointStats] = {}
+        self._lock = threading.Lock()
+
+    def _stats(self, endpoint: str) -> EndpointStats:
+        stats = self._endpoints.get(endpoint)
+        if stats is None:
+            stats = self._endpoints[endpoint] = EndpointStats(self.buckets)
+        return stats
+
+    # ==================== RECORDING ====================
+
+    def observe(self, endpoint: str, latency_ms: float, status_code: Optional[int] = None) -> None:
+        """Record a completed request"""
+        with self._lock:
+            stats = self._stats(endpoint)
+            stats.observe(latency_ms)
+            if status_code is not None:
+                stats.status_counts[status_code] = stats.status_counts.get(status_code, 0) + 1
+
+    def record_timeout(self, endpoint: str, latency_ms: Optional[float] = None) -> None:
+        """Record a request that timed out"""
+        with self._lock:
+            stats = self._stats(endpoint)
+            stats.timeouts += 1
+            if latency_ms is not None:
+                stats.observe(latency_ms)
+
+    def record_error(self, endpoint: str, kind: str) -> None:
+        """Record a failed request by error kind (connection, decode, ...)"""
+        with self._lock:
+            errors = self._stats(endpoint).errors
+            errors[kind] = errors.get(kind, 0) + 1
+
+    def record_retry(self, endpoint: str) -> None:
+        """Record a retried attempt"""
+        with self._lock:
+            self._stats(endpoint).retries += 1
+
+    def reset(self) -> None:
+        """Drop all recorded data"""
+        with self._lock:
+            self._endpoints.clear()
+
+    # ==================== READING / EXPORT ====================
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """Point-in-time copy of every endpoint's stats"""
+        with self._lock:
+            return {name: stats.to_dict() for name, stats in sorted(self._endpoints.items())}
+
+    def to_json(self) -> str:
+        """Export the snapshot as JSON"""
+        return json.dumps(self.snapshot(), indent=2)
+
+    def to_prometheus(self, prefix: str = "attendance_api") -> str:
+        """Export in Prometheus text exposition format (each TYPE line followed by all of its family's samples)"""
+        families = {
+            f"{prefix}_request_duration_ms": ("histogram", []),
+            f"{prefix}_responses_total": ("counter", []),
+            f"{prefix}_timeouts_total": ("counter", []),
+            f"{prefix}_errors_total": ("counter", []),
+            f"{prefix}_retries_total": ("counter", []),
+        }
+        duration = families[f"{prefix}_request_duration_ms"][1]
+        responses = families[f"{prefix}_responses_total"][1]
+        timeouts = families[f"{prefix}_timeouts_total"][1]
+        errors = families[f"{prefix}_errors_total"][1]
+        retries = families[f"{prefix}_retries_total"][1]
+
+        with self._lock:
+            for name, stats in sorted(self._endpoints.items()):
+                label = 'endpoint="{}"'.format(name.replace('"', '\\"'))
+                cumulative = 0
+                for bound, n in zip(stats.buckets, stats.bucket_counts):
+                    cumulative += n
+                    duration.append(f'{prefix}_request_duration_ms_bucket{{{label},le="{bound}"}} {cumulative}')
+                duration.append(f'{prefix}_request_duration_ms_bucket{{{label},le="+Inf"}} {stats.count}')
+                duration.append(f"{prefix}_request_duration_ms_sum{{{label}}} {stats.total_ms:.3f}")
+                duration.append(f"{prefix}_request_duration_ms_count{{{label}}} {stats.count}")
+                for status, n in sorted(stats.status_counts.items()):
+                    responses.append(f'{prefix}_responses_total{{{label},status="{status}"}} {n}')
+                timeouts.append(f"{prefix}_timeouts_total{{{label}}} {stats.timeouts}")
+                for kind, n in sorted(stats.errors.items()):
+                    errors.append(f'{prefix}_errors_total{{{label},kind="{kind}"}} {n}')
+                retries.append(f"{prefix}_retries_total{{{label}}} {stats.retries}")
+
+        lines = []
+        for family, (metric_type, samples) in families.items():
+            lines.append(f"# TYPE {family} {metric_type}")
+            lines.extend(samples)
+        return "\n".join(lines) + "\n"
+
+
+# Process-wide default registry shared by every APIClient
+registry = MetricsRegistry()
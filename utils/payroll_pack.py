@@ -0,0 +1,215 @@
+"""
+Batch payroll pack
+Renders one generate_user_range_report PDF per employee across a process
+pool and streams them into a single ZIP archive
+Zero Streamlit dependencies
+"""
+
+import io
+import os
+import re
+import tempfile
+import threading
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from multiprocessing import spawn
+from multiprocessing.context import SpawnContext, SpawnProcess
+from typing import Optional, Callable, Tuple
+
+import pandas as pd
+
+from .pdf_manager import PDFManager, TEMP_FILE, PDFOutput, PDFResult
+
+ProgressCallback = Callable[[int, int, str], None]
+
+# One PDFManager per worker process (styles are built once, not per employee)
+_worker_pdf_manager = None
+
+
+# ==================== WORKER PROCESSES ====================
+
+# spawn re-runs the parent's __main__ in every child before unpickling the
+# work. Under `streamlit run` that is app.py (page config, services, the write
+# queue, a second job queue), so pool workers are launched without it and only
+# import what _render_user needs.
+_launching_worker = threading.local()
+# Unwrap on re-import so the hook never stacks
+_parent_preparation_data = getattr(spawn.get_preparation_data, 'parent', spawn.get_preparation_data)
+
+
+def _worker_preparation_data(name):
+    data = _parent_preparation_data(name)
+    if getattr(_launching_worker, 'active', False):
+        data.pop('init_main_from_path', None)
+        data.pop('init_main_from_name', None)
+    return data
+
+
+_worker_preparation_data.parent = _parent_preparation_data
+spawn.get_preparation_data = _worker_preparation_data
+
+
+class _WorkerProcess(SpawnProcess):
+    @staticmethod
+    def _Popen(process_obj):
+        _launching_worker.active = True
+        try:
+            return SpawnProcess._Popen(process_obj)
+        finally:
+            _launching_worker.active = False
+
+
+class _WorkerContext(SpawnContext):
+    """spawn context whose children never import the parent's __main__"""
+    Process = _WorkerProcess
+
+
+def _init_worker():
+    global _worker_pdf_manager
+    _worker_pdf_manager = PDFManager()
+
+
+def _render_user(job: Tuple[str, pd.DataFrame, str, str, str]) -> Tuple[str, str, Optional[bytes]]:
+    """Worker entry point: render one employee's range report to bytes"""
+    arcname, user_data, start_date, end_date, user_name = job
+    pdf_manager = _worker_pdf_manager or PDFManager()
+    pdf_bytes = pdf_manager.generate_user_range_report(user_data, start_date, end_date, user_name)
+    return arcname, user_name, pdf_bytes
+
+
+def _safe_filename(text: str) -> str:
+    return re.sub(r'[^A-Za-z0-9._-]+', '_', str(text)).strip('_') or 'user'
+
+
+def split_by_user(attendance_data: pd.DataFrame, start_date: str, end_date: str) -> list:
+    """
+    Split range data into one render job per employee
+
+    Returns:
+        List of (arcname, user_data, start_date, end_date, user_name) tuples,
+        in order of each employee's first appearance
+    """
+    jobs = []
+    period = f"{start_date.replace('/', '_')}_to_{end_date.replace('/', '_')}"
+
+    for user_id, user_data in attendance_data.groupby('user_id', sort=False):
+        names = user_data['name'].dropna() if 'name' in user_data else []
+        name = names.iloc[0] if len(names) else f"User {user_id}"
+        user_name = f"{name} (ID: {user_id})"
+        arcname = f"payroll_{_safe_filename(name)}_{user_id}_{period}.pdf"
+        jobs.append((arcname, user_data.reset_index(drop=True), start_date, end_date, user_name))
+
+    return jobs
+
+
+def build_payroll_pack(
+    attendance_data: pd.DataFrame,
+    start_date: str,
+    end_date: str,
+    output: PDFOutput = None,
+    max_workers: Optional[int] = None,
+    progress_callback: Optional[ProgressCallback] = None
+) -> Optional[PDFResult]:
+    """
+    ✅ Render a range report for every employee and zip them together
+
+    PDFs are written into the archive as soon as each worker finishes, and
+    only a bounded number of jobs is in flight, so memory stays flat no
+    matter how many employees are in the range.
+
+    Args:
+        attendance_data: Range data for all users (get_attendance_range)
+        start_date: Start date (DD/MM)
+        end_date: End date (DD/MM)
+        output: Same as PDFManager: None for bytes, TEMP_FILE, a path or a file object
+        max_workers: Worker processes (default: CPU count); 1 renders in-process
+        progress_callback: Called as progress_callback(done, total, user_name)
+
+    Returns:
+        ZIP as bytes (or path / file object, per output) or None if failed
+    """
+    if attendance_data is None or attendance_data.empty or 'user_id' not in attendance_data:
+        print("Error building payroll pack: no attendance data")
+        return None
+
+    jobs = split_by_user(attendance_data, start_date, end_date)
+    total = len(jobs)
+    max_workers = max(1, min(max_workers or os.cpu_count() or 1, total))
+
+    temp_path = None
+    try:
+        if output is None:
+            target = io.BytesIO()
+        elif output is TEMP_FILE:
+            fd, temp_path = tempfile.mkstemp(prefix="payroll_", suffix=".zip")
+            os.close(fd)
+            target = temp_path
+        else:
+            target = output
+
+        failed = []
+        with zipfile.ZipFile(target, 'w', compression=zipfile.ZIP_DEFLATED) as archive:
+            done = 0
+            for arcname, user_name, pdf_bytes in _render_all(jobs, max_workers):
+                if pdf_bytes:
+                    archive.writestr(arcname, pdf_bytes)
+                else:
+                    failed.append(user_name)
+                done += 1
+                if progress_callback:
+                    progress_callback(done, total, user_name)
+
+            if failed:
+                archive.writestr("FAILED.txt", "\n".join(failed) + "\n")
+
+        if failed:
+            print(f"Payroll pack: {len(failed)} of {total} reports failed to render")
+
+        if output is None:
+            return target.getvalue()
+        if output is TEMP_FILE:
+            return temp_path
+        if hasattr(output, 'flush'):
+            output.flush()
+        return output
+
+    except Exception as e:
+        print(f"Error building payroll pack: {e}")
+        if temp_path and os.path.exists(temp_path):
+            os.remove(temp_path)
+        return None
+
+
+def _render_all(jobs: list, max_workers: int):
+    """Yield (arcname, user_name, pdf_bytes) in completion order"""
+    if max_workers == 1:
+        _init_worker()
+        for job in jobs:
+            yield _render_user(job)
+        return
+
+    # Keep a couple of jobs queued per worker so results stream out without
+    # pickling the whole range into the pool up front
+    max_in_flight = max_workers * 2
+    pending = iter(jobs)
+    # spawn, not fork: this runs on a worker thread of the multi-threaded
+    # Streamlit server, and a forked child can inherit a lock another thread
+    # held at fork time and deadlock. _WorkerContext keeps app.py out of them.
+    with ProcessPoolExecutor(
+        max_workers=max_workers,
+        initializer=_init_worker,
+        mp_context=_WorkerContext()
+    ) as executor:
+        in_flight = set()
+        for job in pending:
+            in_flight.add(executor.submit(_render_user, job))
+            if len(in_flight) >= max_in_flight:
+                break
+
+        while in_flight:
+            finished, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in finished:
+                yield future.result()
+                next_job = next(pending, None)
+                if next_job is not None:
+                    in_flight.add(executor.submit(_render_user, next_job))
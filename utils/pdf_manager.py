@@ -1,26 +1,110 @@
-
 """
 PDF Manager - Modular PDF generation with ReportLab
 Zero Streamlit dependencies
 ✅ WITH SALARY CALCULATIONS INTEGRATED
 """
 
-from reportlab.lib.pagesizes import A4
+from reportlab.lib.pagesizes import A4, landscape
 from reportlab.lib import colors
 from reportlab.lib.units import inch
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, PageBreak
+from reportlab.platypus import SimpleDocTemplate, Table, LongTable, TableStyle, Paragraph, Spacer, PageBreak, Flowable
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.enums import TA_CENTER, TA_LEFT
 from datetime import datetime, time as dt_time, timedelta
 import io
+import os
+import shutil
+import tempfile
+import time
+import numpy as np
 import pandas as pd
-from typing import Optional
+from typing import Optional, Union, BinaryIO
+
+from . import attendance_engine, tracing
+from .render_cache import RenderCache, fingerprint_frame, make_key
+
+# Pass as `output` to write the PDF to a new temporary file and get its path back
+TEMP_FILE = object()
+
+PDFOutput = Optional[Union[str, os.PathLike, BinaryIO]]  # or TEMP_FILE
+
+
+class _PagedTable(Flowable):
+    """
+    Large fixed-row-height table laid out as one LongTable per page
+    
+    Each time the frame splits it, it takes exactly the rows that fit in
+    the space left under one header, so every page starts with the header
+    once and no page re-measures the rows after it.
+    """
+    
+    def __init__(self, header: list, body: list, col_widths: list, header_height: float,
+                 row_height: float, style: TableStyle, chunk_style, start: int = 0):
+        super().__init__()
+        self.header = header
+        self.body = body
+        self.col_widths = col_widths
+        self.header_height = header_height
+        self.row_height = row_height
+        self.style = style
+        self.chunk_style = chunk_style  # (first body row, rows) -> extra style commands
+        self.start = start
+        self.hAlign = 'CENTER'  # Same placement as Table
+    
+    def _table(self, rows: int) -> LongTable:
+        table = LongTable(
+            self.header + self.body[:rows],
+            colWidths=self.col_widths,
+            rowHeights=[self.header_height] + [self.row_height] * rows,
+            repeatRows=1
+        )
+        table.setStyle(self.style)
+        extra = self.chunk_style(self.start, rows)
+        if extra:
+            table.setStyle(TableStyle(extra))
+        return table
+    
+    def wrap(self, availWidth, availHeight):
+        self.width = sum(self.col_widths)
+        self.height = self.header_height + self.row_height * len(self.body)
+        return self.width, self.height
+    
+    def split(self, availWidth, availHeight):
+        rows = int((availHeight - self.header_height) // self.row_height)
+        if rows < 1:
+            return []  # Not even one row fits - start on the next page
+        if rows >= len(self.body):
+            return [self._table(len(self.body))]
+        rest = _PagedTable(self.header, self.body[rows:], self.col_widths, self.header_height,
+                           self.row_height, self.style, self.chunk_style, self.start + rows)
+        return [self._table(rows), rest]
+    
+    def draw(self):
+        table = self._table(len(self.body))
+        table.wrapOn(self.canv, self.width, self.height)
+        table.drawOn(self.canv, 0, 0)
+
+
+PDFResult = Union[bytes, str, os.PathLike, BinaryIO]
+
 
 class PDFManager:
     """Manages all PDF generation operations with salary calculations"""
     
-    def __init__(self):
-        """Initialize PDF manager with styles"""
+    TEMP_FILE = TEMP_FILE
+    
+    # Bump whenever layout, styles or calculations change so cached renders are not reused
+    TEMPLATE_VERSION = "5"
+    
+    RANGE_DAY_COLUMNS = ['date', 'name', 'checked_in_time', 'checked_out_time', 'is_present', 'salary']
+    
+    def __init__(self, cache_dir: Optional[str] = None):
+        """
+        Initialize PDF manager with styles
+        
+        Args:
+            cache_dir: Directory for the render cache; None disables caching
+        """
         self.styles = getSampleStyleSheet()
         
         # Custom title style
@@ -60,6 +144,98 @@ class PDFManager:
         
         # ✅ Standard work hours (9:15 AM is the start time)
         self.standard_start_time = dt_time(9, 15)  # 9:15 AM
+        
+        # ✅ Table layouts and styles - built once, reused by every report
+        self.record_col_widths = [0.3*inch, 1.5*inch, 0.7*inch, 0.8*inch, 0.8*inch, 0.7*inch, 0.8*inch, 0.8*inch, 0.7*inch]
+        self.summary_col_widths = [0.4*inch, 2.5*inch, 1.2*inch, 1.2*inch, 1.2*inch, 1.2*inch]
+        self.record_table_style = self._make_table_style(header_font_size=9, body_font_size=8)
+        self.summary_table_style = self._make_table_style(header_font_size=10, body_font_size=9)
+        self.grid_table_style = self._make_table_style(header_font_size=7, body_font_size=7)
+        self.absent_color = colors.HexColor('#dee2e6')
+        self.grid_days_per_table = 31  # One month per table on a landscape page
+        
+        # Large-report mode: past this many rows, tables are laid out as one
+        # fixed-height LongTable per page so page splitting stays linear in row count
+        self.large_report_threshold = 500
+        
+        # ✅ Render cache - identical inputs return the stored PDF without rebuilding it
+        self.render_cache = RenderCache(cache_dir) if cache_dir else None
+    
+    def _make_table_style(self, header_font_size: int, body_font_size: int) -> TableStyle:
+        """Standard report table style: blue header, gridded body with alternating rows"""
+        return TableStyle([
+            # Header
+            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#2E3192')),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, 0), header_font_size),
+            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+            
+            # Body
+            ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
+            ('GRID', (0, 0), (-1, -1), 1, colors.black),
+            ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
+            ('FONTSIZE', (0, 1), (-1, -1), body_font_size),
+            ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.lightgrey]),
+        ])
+    
+    def _build_table(
+        self,
+        table_data: list,
+        col_widths: list,
+        style: TableStyle,
+        cell_commands: Optional[list] = None
+    ) -> list:
+        """
+        Build table flowables with the header row repeated on every page
+        
+        Small tables stay a single Table. Large ones get fixed row heights and
+        are cut into one LongTable per page (_PagedTable): ReportLab re-measures
+        every remaining row on each page split, so one huge table costs
+        O(rows x pages), while page-sized pieces keep that work bounded - and
+        each page shows the header exactly once.
+        
+        Args:
+            cell_commands: Extra per-cell style commands as
+                (name, first_col, last_col, body_row, *args) - body_row counts
+                from the first row under the header, so they survive chunking
+        
+        Returns:
+            List of flowables to extend the story with
+        """
+        header, body = table_data[:1], table_data[1:]
+        
+        commands_by_row = {}
+        for name, first_col, last_col, body_row, *args in cell_commands or []:
+            commands_by_row.setdefault(body_row, []).append((name, first_col, last_col, args))
+        
+        row_backgrounds = next((cmd[3] for cmd in style.getCommands() if cmd[0] == 'ROWBACKGROUNDS'), None)
+        
+        def chunk_style(start: int, rows: int) -> list:
+            commands = []
+            if start % 2 and row_backgrounds:
+                # Keep the alternating colours in step with the whole table
+                commands.append(('ROWBACKGROUNDS', (0, 1), (-1, -1), row_backgrounds[1:] + row_backgrounds[:1]))
+            for body_row in range(start, start + rows):
+                row = body_row - start + 1
+                for name, first_col, last_col, args in commands_by_row.get(body_row, ()):
+                    commands.append((name, (first_col, row), (last_col, row), *args))
+            return commands
+        
+        if len(body) <= self.large_report_threshold:
+            table = Table(table_data, colWidths=col_widths, repeatRows=1)
+            table.setStyle(style)
+            if commands_by_row:
+                table.setStyle(TableStyle(chunk_style(0, len(body))))
+            return [table]
+        
+        # Fixed heights from the style's font sizes (leading + padding); cells are single-line
+        font_sizes = {cmd[1]: cmd[3] for cmd in style.getCommands() if cmd[0] == 'FONTSIZE'}
+        header_height = font_sizes[(0, 0)] * 1.2 + 3 + 12
+        row_height = font_sizes[(0, 1)] * 1.2 + 3 + 3
+        
+        return [_PagedTable(header, body, col_widths, header_height, row_height, style, chunk_style)]
     
     def _create_header(self, title: str, subtitle: str = None) -> list:
         """Create PDF header with title and subtitle"""
@@ -86,6 +262,136 @@ class PDFManager:
         
         return story
     
+    # ==================== RENDER CACHE ====================
+    
+    def _cache_key(self, report_type: str, attendance_data: pd.DataFrame, *args) -> Optional[str]:
+        """
+        Cache key for a report: hash of the input rows, report type, its
+        arguments and everything in the template that changes the output
+        
+        The "Generated on" timestamp is deliberately left out. A cache hit
+        returns the PDF as first rendered, and its timestamp still says when
+        that was - the data in it has not changed since.
+        
+        Returns:
+            Key string, or None when caching is disabled
+        """
+        if self.render_cache is None:
+            return None
+        return make_key(
+            self.TEMPLATE_VERSION,
+            report_type,
+            self.standard_start_time,
+            self.large_report_threshold,
+            fingerprint_frame(attendance_data),
+            *args
+        )
+    
+    def _from_cache(self, cache_key: Optional[str], output: PDFOutput = None) -> Optional[PDFResult]:
+        """Deliver a cached PDF to output the same way _build_document would, or None on a miss"""
+        if cache_key is None:
+            return None
+        
+        cached_path = self.render_cache.get_path(cache_key)
+        if cached_path is None:
+            return None
+        now = time.perf_counter()
+        tracing.record("render cache hit", tracing.PDF, now, now, size=os.path.getsize(cached_path))
+        
+        try:
+            if output is None:
+                with open(cached_path, 'rb') as f:
+                    return f.read()
+            if output is TEMP_FILE:
+                fd, target = tempfile.mkstemp(prefix="attendance_report_", suffix=".pdf")
+                with os.fdopen(fd, 'wb') as dst, open(cached_path, 'rb') as src:
+                    shutil.copyfileobj(src, dst)
+                return target
+            if isinstance(output, (str, os.PathLike)):
+                target = os.fspath(output)
+                shutil.copyfile(cached_path, target)
+                return target
+            with open(cached_path, 'rb') as src:
+                shutil.copyfileobj(src, output)
+            output.flush()
+            return output
+        except FileNotFoundError:  # Evicted between lookup and read
+            return None
+    
+    def _build_document(
+        self,
+        story: list,
+        output: PDFOutput = None,
+        cache_key: Optional[str] = None,
+        pagesize: tuple = A4
+    ) -> PDFResult:
+        """
+        Build the story into a PDF
+        
+        Args:
+            story: Flowables to render
+            output: None -> return bytes (in-memory, previous behaviour)
+                    TEMP_FILE -> write a new temp file, return its path (caller deletes it)
+                    path -> write that file, return the path
+                    binary file object -> write into it, return it
+            cache_key: Store the finished PDF in the render cache under this key
+            pagesize: Page size, e.g. landscape(A4) for wide tables
+        
+        Returns:
+            bytes, path or file object depending on output
+        """
+        if cache_key is not None and output is not None and output is not TEMP_FILE \
+                and not isinstance(output, (str, os.PathLike)):
+            # File objects may be write-only, so render to bytes, cache, then copy out
+            pdf_bytes = self._build_document(story, None, cache_key, pagesize)
+            output.write(pdf_bytes)
+            output.flush()
+            return output
+        
+        if output is None:
+            target = io.BytesIO()
+        elif output is TEMP_FILE:
+            fd, target = tempfile.mkstemp(prefix="attendance_report_", suffix=".pdf")
+            os.close(fd)
+        elif isinstance(output, (str, os.PathLike)):
+            target = os.fspath(output)
+        else:
+            target = output
+        
+        doc = SimpleDocTemplate(
+            target,
+            pagesize=pagesize,
+            topMargin=0.5*inch,
+            bottomMargin=0.5*inch,
+            leftMargin=0.5*inch,
+            rightMargin=0.5*inch
+        )
+        
+        try:
+            with tracing.span("doc.build", tracing.PDF) as build_span:
+                doc.build(story)
+                if isinstance(target, io.BytesIO):
+                    build_span["bytes"] = target.getbuffer().nbytes
+                elif isinstance(target, str):
+                    build_span["bytes"] = os.path.getsize(target)
+                build_span["detail"] = f"{doc.page} page(s)"
+        except Exception:
+            if output is TEMP_FILE:
+                os.remove(target)
+            raise
+        
+        if output is None:
+            pdf_bytes = target.getvalue()
+            if cache_key is not None:
+                self.render_cache.put(cache_key, pdf_bytes)
+            return pdf_bytes
+        if output is TEMP_FILE or isinstance(output, (str, os.PathLike)):
+            if cache_key is not None:
+                self.render_cache.put_file(cache_key, target)
+            return target
+        output.flush()
+        return output
+    
     def _calculate_hours(self, check_in, check_out) -> float:
         """
         Calculate working hours between check-in and check-out
@@ -170,12 +476,163 @@ class PDFManager:
         
         return daily_total
     
+    def compute_metrics(self, attendance_data: pd.DataFrame) -> pd.DataFrame:
+        """
+        ✅ Vectorized hours, late flag and daily salary for every row at once
+        Same results as _calculate_hours / _is_late_arrival / _calculate_daily_salary
+        
+        Returns:
+            Copy of attendance_data with 'hours', 'is_late' and 'daily_total' columns
+        """
+        return attendance_engine.enrich(attendance_data, self.standard_start_time)
+    
+    def summarize_by_user(
+        self,
+        attendance_data: pd.DataFrame,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None
+    ) -> pd.DataFrame:
+        """
+        ✅ Per-employee totals for a range, computed with one groupby
+        
+        Daily salary is taken from each employee's first record and applied
+        to all of their days. Employees appear in first-record order.
+        
+        With start_date/end_date, every calendar day of the period counts:
+        days without a record are absences (see attendance_engine.attendance_matrix).
+        Without them, only the records themselves are counted.
+        
+        Returns:
+            DataFrame with user_id, employee, salary, present, absent, total_salary
+        """
+        columns = ['user_id', 'employee', 'salary', 'present', 'absent', 'total_salary']
+        if attendance_data.empty:
+            return pd.DataFrame(columns=columns)
+        
+        # First record per employee -> name and daily salary
+        firsts = attendance_data[~attendance_data['user_id'].duplicated()]
+        first_salary = firsts['salary'] if 'salary' in firsts else pd.Series(None, index=firsts.index, dtype=object)
+        salary_by_user = pd.Series(
+            [float(s) if s is not None and s > 0 else 0.0 for s in first_salary],
+            index=firsts['user_id'].to_numpy()
+        )
+        
+        if start_date and end_date:
+            days = attendance_engine.attendance_matrix(attendance_data, start_date, end_date, self.standard_start_time)
+            present = days['is_present'].fillna(False).astype(bool).to_numpy()
+        else:
+            days = attendance_data
+            present = days['is_present'].to_numpy() if 'is_present' in days else 0
+        
+        n = len(days)
+        user_ids = days['user_id']
+        hours = attendance_engine.calculate_hours(
+            days['checked_in_time'] if 'checked_in_time' in days else [None] * n,
+            days['checked_out_time'] if 'checked_out_time' in days else [None] * n
+        )
+        row_salary = user_ids.map(salary_by_user).to_numpy(dtype=float)
+        
+        grouped = pd.DataFrame({
+            'user_id': user_ids.to_numpy(),
+            'present': present,
+            'days': 1,
+            'earned': attendance_engine.daily_salary(row_salary, hours)
+        }).groupby('user_id', sort=False).sum()
+        
+        summary = pd.DataFrame({
+            'user_id': grouped.index,
+            'employee': firsts.set_index('user_id')['name'].reindex(grouped.index).to_numpy(),
+            'salary': salary_by_user.reindex(grouped.index).to_numpy(),
+            'present': grouped['present'].to_numpy(),
+            'absent': (grouped['days'] - grouped['present']).to_numpy(),
+            'total_salary': grouped['earned'].to_numpy()
+        })
+        return summary[columns]
+    
+    def fill_user_range(
+        self,
+        attendance_data: pd.DataFrame,
+        start_date: str,
+        end_date: str,
+        user_name: str
+    ) -> pd.DataFrame:
+        """
+        ✅ One row per calendar day in the range for a single user
+        Days without a record are filled in as absent at the user's daily salary
+        
+        Args:
+            attendance_data: The user's attendance records
+            start_date: Start date in DD/MM format
+            end_date: End date in DD/MM format
+            user_name: Name used for filled-in days
+        
+        Returns:
+            DataFrame with date, name, checked_in_time, checked_out_time,
+            is_present, salary, hours, is_late, daily_total
+        """
+        # Same calendar grid as the all-users matrix, with every record keyed to one user
+        grid = attendance_engine.attendance_matrix(
+            attendance_data.assign(user_id=0),
+            start_date,
+            end_date,
+            self.standard_start_time,
+            users=[0]
+        )
+        
+        if 'name' in attendance_data:
+            grid.loc[~grid['has_record'], 'name'] = user_name
+        else:
+            grid['name'] = user_name
+        
+        return grid[self.RANGE_DAY_COLUMNS + ['hours', 'is_late', 'daily_total']]
+    
+    # ==================== RESULT FRAMES ====================
+    # Computed once per report and shared by the PDF, the on-screen preview and the exports
+    
+    def _status_labels(self, is_present) -> pd.Series:
+        # Same truthiness as the per-row "Present" if row.get('is_present') check
+        return is_present.map(lambda present: "Present" if present else "Absent")
+    
+    def daily_result(self, attendance_data: pd.DataFrame) -> pd.DataFrame:
+        """
+        ✅ Rows of the daily report with every derived value computed once
+        
+        Returns:
+            Copy of attendance_data with hours, is_late, daily_total and status ("Present" / "Absent")
+        """
+        result = self.compute_metrics(attendance_data)
+        if 'is_present' in result:
+            result['status'] = self._status_labels(result['is_present'])
+        else:
+            result['status'] = "Absent"
+        return result
+    
+    def user_range_result(
+        self,
+        attendance_data: pd.DataFrame,
+        start_date: str,
+        end_date: str,
+        user_name: str
+    ) -> pd.DataFrame:
+        """
+        ✅ Rows of the single-user range report (see fill_user_range) plus status
+        
+        Returns:
+            DataFrame with date, name, checked_in_time, checked_out_time, is_present,
+            salary, hours, is_late, daily_total, status ("Present" / "Absent")
+        """
+        days = self.fill_user_range(attendance_data, start_date, end_date, user_name)
+        days['status'] = self._status_labels(days['is_present'])
+        return days
+    
     def generate_daily_report(
         self,
         attendance_data: pd.DataFrame,
         date_str: str,
-        user_name: Optional[str] = None
-    ) -> Optional[bytes]:
+        user_name: Optional[str] = None,
+        output: PDFOutput = None,
+        result: Optional[pd.DataFrame] = None
+    ) -> Optional[PDFResult]:
         """
         ✅ Generate daily attendance PDF report WITH SALARY
         
@@ -183,20 +640,17 @@ class PDFManager:
             attendance_data: DataFrame with attendance records (must include 'salary' column)
             date_str: Date in DD/MM format
             user_name: Optional user name filter
+            output: Where to write the PDF (see _build_document)
+            result: daily_result(attendance_data), if the caller already computed it
         
         Returns:
-            PDF as bytes or None if failed
+            PDF as bytes (or path / file object, per output) or None if failed
         """
         try:
-            buffer = io.BytesIO()
-            doc = SimpleDocTemplate(
-                buffer,
-                pagesize=A4,
-                topMargin=0.5*inch,
-                bottomMargin=0.5*inch,
-                leftMargin=0.5*inch,
-                rightMargin=0.5*inch
-            )
+            cache_key = self._cache_key('daily', attendance_data, date_str, user_name)
+            cached = self._from_cache(cache_key, output)
+            if cached is not None:
+                return cached
             
             story = []
             
@@ -213,21 +667,23 @@ class PDFManager:
             
             total_salary_sum = 0.0
             
-            for idx, row in attendance_data.iterrows():
+            # ✅ Hours, totals and status for all rows in one vectorized pass
+            if result is None:
+                result = self.daily_result(attendance_data)
+            
+            for idx, row in zip(result.index, result.to_dict('records')):
                 # Format times
                 check_in_time = row.get('checked_in_time', 'N/A')
                 check_out_time = row.get('checked_out_time', 'N/A')
-                status = "Present" if row.get('is_present', False) else "Absent"
+                hours = row['hours']
+                daily_total = row['daily_total']
                 
-                # Calculate hours
-                hours = self._calculate_hours(check_in_time, check_out_time)
                 hours_str = self._format_hours(hours)
                 
-                # ✅ Get salary and calculate total
+                # ✅ Get salary and format total
                 salary = row.get('salary')
                 salary_str = f"{float(salary):.2f}" if salary is not None and salary > 0 else ""
                 
-                daily_total = self._calculate_daily_salary(salary, check_in_time, check_out_time)
                 total_str = f"{daily_total:.2f}" if daily_total > 0 else ""
                 
                 if daily_total > 0:
@@ -242,35 +698,11 @@ class PDFManager:
                     hours_str,
                     salary_str,
                     total_str,
-                    status
+                    row['status']
                 ])
             
-            # Create table
-            table = Table(
-                table_data,
-                colWidths=[0.3*inch, 1.5*inch, 0.7*inch, 0.8*inch, 0.8*inch, 0.7*inch, 0.8*inch, 0.8*inch, 0.7*inch]
-            )
-            
-            # Table styling
-            table_style = [
-                # Header
-                ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#2E3192')),
-                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                ('FONTSIZE', (0, 0), (-1, 0), 9),
-                ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-                
-                # Body
-                ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-                ('GRID', (0, 0), (-1, -1), 1, colors.black),
-                ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-                ('FONTSIZE', (0, 1), (-1, -1), 8),
-                ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.lightgrey]),
-            ]
-            
-            table.setStyle(TableStyle(table_style))
-            story.append(table)
+            # Create table (chunked LongTables for large reports)
+            story.extend(self._build_table(table_data, self.record_col_widths, self.record_table_style))
             
             # Footer with statistics
             story.append(Spacer(1, 0.3*inch))
@@ -288,10 +720,7 @@ class PDFManager:
             story.append(footer_para)
             
             # Build PDF
-            doc.build(story)
-            
-            buffer.seek(0)
-            return buffer.getvalue()
+            return self._build_document(story, output, cache_key)
             
         except Exception as e:
             print(f"Error generating daily report: {e}")
@@ -304,23 +733,26 @@ class PDFManager:
         attendance_data: pd.DataFrame,
         start_date: str,
         end_date: str,
-        user_name: str
-    ) -> Optional[bytes]:
+        user_name: str,
+        output: PDFOutput = None,
+        result: Optional[pd.DataFrame] = None
+    ) -> Optional[PDFResult]:
         """
         ✅ Generate date range report for SINGLE USER with salary calculations
         Shows ALL records including absent days
+        
+        Args:
+            result: user_range_result(...) for the same arguments, if the caller already computed it
+        
+        Returns:
+            PDF as bytes (or path / file object, per output) or None if failed
         """
         try:
-            buffer = io.BytesIO()
-            doc = SimpleDocTemplate(
-                buffer,
-                pagesize=A4,
-                topMargin=0.5 * inch,
-                bottomMargin=0.5 * inch,
-                leftMargin=0.5 * inch,
-                rightMargin=0.5 * inch
-            )
-
+            cache_key = self._cache_key('user_range', attendance_data, start_date, end_date, user_name, datetime.now().year)
+            cached = self._from_cache(cache_key, output)
+            if cached is not None:
+                return cached
+            
             story = []
 
             title = f"Attendance Report - {user_name}"
@@ -331,24 +763,8 @@ class PDFManager:
                 ['#', 'Name', 'Date', 'Check In', 'Check Out', 'Hours', 'Salary', 'Total', 'Status']
             ]
 
-            # ==========================
-            # ✅ FIXED DATE PARSING (DD/MM)
-            # ==========================
-            current_year = datetime.now().year
-
-            start_dt = datetime.strptime(f"{start_date}/{current_year}", "%d/%m/%Y").date()
-            end_dt = datetime.strptime(f"{end_date}/{current_year}", "%d/%m/%Y").date()
-
-            # Handle year rollover (e.g. 27/12 → 03/01)
-            if end_dt < start_dt:
-                end_dt = end_dt.replace(year=current_year + 1)
-
-            all_dates = pd.date_range(start=start_dt, end=end_dt)
-
-            attendance_map = {
-                str(row['date']): row
-                for _, row in attendance_data.iterrows()
-            }
+            # ✅ One row per day in the range (gaps filled as absent) with hours and totals
+            days = result if result is not None else self.user_range_result(attendance_data, start_date, end_date, user_name)
 
             grand_total = 0.0
             total_hours = 0.0
@@ -356,36 +772,26 @@ class PDFManager:
             absent_count = 0
             row_index = 1
 
-            for day in all_dates:
-                date_str = day.strftime("%d/%m")
-                row = attendance_map.get(date_str)
-
-                if row is not None:
-                    check_in = row.get('checked_in_time', 'N/A')
-                    check_out = row.get('checked_out_time', 'N/A')
-                    is_present = row.get('is_present', False)
-                    salary = row.get('salary')
-                    name = row.get('name', user_name)
-                else:
-                    check_in = 'N/A'
-                    check_out = 'N/A'
-                    is_present = False
-                    salary = attendance_data.iloc[0].get('salary') if not attendance_data.empty else None
-                    name = user_name
-
-                status = "Present" if is_present else "Absent"
+            for day_row in days.to_dict('records'):
+                hours = day_row['hours']
+                daily_total = day_row['daily_total']
+                date_str = day_row['date']
+                check_in = day_row['checked_in_time']
+                check_out = day_row['checked_out_time']
+                is_present = day_row['is_present']
+                salary = day_row['salary']
+                name = day_row['name']
+                status = day_row['status']
 
                 if is_present:
                     present_count += 1
                 else:
                     absent_count += 1
 
-                hours = self._calculate_hours(check_in, check_out)
                 total_hours += hours
                 hours_str = self._format_hours(hours)
 
                 salary_str = f"{float(salary):.2f}" if salary is not None and salary > 0 else ""
-                daily_total = self._calculate_daily_salary(salary, check_in, check_out)
                 total_str = f"{daily_total:.2f}" if daily_total > 0 else ""
 
                 grand_total += daily_total
@@ -404,36 +810,10 @@ class PDFManager:
 
                 row_index += 1
 
-            table = Table(
-                table_data,
-                colWidths=[
-                    0.3 * inch, 1.5 * inch, 0.7 * inch,
-                    0.8 * inch, 0.8 * inch, 0.7 * inch,
-                    0.8 * inch, 0.8 * inch, 0.7 * inch
-                ]
-            )
-
-            # Table styling 
-            table_style = [ 
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#2E3192')),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke), 
-            ('ALIGN', (0, 0), (-1, -1), 'CENTER'), 
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'), 
-            ('FONTSIZE', (0, 0), (-1, 0), 9), 
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 12), 
-            ('BACKGROUND', (0, 1), (-1, -1), colors.beige), 
-            ('GRID', (0, 0), (-1, -1), 1, colors.black), 
-            ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'), 
-            ('FONTSIZE', (0, 1), (-1, -1), 8), 
-            ('ROWBACKGROUNDS', (0, 1), (-1, -1), 
-            [colors.white, colors.lightgrey]) 
-            ]
-            table.setStyle(TableStyle(table_style))
-
-            story.append(table)
+            story.extend(self._build_table(table_data, self.record_col_widths, self.record_table_style))
             story.append(Spacer(1, 0.3 * inch))
 
-            total_days = len(all_dates)
+            total_days = len(days)
             avg_hours = total_hours / total_days if total_days else 0
 
             story.append(Paragraph(f"""
@@ -446,9 +826,7 @@ class PDFManager:
             • <b>GRAND TOTAL SALARY: Rs. {grand_total:.2f}</b>
             """, self.normal_style))
 
-            doc.build(story)
-            buffer.seek(0)
-            return buffer.getvalue()
+            return self._build_document(story, output, cache_key)
 
         except Exception as e:
             print(f"Error generating user range report: {e}")
@@ -462,8 +840,10 @@ class PDFManager:
         self,
         attendance_data: pd.DataFrame,
         start_date: str,
-        end_date: str
-    ) -> Optional[bytes]:
+        end_date: str,
+        output: PDFOutput = None,
+        result: Optional[pd.DataFrame] = None
+    ) -> Optional[PDFResult]:
         """
         ✅ Generate date range summary for ALL USERS COMBINED with salary calculations
         One row per user with: Employee, Salary (Daily), Present Days, Absent Days, Total Salary
@@ -473,20 +853,17 @@ class PDFManager:
             attendance_data: DataFrame with all users' attendance records (must include 'salary' column)
             start_date: Start date in DD/MM format
             end_date: End date in DD/MM format
+            output: Where to write the PDF (see _build_document)
+            result: summarize_by_user(attendance_data, start_date, end_date), if already computed
         
         Returns:
-            PDF as bytes or None if failed
+            PDF as bytes (or path / file object, per output) or None if failed
         """
         try:
-            buffer = io.BytesIO()
-            doc = SimpleDocTemplate(
-                buffer,
-                pagesize=A4,
-                topMargin=0.5*inch,
-                bottomMargin=0.5*inch,
-                leftMargin=0.5*inch,
-                rightMargin=0.5*inch
-            )
+            cache_key = self._cache_key('combined_summary', attendance_data, start_date, end_date, datetime.now().year)
+            cached = self._from_cache(cache_key, output)
+            if cached is not None:
+                return cached
             
             story = []
             
@@ -496,43 +873,10 @@ class PDFManager:
             
             story.extend(self._create_header(title, subtitle))
             
-            # ✅ Calculate summary for each user
-            summary_data = []
-            
-            for user_id in attendance_data['user_id'].unique():
-                user_records = attendance_data[attendance_data['user_id'] == user_id]
-                
-                if user_records.empty:
-                    continue
-                
-                employee_name = user_records.iloc[0]['name']
-                
-                # Get salary (should be same for all records of this user)
-                salary = user_records.iloc[0].get('salary')
-                salary_value = float(salary) if salary is not None and salary > 0 else 0.0
-                
-                # Count present/absent days
-                present_days = user_records['is_present'].sum() if 'is_present' in user_records else 0
-                total_days = len(user_records)
-                absent_days = total_days - present_days
-                
-                # ✅ Calculate total salary for this employee in the range
-                total_salary_earned = 0.0
-                
-                for _, row in user_records.iterrows():
-                    check_in = row.get('checked_in_time')
-                    check_out = row.get('checked_out_time')
-                    
-                    daily_total = self._calculate_daily_salary(salary_value, check_in, check_out)
-                    total_salary_earned += daily_total
-                
-                summary_data.append({
-                    'employee': employee_name,
-                    'salary': salary_value,
-                    'present': present_days,
-                    'absent': absent_days,
-                    'total_salary': total_salary_earned
-                })
+            # ✅ Calculate summary for all users in one grouped pass
+            if result is None:
+                result = self.summarize_by_user(attendance_data, start_date, end_date)
+            summary_data = result.to_dict('records')
             
             # Create table
             table_data = [['#', 'Employee', 'Salary (Daily)', 'Present Days', 'Absent Days', 'Total Salary']]
@@ -554,29 +898,8 @@ class PDFManager:
                     total_str
                 ])
             
-            # Create table
-            table = Table(
-                table_data,
-                colWidths=[0.4*inch, 2.5*inch, 1.2*inch, 1.2*inch, 1.2*inch, 1.2*inch]
-            )
-            
-            # Table styling
-            table_style = [
-                ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#2E3192')),
-                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                ('FONTSIZE', (0, 0), (-1, 0), 10),
-                ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-                ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-                ('GRID', (0, 0), (-1, -1), 1, colors.black),
-                ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-                ('FONTSIZE', (0, 1), (-1, -1), 9),
-                ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.lightgrey]),
-            ]
-            
-            table.setStyle(TableStyle(table_style))
-            story.append(table)
+            # Create table (chunked LongTables for large reports)
+            story.extend(self._build_table(table_data, self.summary_col_widths, self.summary_table_style))
             
             # Overall summary
             story.append(Spacer(1, 0.3*inch))
@@ -588,6 +911,7 @@ class PDFManager:
             summary_text = f"""
             <b>Overall Statistics:</b><br/>
             • Total Employees: {total_employees}<br/>
+            • Days in Period: {len(attendance_engine.period_days(start_date, end_date))}<br/>
             • Total Present Days: {total_present}<br/>
             • Total Absent Days: {total_absent}<br/>
             • <b>TOTAL PAID TO ALL EMPLOYEES: Rs. {grand_total_paid:.2f}</b>
@@ -597,13 +921,117 @@ class PDFManager:
             story.append(summary_para)
             
             # Build PDF
-            doc.build(story)
-            
-            buffer.seek(0)
-            return buffer.getvalue()
+            return self._build_document(story, output, cache_key)
             
         except Exception as e:
             print(f"Error generating combined users summary: {e}")
             import traceback
             traceback.print_exc()
-            return None
\ No newline at end of file
+            return None
+    
+    def generate_monthly_grid_report(
+        self,
+        attendance_data: pd.DataFrame,
+        start_date: str,
+        end_date: str,
+        output: PDFOutput = None
+    ) -> Optional[PDFResult]:
+        """
+        ✅ Generate users x days attendance grid (landscape)
+        One row per employee, one column per calendar day: P = present,
+        L = late, A = absent (including days with no record), plus totals
+        
+        Args:
+            attendance_data: DataFrame with all users' attendance records
+            start_date: Start date in DD/MM format
+            end_date: End date in DD/MM format
+            output: Where to write the PDF (see _build_document)
+        
+        Returns:
+            PDF as bytes (or path / file object, per output) or None if failed
+        """
+        try:
+            cache_key = self._cache_key('monthly_grid', attendance_data, start_date, end_date, datetime.now().year)
+            cached = self._from_cache(cache_key, output)
+            if cached is not None:
+                return cached
+            
+            story = []
+            
+            title = "Attendance Grid - All Employees"
+            subtitle = f"<b>Period:</b> {start_date} to {end_date} | <b>P</b> Present  <b>L</b> Late  <b>A</b> Absent"
+            story.extend(self._create_header(title, subtitle))
+            
+            # ✅ Every employee against every day of the period in one pass
+            grid = attendance_engine.attendance_matrix(attendance_data, start_date, end_date, self.standard_start_time)
+            calendar = attendance_engine.period_days(start_date, end_date)
+            users = pd.unique(grid['user_id'])
+            n_users, n_days = len(users), len(calendar)
+            
+            # Matrix rows are user-major, so statuses reshape straight into users x days
+            statuses = grid['status'].to_numpy().reshape(n_users, n_days)
+            names = attendance_data.drop_duplicates('user_id').set_index('user_id')['name'].reindex(users).to_numpy()
+            present_days = (statuses == attendance_engine.STATUS_PRESENT).sum(axis=1)
+            late_days = (statuses == attendance_engine.STATUS_LATE).sum(axis=1)
+            absent_days = (statuses == attendance_engine.STATUS_ABSENT).sum(axis=1)
+            
+            status_colors = {
+                attendance_engine.STATUS_PRESENT: self.on_time_color,
+                attendance_engine.STATUS_LATE: self.late_color,
+                attendance_engine.STATUS_ABSENT: self.absent_color
+            }
+            
+            page_width = landscape(A4)[0] - 1.0*inch
+            name_width, total_width = 1.7*inch, 0.35*inch
+            
+            # One table per block of up to a month of days
+            for block_start in range(0, n_days, self.grid_days_per_table):
+                block_days = calendar[block_start:block_start + self.grid_days_per_table]
+                block = statuses[:, block_start:block_start + len(block_days)]
+                
+                if block_start:
+                    story.append(PageBreak())
+                story.append(Paragraph(
+                    f"{block_days[0].strftime('%d/%m')} - {block_days[-1].strftime('%d/%m')}",
+                    self.heading_style
+                ))
+                
+                day_width = (page_width - name_width - 3 * total_width) / len(block_days)
+                col_widths = [name_width] + [day_width] * len(block_days) + [total_width] * 3
+                
+                table_data = [['Employee'] + [day.strftime('%d') for day in block_days] + ['P', 'L', 'A']]
+                cell_commands = []
+                
+                for row_index, (name, row) in enumerate(zip(names, block)):
+                    table_data.append(
+                        [str(name)] + row.tolist() +
+                        [str(present_days[row_index]), str(late_days[row_index]), str(absent_days[row_index])]
+                    )
+                    
+                    # One BACKGROUND command per run of equal statuses, not per cell
+                    run_starts = np.flatnonzero(np.r_[True, row[1:] != row[:-1]])
+                    run_ends = np.r_[run_starts[1:], len(row)] - 1
+                    for first, last in zip(run_starts, run_ends):
+                        cell_commands.append(
+                            ('BACKGROUND', int(first) + 1, int(last) + 1, row_index, status_colors[row[first]])
+                        )
+                
+                story.extend(self._build_table(table_data, col_widths, self.grid_table_style, cell_commands))
+            
+            story.append(Spacer(1, 0.3*inch))
+            story.append(Paragraph(f"""
+            <b>Overall Statistics:</b><br/>
+            • Total Employees: {n_users}<br/>
+            • Days in Period: {n_days}<br/>
+            • Present (on time): {int(present_days.sum())}<br/>
+            • Late: {int(late_days.sum())}<br/>
+            • Absent: {int(absent_days.sum())}
+            """, self.normal_style))
+            
+            return self._build_document(story, output, cache_key, pagesize=landscape(A4))
+            
+        except Exception as e:
+            print(f"Error generating monthly grid report: {e}")
+            import traceback
+            traceback.print_exc()
+            return None
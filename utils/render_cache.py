@@ -0,0 +1,161 @@
+"""
+Content-addressed render cache
+Stores finished report files on disk under a hash of everything that
+affects their content, with least-recently-used eviction
+Zero Streamlit dependencies
+"""
+
+import hashlib
+import os
+import shutil
+import tempfile
+import threading
+from typing import Optional
+
+import pandas as pd
+
+
+def fingerprint_frame(df: pd.DataFrame) -> str:
+    """
+    Stable hash of a DataFrame's columns, dtypes and values (index ignored)
+
+    Object columns (lists, datetime.time, mixed None/NaN) are hashed by repr
+    so values that render differently never collide.
+    """
+    h = hashlib.sha256()
+    h.update(repr([(str(col), str(dtype)) for col, dtype in df.dtypes.items()]).encode())
+    h.update(str(len(df)).encode())
+    for col in df.columns:
+        series = df[col]
+        if series.dtype == object:
+            series = series.map(repr)
+        h.update(pd.util.hash_pandas_object(series, index=False).to_numpy().tobytes())
+    return h.hexdigest()
+
+
+def make_key(*parts) -> str:
+    """Combine key parts (strings, numbers, frame fingerprints) into one cache key"""
+    h = hashlib.sha256()
+    for part in parts:
+        h.update(repr(part).encode())
+        h.update(b"\x00")
+    return h.hexdigest()
+
+
+class RenderCache:
+    """
+    Disk cache of rendered reports keyed by content hash
+
+    A file's mtime doubles as its last-used time: hits touch it, and when the
+    cache grows past max_bytes or max_entries the oldest files are removed.
+    Entries are written to a temp file and renamed, so concurrent readers
+    (several Streamlit sessions or processes) never see a partial file.
+    """
+
+    def __init__(self, directory: str, max_bytes: int = 256 * 1024 * 1024, max_entries: int = 500, suffix: str = ".pdf"):
+        """
+        Args:
+            directory: Cache directory (created if missing)
+            max_bytes: Total size budget for cached files
+            max_entries: Maximum number of cached files
+            suffix: File extension for entries
+        """
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.suffix = suffix
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key + self.suffix)
+
+    def get_path(self, key: str) -> Optional[str]:
+        """Path of a cached entry (marked as recently used), or None on a miss"""
+        path = self._path(key)
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return path
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Cached bytes, or None on a miss"""
+        path = self.get_path(key)
+        if path is None:
+            return None
+        try:
+            with open(path, 'rb') as f:
+                return f.read()
+        except FileNotFoundError:  # Evicted by another process in between
+            return None
+
+    def put(self, key: str, data: bytes) -> None:
+        """Store bytes under key"""
+        self._store(key, lambda tmp: tmp.write(data))
+
+    def put_file(self, key: str, source_path: str) -> None:
+        """Store a copy of an already rendered file under key"""
+        def copy(tmp):
+            with open(source_path, 'rb') as src:
+                shutil.copyfileobj(src, tmp)
+        self._store(key, copy)
+
+    def _store(self, key: str, write) -> None:
+        try:
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            try:
+                with os.fdopen(fd, 'wb') as tmp:
+                    write(tmp)
+                os.replace(tmp_path, self._path(key))
+            except Exception:
+                os.remove(tmp_path)
+                raise
+            self._evict()
+        except Exception as e:
+            # A cache that cannot write is just a cache miss next time
+            print(f"Render cache write failed: {e}")
+
+    def _evict(self) -> None:
+        with self._lock:
+            entries = []
+            for entry in os.scandir(self.directory):
+                if entry.name.endswith(self.suffix):
+                    try:
+                        stat = entry.stat()
+                    except FileNotFoundError:
+                        continue
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+
+            total = sum(size for _, size, _ in entries)
+            entries.sort()  # Oldest first
+            while entries and (total > self.max_bytes or len(entries) > self.max_entries):
+                _, size, path = entries.pop(0)
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+                total -= size
+
+    def clear(self) -> None:
+        """Remove every cached entry"""
+        with self._lock:
+            for entry in os.scandir(self.directory):
+                if entry.name.endswith(self.suffix):
+                    try:
+                        os.remove(entry.path)
+                    except FileNotFoundError:
+                        pass
+
+    def stats(self) -> dict:
+        files = [e for e in os.scandir(self.directory) if e.name.endswith(self.suffix)]
+        return {
+            "entries": len(files),
+            "bytes": sum(e.stat().st_size for e in files),
+            "hits": self.hits,
+            "misses": self.misses
+        }
@@ -0,0 +1,164 @@
+"""
+Report job queue
+Runs report builds on a background thread pool so the Streamlit script
+never blocks on a database fetch or doc.build
+Zero Streamlit dependencies
+"""
+
+import os
+import tempfile
+import threading
+import time
+import traceback
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Dict, Any, Callable, List
+
+from . import tracing
+
+# Job lifecycle
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+
+class ReportJobQueue:
+    """
+    Submit report builds, poll them by job id, collect the result later
+
+    Jobs live in the queue object, not in the caller's session, so a
+    rerun or page switch does not lose them. A work function is called as
+    work(progress, *args, **kwargs) and returns a result dict. If that dict
+    has a 'path', the file is deleted when the job is discarded or expires.
+    Jobs submitted with output_suffix get a fresh temp file path as their
+    first argument, work(progress, output_path, *args, **kwargs); the queue
+    deletes it unless the job finishes with it as result['path'], so a
+    failed build never leaves a file behind.
+    progress(done, total, text) updates the job's progress.
+    Each job is traced (see utils.tracing); the spans end up in job['trace'].
+    """
+
+    def __init__(self, max_workers: int = 2, ttl_seconds: int = 3600):
+        """
+        Args:
+            max_workers: Reports built at the same time
+            ttl_seconds: How long finished jobs (and their files) are kept
+        """
+        self.ttl_seconds = ttl_seconds
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="report-job")
+        self._jobs: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def submit(self, label: str, work: Callable, *args, output_suffix: Optional[str] = None, **kwargs) -> str:
+        """
+        Queue a report build
+
+        Args:
+            label: Human readable description shown while the job runs
+            work: Function building the report (see class docstring)
+            output_suffix: Hand work a temp file path with this suffix (e.g. ".pdf")
+
+        Returns:
+            Job id
+        """
+        self.purge_expired()
+        job_id = uuid.uuid4().hex[:12]
+        with self._lock:
+            self._jobs[job_id] = {
+                "id": job_id,
+                "label": label,
+                "status": QUEUED,
+                "progress": None,
+                "result": None,
+                "error": None,
+                "created_at": time.time(),
+                "finished_at": None,
+                "trace": None
+            }
+        self._executor.submit(self._run, job_id, work, args, kwargs, output_suffix)
+        return job_id
+
+    def _run(self, job_id: str, work: Callable, args: tuple, kwargs: dict, output_suffix: Optional[str]) -> None:
+        self._update(job_id, status=RUNNING)
+
+        def progress(done: int, total: int, text: str = "") -> None:
+            self._update(job_id, progress={"done": done, "total": total, "text": text})
+
+        result = None
+        output_path = None
+        with tracing.trace(job_id) as job_trace:
+            try:
+                if output_suffix:
+                    fd, output_path = tempfile.mkstemp(prefix="report_job_", suffix=output_suffix)
+                    os.close(fd)
+                    args = (output_path,) + args
+                result = work(progress, *args, **kwargs)
+                status, error = DONE, None
+            except Exception as e:
+                print(f"Report job {job_id} failed: {e}")
+                traceback.print_exc()
+                status, error = FAILED, str(e)
+
+        # Failed, or finished without a file (e.g. no data) - the temp file is nobody's
+        if output_path and (status == FAILED or not isinstance(result, dict) or result.get("path") != output_path):
+            self._remove_file({"path": output_path})
+
+        self._update(job_id, status=status, result=result, error=error,
+                     finished_at=time.time(), trace=job_trace.to_dict())
+
+        # Discarded while running - nobody will collect the file
+        with self._lock:
+            orphaned = job_id not in self._jobs
+        if orphaned:
+            self._remove_file(result)
+
+    def _update(self, job_id: str, **fields) -> None:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is not None:
+                job.update(fields)
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Snapshot of a job, or None if it was discarded or has expired"""
+        self.purge_expired()
+        return self._snapshot(job_id)
+
+    def jobs(self, job_ids: List[str]) -> List[Dict[str, Any]]:
+        """Snapshots for the given ids that still exist, in the order given"""
+        self.purge_expired()
+        return [job for job in (self._snapshot(job_id) for job_id in job_ids) if job is not None]
+
+    def _snapshot(self, job_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return dict(job) if job is not None else None
+
+    def discard(self, job_id: str) -> None:
+        """Forget a job and delete its result file"""
+        with self._lock:
+            job = self._jobs.pop(job_id, None)
+        if job is not None:
+            self._remove_file(job.get("result"))
+
+    def purge_expired(self) -> None:
+        """Discard finished jobs older than ttl_seconds (run on every submit, get and jobs call)"""
+        cutoff = time.time() - self.ttl_seconds
+        with self._lock:
+            expired = [
+                job_id for job_id, job in self._jobs.items()
+                if job["finished_at"] is not None and job["finished_at"] < cutoff
+            ]
+        for job_id in expired:
+            self.discard(job_id)
+
+    def _remove_file(self, result: Optional[Dict[str, Any]]) -> None:
+        path = result.get("path") if isinstance(result, dict) else None
+        if path and os.path.exists(path):
+            try:
+                os.remove(path)
+            except OSError as e:
+                print(f"Could not remove report file {path}: {e}")
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
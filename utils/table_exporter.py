@@ -0,0 +1,271 @@
+"""
+Table Exporter - CSV, XLSX and Parquet versions of the report datasets
+Same rows and computed hours/salary as the PDFs, without building a PDF
+Zero Streamlit dependencies
+"""
+
+import io
+import os
+import tempfile
+from datetime import time as dt_time
+from typing import Optional, Union, BinaryIO
+
+import numpy as np
+import pandas as pd
+
+from . import attendance_engine
+from .pdf_manager import PDFManager, TEMP_FILE
+
+try:
+    import openpyxl
+except ImportError:  # Optional - XLSX export unavailable without it
+    openpyxl = None
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # Optional - Parquet export unavailable without it
+    pa = None
+    pq = None
+
+
+ExportOutput = Optional[Union[str, os.PathLike, BinaryIO]]  # or TEMP_FILE
+ExportResult = Union[bytes, str, BinaryIO]
+
+# Format -> (file extension, MIME type)
+EXPORT_FORMATS = {
+    "csv": (".csv", "text/csv"),
+    "xlsx": (".xlsx", "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"),
+    "parquet": (".parquet", "application/vnd.apache.parquet"),
+}
+
+
+class TableExporter:
+    """Builds tabular report datasets and writes them out in chunks"""
+
+    TEMP_FILE = TEMP_FILE
+
+    def __init__(self, pdf_manager: Optional[PDFManager] = None, chunk_rows: int = 50_000):
+        """
+        Args:
+            pdf_manager: Source of report rules (start time, gap filling, summaries)
+            chunk_rows: Rows written per chunk / Parquet row group
+        """
+        self.pdf_manager = pdf_manager or PDFManager()
+        self.chunk_rows = chunk_rows
+
+    # ==================== DATASETS ====================
+
+    def daily_dataset(self, attendance_data: pd.DataFrame, result: Optional[pd.DataFrame] = None) -> pd.DataFrame:
+        """
+        ✅ Rows of the daily report
+
+        Args:
+            attendance_data: Attendance records for the day
+            result: PDFManager.daily_result(attendance_data), if already computed
+
+        Returns:
+            DataFrame with user_id, name, date, checked_in_time, checked_out_time,
+            is_present, is_late, hours, salary, daily_total
+        """
+        metrics = result if result is not None else self.pdf_manager.compute_metrics(attendance_data)
+        return self._finish(pd.DataFrame({
+            'user_id': self._column(attendance_data, 'user_id'),
+            'name': self._column(attendance_data, 'name'),
+            'date': self._column(attendance_data, 'date'),
+            'checked_in_time': self._column(attendance_data, 'checked_in_time'),
+            'checked_out_time': self._column(attendance_data, 'checked_out_time'),
+            'is_present': self._column(attendance_data, 'is_present'),
+            'is_late': metrics['is_late'].to_numpy(),
+            'hours': metrics['hours'].to_numpy(),
+            'salary': self._column(attendance_data, 'salary'),
+            'daily_total': metrics['daily_total'].to_numpy()
+        }))
+
+    def user_range_dataset(
+        self,
+        attendance_data: pd.DataFrame,
+        start_date: str,
+        end_date: str,
+        user_name: str,
+        result: Optional[pd.DataFrame] = None
+    ) -> pd.DataFrame:
+        """
+        ✅ Rows of the single-user range report (one per day, gaps filled as absent)
+
+        Args:
+            result: PDFManager.user_range_result(...) for the same arguments, if already computed
+
+        Returns:
+            DataFrame with name, date, checked_in_time, checked_out_time,
+            is_present, is_late, hours, salary, daily_total
+        """
+        days = result if result is not None else self.pdf_manager.fill_user_range(attendance_data, start_date, end_date, user_name)
+        return self._finish(pd.DataFrame({
+            'name': days['name'].to_numpy(),
+            'date': days['date'].to_numpy(),
+            'checked_in_time': days['checked_in_time'].to_numpy(),
+            'checked_out_time': days['checked_out_time'].to_numpy(),
+            'is_present': days['is_present'].to_numpy(),
+            'is_late': days['is_late'].to_numpy(),
+            'hours': days['hours'].to_numpy(),
+            'salary': days['salary'].to_numpy(),
+            'daily_total': days['daily_total'].to_numpy()
+        }))
+
+    def combined_summary_dataset(
+        self,
+        attendance_data: pd.DataFrame,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        result: Optional[pd.DataFrame] = None
+    ) -> pd.DataFrame:
+        """
+        ✅ Rows of the all-users summary (calendar-aware when the period is given)
+
+        Args:
+            result: PDFManager.summarize_by_user(...) for the same arguments, if already computed
+
+        Returns:
+            DataFrame with user_id, employee, salary, present, absent, total_salary
+        """
+        if result is not None:
+            summary = result.copy()
+        else:
+            summary = self.pdf_manager.summarize_by_user(attendance_data, start_date, end_date)
+        summary['total_salary'] = summary['total_salary'].astype(float).round(2)
+        return summary
+
+    def grid_dataset(self, attendance_data: pd.DataFrame, start_date: str, end_date: str) -> pd.DataFrame:
+        """
+        ✅ Rows of the monthly grid: one per employee, one P/L/A column per day
+
+        Returns:
+            DataFrame with user_id, employee, one column per DD/MM day, present, late, absent
+        """
+        grid = attendance_engine.attendance_matrix(
+            attendance_data, start_date, end_date, self.pdf_manager.standard_start_time
+        )
+        wide = grid.pivot(index='user_id', columns='date', values='status')
+        wide = wide.reindex(index=pd.unique(grid['user_id']), columns=pd.unique(grid['date']))
+
+        # Count over the day columns only - not the employee name or earlier counts
+        day_columns = list(wide.columns)
+        names = attendance_data.drop_duplicates('user_id').set_index('user_id')['name'] \
+            if 'name' in attendance_data else pd.Series(dtype=object)
+        wide.insert(0, 'employee', names.reindex(wide.index).to_numpy())
+        wide['present'] = (wide[day_columns] == attendance_engine.STATUS_PRESENT).sum(axis=1)
+        wide['late'] = (wide[day_columns] == attendance_engine.STATUS_LATE).sum(axis=1)
+        wide['absent'] = (wide[day_columns] == attendance_engine.STATUS_ABSENT).sum(axis=1)
+        wide.columns.name = None
+        return wide.reset_index()
+
+    def _column(self, attendance_data: pd.DataFrame, name: str) -> np.ndarray:
+        if name in attendance_data:
+            return attendance_data[name].to_numpy()
+        return np.full(len(attendance_data), None, dtype=object)
+
+    def _finish(self, dataset: pd.DataFrame) -> pd.DataFrame:
+        """Normalise types so every format gets clean, typed columns"""
+        for col in ('checked_in_time', 'checked_out_time'):
+            dataset[col] = self._time_text(dataset[col])
+        dataset['is_present'] = dataset['is_present'].map(lambda v: bool(v) if pd.notna(v) else False).astype(bool)
+        dataset['is_late'] = dataset['is_late'].astype(bool)
+        dataset['salary'] = pd.to_numeric(dataset['salary'], errors='coerce')
+        dataset['hours'] = dataset['hours'].astype(float).round(2)
+        dataset['daily_total'] = dataset['daily_total'].astype(float).round(2)
+        return dataset
+
+    def _time_text(self, values: pd.Series) -> pd.Series:
+        """HH:MM text for check-in/out values; 'N/A', blanks and NULLs become missing"""
+        def as_text(value):
+            if isinstance(value, dt_time):
+                return value.strftime("%H:%M")
+            if isinstance(value, str) and value.strip() and value != 'N/A':
+                return value
+            return None
+
+        codes, uniques = pd.factorize(values, use_na_sentinel=True)
+        texts = np.append(np.array([as_text(u) for u in uniques], dtype=object), None)
+        return pd.Series(texts[codes], index=values.index, dtype=object)
+
+    # ==================== WRITERS ====================
+
+    def available_formats(self) -> list:
+        """Formats whose writer dependency is installed"""
+        formats = ["csv"]
+        if openpyxl is not None:
+            formats.append("xlsx")
+        if pq is not None:
+            formats.append("parquet")
+        return formats
+
+    def export(self, dataset: pd.DataFrame, fmt: str, output: ExportOutput = None) -> Optional[ExportResult]:
+        """
+        Write a dataset as CSV, XLSX or Parquet
+
+        Args:
+            dataset: One of the *_dataset frames
+            fmt: "csv", "xlsx" or "parquet"
+            output: None -> bytes, TEMP_FILE -> new temp file path,
+                    path -> that file, binary file object -> written into
+
+        Returns:
+            bytes, path or file object depending on output, or None if failed
+        """
+        if fmt not in EXPORT_FORMATS:
+            print(f"Unknown export format: {fmt}")
+            return None
+        if fmt not in self.available_formats():
+            print(f"Export format {fmt} needs an optional dependency that is not installed")
+            return None
+
+        temp_path = None
+        try:
+            if output is None:
+                target = io.BytesIO()
+            elif output is TEMP_FILE:
+                fd, temp_path = tempfile.mkstemp(prefix="attendance_export_", suffix=EXPORT_FORMATS[fmt][0])
+                os.close(fd)
+                target = temp_path
+            elif isinstance(output, (str, os.PathLike)):
+                target = os.fspath(output)
+            else:
+                target = output
+
+            writer = {"csv": self._write_csv, "xlsx": self._write_xlsx, "parquet": self._write_parquet}[fmt]
+            writer(dataset, target)
+
+            if output is None:
+                return target.getvalue()
+            if isinstance(target, str):
+                return target
+            target.flush()
+            return target
+
+        except Exception as e:
+            print(f"Error exporting {fmt}: {e}")
+            if temp_path and os.path.exists(temp_path):
+                os.remove(temp_path)
+            return None
+
+    def _write_csv(self, dataset: pd.DataFrame, target) -> None:
+        dataset.to_csv(target, index=False, chunksize=self.chunk_rows, encoding='utf-8')
+
+    def _write_xlsx(self, dataset: pd.DataFrame, target) -> None:
+        # Write-only workbooks stream rows to disk instead of holding every cell object
+        workbook = openpyxl.Workbook(write_only=True)
+        sheet = workbook.create_sheet("Attendance")
+        sheet.append(list(dataset.columns))
+        for start in range(0, len(dataset), self.chunk_rows):
+            chunk = dataset.iloc[start:start + self.chunk_rows].astype(object)
+            for row in chunk.where(chunk.notna(), None).itertuples(index=False, name=None):
+                sheet.append(row)
+        workbook.save(target)
+
+    def _write_parquet(self, dataset: pd.DataFrame, target) -> None:
+        schema = pa.Schema.from_pandas(dataset, preserve_index=False)
+        with pq.ParquetWriter(target, schema) as writer:
+            for start in range(0, max(len(dataset), 1), self.chunk_rows):
+                chunk = dataset.iloc[start:start + self.chunk_rows]
+                writer.write_table(pa.Table.from_pandas(chunk, schema=schema, preserve_index=False))
@@ -0,0 +1,153 @@
+"""
+Request tracing
+Timed spans (API calls, SQL queries, DataFrame construction, PDF builds)
+for one Streamlit rerun or one report job, shown in the admin
+performance overlay
+Zero Streamlit dependencies
+
+Nothing is recorded unless a trace is active in the current context, so
+instrumented code costs one context-variable lookup when tracing is off.
+"""
+
+import contextlib
+import contextvars
+import threading
+import time
+from typing import Optional, Dict, Any, List
+
+_current: contextvars.ContextVar = contextvars.ContextVar("attendance_trace", default=None)
+
+# Span categories
+API = "api"
+DB = "db"
+FRAME = "frame"
+COMPUTE = "compute"
+PDF = "pdf"
+RENDER = "render"
+
+
+class Trace:
+    """Spans recorded while this trace was active, relative to its start"""
+
+    def __init__(self, label: str = ""):
+        self.label = label
+        self.started = time.perf_counter()
+        self.finished: Optional[float] = None
+        self._spans: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+
+    def add(
+        self,
+        name: str,
+        category: str,
+        start: float,
+        end: float,
+        size: Optional[int] = None,
+        detail: Optional[str] = None
+    ) -> None:
+        """
+        Record one span
+
+        Args:
+            name: What ran, e.g. "GET /esp32/users"
+            category: One of the category constants above
+            start, end: time.perf_counter() readings
+            size: Bytes transferred or produced, if known
+            detail: Short extra text (status code, row count, ...)
+        """
+        with self._lock:
+            self._spans.append({
+                "name": name,
+                "category": category,
+                "start_ms": (start - self.started) * 1000,
+                "duration_ms": (end - start) * 1000,
+                "bytes": size,
+                "detail": detail
+            })
+
+    def spans(self) -> List[Dict[str, Any]]:
+        """Copies of the spans, in start order"""
+        with self._lock:
+            return sorted((dict(s) for s in self._spans), key=lambda s: s["start_ms"])
+
+    def total_ms(self) -> float:
+        end = self.finished if self.finished is not None else time.perf_counter()
+        return (end - self.started) * 1000
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"label": self.label, "total_ms": self.total_ms(), "spans": self.spans()}
+
+
+def summarize(spans: List[Dict[str, Any]]) -> Dict[str, Dict[str, float]]:
+    """
+    Per category: number of spans, summed milliseconds and bytes
+
+    A span nested inside another span of the same category (a tab inside
+    its page) is not counted again.
+    """
+    totals: Dict[str, Dict[str, float]] = {}
+    covered_until: Dict[str, float] = {}
+    for s in sorted(spans, key=lambda s: s["start_ms"]):
+        end = s["start_ms"] + s["duration_ms"]
+        if end <= covered_until.get(s["category"], float("-inf")):
+            continue
+        covered_until[s["category"]] = end
+        entry = totals.setdefault(s["category"], {"count": 0, "ms": 0.0, "bytes": 0})
+        entry["count"] += 1
+        entry["ms"] += s["duration_ms"]
+        entry["bytes"] += s["bytes"] or 0
+    return totals
+
+
+def current_trace() -> Optional[Trace]:
+    """The trace active in this context (thread / script run), or None"""
+    return _current.get()
+
+
+@contextlib.contextmanager
+def trace(label: str = ""):
+    """Record spans for the duration of the block; yields the Trace"""
+    active = Trace(label)
+    token = _current.set(active)
+    try:
+        yield active
+    finally:
+        active.finished = time.perf_counter()
+        _current.reset(token)
+
+
+@contextlib.contextmanager
+def span(name: str, category: str, detail: Optional[str] = None):
+    """
+    Time a block as one span of the active trace (no-op without one)
+
+    Yields a dict whose 'bytes' and 'detail' entries the block may fill in:
+
+        with tracing.span("doc.build", tracing.PDF) as s:
+            ...
+            s["bytes"] = len(pdf_bytes)
+    """
+    active = _current.get()
+    info = {"bytes": None, "detail": detail}
+    if active is None:
+        yield info
+        return
+    start = time.perf_counter()
+    try:
+        yield info
+    finally:
+        active.add(name, category, start, time.perf_counter(), info["bytes"], info["detail"])
+
+
+def record(
+    name: str,
+    category: str,
+    start: float,
+    end: float,
+    size: Optional[int] = None,
+    detail: Optional[str] = None
+) -> None:
+    """Add an already-timed span to the active trace (no-op without one)"""
+    active = _current.get()
+    if active is not None:
+        active.add(name, category, start, end, size, detail)
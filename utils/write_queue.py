@@ -0,0 +1,115 @@
+"""
+Durable offline write queue
+SQLite-backed FIFO of API mutations that could not reach the backend
+Zero Streamlit dependencies
+"""
+
+import json
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Optional, Dict, Any, List
+
+
+class WriteQueue:
+    """
+    Write-ahead queue for mutations (log_attendance, create_user, update_user, delete_user)
+
+    Entries are replayed oldest-first with the idempotency key they were
+    first sent with. Only writes that never got through are queued; one
+    whose answer timed out is not, since replaying it would apply it twice
+    on a backend that does not deduplicate on the key.
+    """
+
+    def __init__(self, path: str):
+        """
+        Open (or create) the queue database
+
+        Args:
+            path: SQLite file path; ":memory:" keeps the queue in-process only
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        # Held while entries are being replayed, so two sessions never send the same ones
+        self.replay_lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=10, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        with self._lock, self._conn:
+            if path != ":memory:":
+                self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS pending_writes (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    idempotency_key TEXT UNIQUE NOT NULL,
+                    method TEXT NOT NULL,
+                    route TEXT NOT NULL,
+                    payload TEXT NOT NULL,
+                    status TEXT NOT NULL DEFAULT 'pending',
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    last_error TEXT,
+                    created_at TEXT NOT NULL
+                )
+            """)
+
+    def enqueue(self, method: str, route: str, payload: Dict[str, Any], idempotency_key: str) -> int:
+        """Persist a mutation; returns its queue id (existing id if the key is already queued)"""
+        with self._lock, self._conn:
+            self._conn.execute(
+                """INSERT OR IGNORE INTO pending_writes
+                   (idempotency_key, method, route, payload, created_at)
+                   VALUES (?, ?, ?, ?, ?)""",
+                (idempotency_key, method, route, json.dumps(payload), datetime.now().isoformat())
+            )
+            row = self._conn.execute(
+                "SELECT id FROM pending_writes WHERE idempotency_key = ?", (idempotency_key,)
+            ).fetchone()
+            return row["id"]
+
+    def peek(self, limit: int) -> List[Dict[str, Any]]:
+        """Oldest pending entries, in replay order"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT * FROM pending_writes WHERE status = 'pending' ORDER BY id LIMIT ?", (limit,)
+            ).fetchall()
+        return [{**dict(row), "payload": json.loads(row["payload"])} for row in rows]
+
+    def pending_count(self) -> int:
+        with self._lock:
+            return self._conn.execute(
+                "SELECT COUNT(*) FROM pending_writes WHERE status = 'pending'"
+            ).fetchone()[0]
+
+    def mark_done(self, entry_id: int) -> None:
+        """Remove an entry the backend has accepted"""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM pending_writes WHERE id = ?", (entry_id,))
+
+    def mark_attempt(self, entry_id: int, error: str) -> None:
+        """Record a failed replay attempt; the entry stays at the head of the queue"""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE pending_writes SET attempts = attempts + 1, last_error = ? WHERE id = ?",
+                (error, entry_id)
+            )
+
+    def mark_dead(self, entry_id: int, error: str) -> None:
+        """Park an entry the backend rejected so it no longer blocks the queue"""
+        with self._lock, self._conn:
+            self._conn.execute(
+                """UPDATE pending_writes
+                   SET status = 'dead', attempts = attempts + 1, last_error = ?
+                   WHERE id = ?""",
+                (error, entry_id)
+            )
+
+    def dead_letters(self) -> List[Dict[str, Any]]:
+        """Entries the backend rejected during replay"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT * FROM pending_writes WHERE status = 'dead' ORDER BY id"
+            ).fetchall()
+        return [{**dict(row), "payload": json.loads(row["payload"])} for row in rows]
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()